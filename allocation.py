@@ -0,0 +1,158 @@
+import heapq
+import random
+from array import array
+from typing import Container, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class AllocateurPlaces:
+    """
+    Allocation des places de parking en O(log N), sans parcours de la grille.
+
+    Les places libres sont rangées dans des tas (plus petit index d'abord), un
+    par pool (zone, réservée aux abonnés ou non). Les places occupées sont
+    tenues dans une liste dense avec leur position, ce qui permet la
+    libération et le tirage d'une place occupée au hasard en O(1).
+
+    Politique d'attribution :
+        - un abonné prend d'abord une place réservée, sinon une place normale ;
+        - un visiteur ne prend jamais une place réservée ;
+        - la zone demandée est prioritaire, sinon la plus petite place libre
+          toutes zones confondues.
+
+    Attributes:
+        nb_places: Nombre total de places
+        zones: Zone (niveau, secteur...) de chaque place
+        reservees: 1 si la place est réservée aux abonnés, 0 sinon
+    """
+
+    def __init__(self, nb_places: int, zones: Optional[Sequence[int]] = None,
+                 places_reservees: Iterable[int] = ()) -> None:
+        if zones is not None and len(zones) != nb_places:
+            raise ValueError(f"{len(zones)} zones pour {nb_places} places.")
+        self.nb_places = nb_places
+        self.zones = array("i", zones if zones is not None else [0] * nb_places)
+        self.reservees = bytearray(nb_places)
+        for place in places_reservees:
+            self.reservees[place] = 1
+
+        self._libres: Dict[Tuple[bool, int], List[int]] = {}
+        self._occupees: List[int] = []
+        self._position = array("i", [-1]) * nb_places
+        self.restaurer(())
+
+    def restaurer(self, places_occupees: Iterable[int]) -> None:
+        """
+        Reconstruit l'allocateur en O(N) à partir d'un ensemble de places occupées.
+
+        Args:
+            places_occupees: Index des places occupées (reprise après incident)
+        """
+        self._occupees = sorted(set(places_occupees))
+        self._position = array("i", [-1]) * self.nb_places
+        for pos, place in enumerate(self._occupees):
+            self._position[place] = pos
+        self._libres = {}
+        for place in range(self.nb_places):
+            if self._position[place] < 0:
+                self._libres.setdefault(self._pool(place), []).append(place)  # Déjà trié : tas valide
+
+    def _pool(self, place: int) -> Tuple[bool, int]:
+        return (bool(self.reservees[place]), self.zones[place])
+
+    def _prendre(self, reservee: bool, zone: Optional[int]) -> Optional[int]:
+        """Retire la plus petite place libre du pool demandé (toutes zones si besoin)."""
+        if zone is not None:
+            tas = self._libres.get((reservee, zone))
+            if tas:
+                return heapq.heappop(tas)
+        meilleur = None
+        for (res, _), tas in self._libres.items():
+            if res == reservee and tas and (meilleur is None or tas[0] < meilleur[0]):
+                meilleur = tas
+        return heapq.heappop(meilleur) if meilleur else None
+
+    def acquerir(self, est_abonne: bool = False, zone: Optional[int] = None) -> Optional[int]:
+        """
+        Attribue une place libre selon la politique.
+
+        Args:
+            est_abonne: True pour un abonné (accès aux places réservées)
+            zone: Zone préférée, ou None
+
+        Returns:
+            L'index de la place attribuée, ou None si aucune place ne convient
+        """
+        place = self._prendre(True, zone) if est_abonne else None
+        if place is None:
+            place = self._prendre(False, zone)
+        if place is None:
+            return None
+        self._position[place] = len(self._occupees)
+        self._occupees.append(place)
+        return place
+
+    def liberer(self, place: int) -> None:
+        """
+        Rend une place occupée au pool des places libres.
+
+        Args:
+            place: Index de la place à libérer
+
+        Raises:
+            ValueError: Si la place n'est pas occupée
+        """
+        pos = self._position[place]
+        if pos < 0:
+            raise ValueError(f"Place {place} non occupée.")
+        derniere = self._occupees.pop()
+        if derniere != place:
+            self._occupees[pos] = derniere
+            self._position[derniere] = pos
+        self._position[place] = -1
+        heapq.heappush(self._libres[self._pool(place)], place)
+
+    def est_occupee(self, place: int) -> bool:
+        """Indique si une place est occupée."""
+        return self._position[place] >= 0
+
+    def place_occupee_aleatoire(self, rng: random.Random = random,
+                                exclues: Container[int] = ()) -> Optional[int]:
+        """
+        Tire une place occupée au hasard.
+
+        Args:
+            rng: Générateur aléatoire à utiliser
+            exclues: Places à ne pas tirer (quelques places en transit)
+
+        Returns:
+            L'index d'une place occupée hors exclues, ou None s'il n'y en a pas
+        """
+        if not self._occupees:
+            return None
+        place = self._occupees[rng.randrange(len(self._occupees))]
+        if place in exclues:  # Nouveau tirage parmi les autres : reste uniforme
+            candidates = [autre for autre in self._occupees if autre not in exclues]
+            return rng.choice(candidates) if candidates else None
+        return place
+
+    def place_occupee_quelconque(self, exclues: Container[int] = ()) -> Optional[int]:
+        """
+        Retourne une place occupée quelconque hors exclues, ou None s'il n'y en a pas.
+
+        En O(1 + nombre de places exclues occupées) : la liste dense est
+        parcourue depuis la fin.
+        """
+        for place in reversed(self._occupees):
+            if place not in exclues:
+                return place
+        return None
+
+    @property
+    def nb_occupees(self) -> int:
+        """Nombre de places occupées."""
+        return len(self._occupees)
+
+    @property
+    def nb_libres(self) -> int:
+        """Nombre de places libres, toutes catégories confondues."""
+        return self.nb_places - len(self._occupees)
@@ -0,0 +1,263 @@
+"""
+Analyse structurelle d'un Automate : accessibilité, co-accessibilité,
+états morts ou puits, non-déterminisme et minimisation (Hopcroft).
+
+Les calculs travaillent sur la forme compilée (AutomateCompile) : états et
+événements y sont des entiers consécutifs, ce qui permet de traiter des
+automates de plusieurs dizaines de milliers d'états en temps quasi linéaire.
+Les résultats sont exprimés avec les ID d'origine des états.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from automate_base import Automate, AutomateCompile, Etat
+from evenements import EvenementSink, NullSink
+
+
+class Analyse(NamedTuple):
+    """Résumé de l'analyse d'un automate (ID d'états)."""
+    accessibles: Set[int]
+    coaccessibles: Set[int]
+    morts: Set[int]
+    puits: Set[int]
+    non_deterministes: List[Tuple[int, str, List[int]]]
+    nb_etats_minimal: int
+
+
+def _accessibles(c: AutomateCompile) -> List[bool]:
+    """Parcours en largeur depuis l'état initial (par index)."""
+    vus = [False] * len(c.ids_etats)
+    if c.etat_initial < 0:
+        return vus
+    table, k = c.table, c.nb_evenements
+    vus[c.etat_initial] = True
+    file = deque([c.etat_initial])
+    while file:
+        etat = file.popleft()
+        for dst in table[etat * k:(etat + 1) * k]:
+            if dst >= 0 and not vus[dst]:
+                vus[dst] = True
+                file.append(dst)
+    return vus
+
+
+def _cibles_par_defaut(automate: Automate) -> List[int]:
+    """États finals, ou à défaut l'état initial (état de repos d'un automate cyclique)."""
+    finals = [id_etat for id_etat, e in automate.list_etats.items() if e.type_etat == "final"]
+    if finals:
+        return finals
+    return [id_etat for id_etat, e in automate.list_etats.items() if e.type_etat == "initial"]
+
+
+def etats_accessibles(automate: Automate) -> Set[int]:
+    """
+    États atteignables depuis l'état initial.
+
+    Returns:
+        Ensemble d'ID (vide si l'automate n'a pas d'état initial)
+    """
+    c = automate.compiler()
+    return {c.ids_etats[i] for i, vu in enumerate(_accessibles(c)) if vu}
+
+
+def etats_coaccessibles(automate: Automate, cibles: Optional[Iterable[int]] = None) -> Set[int]:
+    """
+    États depuis lesquels une cible peut être atteinte.
+
+    Args:
+        automate: Automate analysé
+        cibles: ID des états cibles (par défaut les états "final", ou l'état
+            initial si aucun n'est déclaré)
+
+    Returns:
+        Ensemble d'ID (les cibles comprises)
+    """
+    c = automate.compiler()
+    k = c.nb_evenements
+    predecesseurs: List[List[int]] = [[] for _ in c.ids_etats]
+    for i, dst in enumerate(c.table):
+        if dst >= 0:
+            predecesseurs[dst].append(i // k)
+
+    depart = [c.index_etats[id_etat] for id_etat in (_cibles_par_defaut(automate) if cibles is None else cibles)]
+    vus = [False] * len(c.ids_etats)
+    for etat in depart:
+        vus[etat] = True
+    file = deque(depart)
+    while file:
+        for src in predecesseurs[file.popleft()]:
+            if not vus[src]:
+                vus[src] = True
+                file.append(src)
+    return {c.ids_etats[i] for i, vu in enumerate(vus) if vu}
+
+
+def etats_morts(automate: Automate, cibles: Optional[Iterable[int]] = None) -> Set[int]:
+    """
+    États accessibles mais non co-accessibles : une fois entré, l'automate
+    ne peut plus atteindre de cible (voir etats_coaccessibles).
+    """
+    return etats_accessibles(automate) - etats_coaccessibles(automate, cibles)
+
+
+def etats_puits(automate: Automate) -> Set[int]:
+    """États sans transition sortante (tout événement y est bloqué)."""
+    return {id_etat for id_etat, e in automate.list_etats.items() if not e.transitions}
+
+
+def non_determinismes(automate: Automate) -> List[Tuple[int, str, List[int]]]:
+    """
+    Détecte les couples (état, événement) ajoutés avec plusieurs destinations.
+
+    Etat.transitions ne garde que la dernière destination ajoutée : les
+    précédentes sont silencieusement écrasées. Cette fonction les retrouve
+    dans list_transitions.
+
+    Returns:
+        Liste de (ID source, événement, ID destinations dans l'ordre d'ajout)
+    """
+    destinations: Dict[Tuple[int, str], List[int]] = {}
+    for t in automate.list_transitions:
+        dsts = destinations.setdefault((t.etat_source.id_etat, t.etiquette), [])
+        if t.etat_dest.id_etat not in dsts:
+            dsts.append(t.etat_dest.id_etat)
+    return [(src, evt, dsts) for (src, evt), dsts in destinations.items() if len(dsts) > 1]
+
+
+def _classe_type(type_etat: str) -> str:
+    """Type pris en compte par la minimisation (initial et normal sont interchangeables)."""
+    return type_etat if type_etat in ("final", "puits") else "normal"
+
+
+def _hopcroft(c: AutomateCompile, types: List[str]) -> List[int]:
+    """
+    Raffinement de partition de Hopcroft, en O(k·n·log n).
+
+    Les transitions absentes mènent à un état puits implicite (index n), seul
+    dans sa classe : deux états sont équivalents s'ils ont le même type et
+    acceptent ou bloquent exactement les mêmes suites d'événements.
+
+    Returns:
+        Numéro de classe de chaque état (par index, puits implicite compris)
+    """
+    n, k, table = len(c.ids_etats), c.nb_evenements, c.table
+    puits = n
+
+    # inverse[e][t] : états menant à t par l'événement e
+    inverse: List[Dict[int, List[int]]] = [{} for _ in range(k)]
+    for i, dst in enumerate(table):
+        src, evt = divmod(i, k)
+        inverse[evt].setdefault(dst if dst >= 0 else puits, []).append(src)
+    for evt in range(k):
+        inverse[evt].setdefault(puits, []).append(puits)
+
+    groupes: Dict[str, Set[int]] = {}
+    for i, type_etat in enumerate(types):
+        groupes.setdefault(type_etat, set()).add(i)
+    blocs: List[Set[int]] = [*groupes.values(), {puits}]
+    bloc = [0] * (n + 1)
+    for b, membres in enumerate(blocs):
+        for etat in membres:
+            bloc[etat] = b
+
+    # Tous les blocs sauf le plus grand servent de séparateurs initiaux
+    plus_grand = max(range(len(blocs)), key=lambda b: len(blocs[b]))
+    attente = [(b, evt) for b in range(len(blocs)) if b != plus_grand for evt in range(k)]
+
+    while attente:
+        b, evt = attente.pop()
+        inverse_evt = inverse[evt]
+        touches: Dict[int, List[int]] = {}
+        for dst in blocs[b]:
+            for src in inverse_evt.get(dst, ()):
+                touches.setdefault(bloc[src], []).append(src)
+
+        for y, membres in touches.items():
+            ancien = blocs[y]
+            if len(membres) == len(ancien):
+                continue
+            # La nouvelle classe reçoit la plus petite moitié : coût O(min) par découpe
+            if 2 * len(membres) <= len(ancien):
+                partie = set(membres)
+                ancien -= partie
+            else:
+                partie = ancien.difference(membres)
+                ancien.intersection_update(membres)
+            nouveau = len(blocs)
+            blocs.append(partie)
+            for etat in partie:
+                bloc[etat] = nouveau
+            # La nouvelle classe étant la plus petite, elle suffit comme séparateur,
+            # que (y, e) soit déjà en attente ou non
+            attente.extend((nouveau, e) for e in range(k))
+    return bloc
+
+
+def classes_equivalence(automate: Automate) -> List[List[int]]:
+    """
+    Partition des états accessibles en classes d'états équivalents.
+
+    Deux états sont équivalents s'ils sont de même type ("final" et "puits"
+    sont distingués, "initial" et "normal" non) et acceptent ou bloquent
+    exactement les mêmes suites d'événements.
+
+    Returns:
+        Classes d'ID, chacune triée dans l'ordre d'ajout des états, les classes
+        étant ordonnées par leur premier état
+    """
+    c = automate.compiler()
+    types = [_classe_type(automate.list_etats[id_etat].type_etat) for id_etat in c.ids_etats]
+    bloc = _hopcroft(c, types)
+    classes: Dict[int, List[int]] = {}
+    for i, vu in enumerate(_accessibles(c)):
+        if vu:
+            classes.setdefault(bloc[i], []).append(c.ids_etats[i])
+    return list(classes.values())
+
+
+def minimiser(automate: Automate, sink: Optional[EvenementSink] = None) -> Automate:
+    """
+    Construit l'automate minimal équivalent.
+
+    Les états inaccessibles sont retirés et chaque classe d'équivalence est
+    remplacée par son premier état (ID et label conservés). L'automate obtenu
+    se compile en une table de transitions de taille minimale.
+
+    Args:
+        automate: Automate à minimiser (non modifié)
+        sink: Destination des événements du nouvel automate (NullSink par défaut)
+
+    Returns:
+        Un nouvel Automate, positionné sur son état initial
+    """
+    classes = classes_equivalence(automate)
+    representant = {id_etat: classe[0] for classe in classes for id_etat in classe}
+    minimal = Automate(sink if sink is not None else NullSink())
+    for classe in classes:
+        etats = [automate.list_etats[id_etat] for id_etat in classe]
+        modele = etats[0]
+        type_etat = "initial" if any(e.type_etat == "initial" for e in etats) else modele.type_etat
+        minimal.ajouter_etat(Etat(modele.id_etat, modele.label_etat, type_etat))
+    for classe in classes:
+        for evt, id_dst in automate.list_etats[classe[0]].transitions.items():
+            minimal.ajouter_transition(classe[0], representant[id_dst], evt)
+    return minimal
+
+
+def analyser(automate: Automate, cibles: Optional[Iterable[int]] = None) -> Analyse:
+    """
+    Analyse complète d'un automate.
+
+    Args:
+        automate: Automate analysé
+        cibles: États cibles de la co-accessibilité (voir etats_coaccessibles)
+
+    Returns:
+        Analyse(accessibles, coaccessibles, morts, puits, non_deterministes,
+        nb_etats_minimal)
+    """
+    accessibles = etats_accessibles(automate)
+    coaccessibles = etats_coaccessibles(automate, cibles)
+    return Analyse(accessibles, coaccessibles, accessibles - coaccessibles,
+                   etats_puits(automate), non_determinismes(automate),
+                   len(classes_equivalence(automate)))
@@ -0,0 +1,218 @@
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+# Résolutions par défaut : nom -> (durée d'un intervalle en s, nombre d'intervalles conservés)
+RESOLUTIONS_DEFAULT: Dict[str, Tuple[float, int]] = {
+    "minute": (60.0, 24 * 60),     # 24 heures
+    "heure": (3600.0, 35 * 24),    # 5 semaines
+    "jour": (86400.0, 400),        # Un peu plus d'un an
+}
+
+
+class SerieCirculaire:
+    """
+    Agrégats par intervalle de temps dans des tableaux circulaires de taille fixe.
+
+    L'intervalle b (instant t tel que b = t // pas) occupe la case b % nb_cases ;
+    une case est remise à zéro quand un intervalle plus récent la réutilise.
+    Une mise à jour est donc en O(1) et une requête en O(nombre d'intervalles),
+    quel que soit le nombre de sessions. Un événement tardif (reçu dans le
+    désordre) est compté dans son intervalle s'il est encore dans la
+    fenêtre ; plus ancien que nb_cases intervalles, il est ignoré au lieu
+    d'effacer la case d'un intervalle récent.
+
+    Attributes:
+        pas: Durée d'un intervalle (secondes)
+        nb_cases: Nombre d'intervalles conservés
+        intervalles: Numéro d'intervalle stocké dans chaque case (-1 si vide)
+        arrivees: Nombre d'entrées par intervalle
+        departs: Nombre de sorties par intervalle
+        recettes: Montant encaissé par intervalle
+        sejours: Somme des durées de séjour des sorties de l'intervalle
+        occupation: Nombre de places occupées au dernier événement de l'intervalle
+        occupation_max: Maximum de places occupées dans l'intervalle
+        ignores: Nombre d'événements ignorés car hors de la fenêtre
+    """
+
+    def __init__(self, pas: float, nb_cases: int) -> None:
+        self.pas = pas
+        self.nb_cases = nb_cases
+        self.intervalles = array("q", [-1]) * nb_cases
+        self.arrivees = array("q", [0]) * nb_cases  # "q" : 64 bits partout ("l" vaut 32 bits sous Windows)
+        self.departs = array("q", [0]) * nb_cases
+        self.recettes = array("d", [0.0]) * nb_cases
+        self.sejours = array("d", [0.0]) * nb_cases
+        self.occupation = array("q", [0]) * nb_cases
+        self.occupation_max = array("q", [0]) * nb_cases
+        self.ignores = 0
+        self._debut_courant = self._fin_courant = 0.0
+        self._case_courante = -1
+        self._dernier_intervalle = float("-inf")  # Intervalle le plus récent reçu
+
+    def _case(self, t: float, occupation: int) -> int:
+        """
+        Retourne la case de l'instant t, remise à zéro si elle contenait un
+        ancien intervalle, ou -1 si t est sorti de la fenêtre conservée.
+        """
+        if self._debut_courant <= t < self._fin_courant:
+            case = self._case_courante  # Cas courant : même intervalle que l'événement précédent
+        else:
+            intervalle = int(t // self.pas)
+            if intervalle <= self._dernier_intervalle - self.nb_cases:
+                self.ignores += 1
+                return -1
+            self._dernier_intervalle = max(self._dernier_intervalle, intervalle)
+            case = intervalle % self.nb_cases
+            if self.intervalles[case] != intervalle:
+                self.intervalles[case] = intervalle
+                self.arrivees[case] = self.departs[case] = 0
+                self.recettes[case] = self.sejours[case] = 0.0
+                self.occupation_max[case] = occupation
+            self._debut_courant = intervalle * self.pas
+            self._fin_courant = self._debut_courant + self.pas
+            self._case_courante = case
+        self.occupation[case] = occupation
+        if occupation > self.occupation_max[case]:
+            self.occupation_max[case] = occupation
+        return case
+
+    def arrivee(self, t: float, occupation: int) -> None:
+        """Compte une entrée à l'instant t (occupation après l'entrée)."""
+        case = self._case(t, occupation)
+        if case >= 0:
+            self.arrivees[case] += 1
+
+    def depart(self, t: float, occupation: int, montant: float, sejour: float) -> None:
+        """Compte une sortie à l'instant t (occupation après la sortie)."""
+        case = self._case(t, occupation)
+        if case < 0:
+            return
+        self.departs[case] += 1
+        self.recettes[case] += montant
+        self.sejours[case] += sejour
+
+    def serie(self, fin: float, nb: int) -> List[Dict[str, float]]:
+        """
+        Agrégats des `nb` derniers intervalles jusqu'à l'instant `fin` inclus.
+
+        Un intervalle sans événement reprend l'occupation du précédent.
+
+        Args:
+            fin: Instant de référence (généralement le dernier événement)
+            nb: Nombre d'intervalles (borné par nb_cases)
+
+        Returns:
+            Liste chronologique de dictionnaires (debut, arrivees, departs,
+            recettes, sejour_moyen, occupation, occupation_max)
+        """
+        dernier = int(fin // self.pas)
+        nb = min(nb, self.nb_cases)
+        resultat = []
+        occupation = None
+        for intervalle in range(dernier - nb + 1, dernier + 1):
+            case = intervalle % self.nb_cases
+            if self.intervalles[case] == intervalle:
+                occupation = self.occupation[case]
+                departs = self.departs[case]
+                resultat.append({
+                    "debut": intervalle * self.pas,
+                    "arrivees": self.arrivees[case],
+                    "departs": departs,
+                    "recettes": self.recettes[case],
+                    "sejour_moyen": self.sejours[case] / departs if departs else None,
+                    "occupation": occupation,
+                    "occupation_max": self.occupation_max[case],
+                })
+            else:
+                resultat.append({
+                    "debut": intervalle * self.pas, "arrivees": 0, "departs": 0,
+                    "recettes": 0.0, "sejour_moyen": None,
+                    "occupation": occupation, "occupation_max": occupation,
+                })
+        return resultat
+
+
+class Analytique:
+    """
+    Statistiques de trafic incrémentales, alimentées par les entrées et sorties.
+
+    Chaque événement met à jour une SerieCirculaire par résolution (minute,
+    heure, jour par défaut). L'horloge suit l'instant du dernier événement,
+    ce qui rend les requêtes valables aussi bien en temps réel qu'en
+    simulation (temps virtuel).
+
+    Attributes:
+        series: SerieCirculaire par nom de résolution
+        horloge: Instant du dernier événement reçu
+    """
+
+    def __init__(self, resolutions: Dict[str, Tuple[float, int]] = RESOLUTIONS_DEFAULT) -> None:
+        self.series = {nom: SerieCirculaire(pas, nb_cases) for nom, (pas, nb_cases) in resolutions.items()}
+        self._series = list(self.series.values())
+        self.horloge = float("-inf")
+
+    def enregistrer_arrivee(self, t: float, occupation: int) -> None:
+        """
+        Enregistre une entrée.
+
+        Args:
+            t: Instant de l'entrée
+            occupation: Nombre de places occupées après l'entrée
+        """
+        if t > self.horloge:
+            self.horloge = t
+        for serie in self._series:
+            serie.arrivee(t, occupation)
+
+    def enregistrer_depart(self, t: float, occupation: int, montant: float, sejour: float) -> None:
+        """
+        Enregistre une sortie.
+
+        Args:
+            t: Instant de la sortie
+            occupation: Nombre de places occupées après la sortie
+            montant: Montant encaissé
+            sejour: Durée de stationnement (secondes)
+        """
+        if t > self.horloge:
+            self.horloge = t
+        for serie in self._series:
+            serie.depart(t, occupation, montant, sejour)
+
+    def serie(self, resolution: str, nb: int, fin: Optional[float] = None) -> List[Dict[str, float]]:
+        """
+        Série chronologique des `nb` derniers intervalles d'une résolution.
+
+        Args:
+            resolution: Nom de la résolution ("minute", "heure", "jour")
+            nb: Nombre d'intervalles
+            fin: Instant de référence (horloge par défaut)
+        """
+        return self.series[resolution].serie(self.horloge if fin is None else fin, nb)
+
+    def resume(self, resolution: str, nb: int, fin: Optional[float] = None) -> Dict[str, float]:
+        """
+        Totaux sur les `nb` derniers intervalles d'une résolution.
+
+        Returns:
+            Dictionnaire (arrivees, departs, recettes, sejour_moyen, occupation_max)
+        """
+        if self.horloge == float("-inf"):
+            return {"arrivees": 0, "departs": 0, "recettes": 0.0, "sejour_moyen": None,
+                    "occupation_max": 0}
+        serie = self.series[resolution]
+        dernier = int((self.horloge if fin is None else fin) // serie.pas)
+        arrivees = departs = occupation_max = 0
+        recettes = sejours = 0.0
+        for intervalle in range(dernier - min(nb, serie.nb_cases) + 1, dernier + 1):
+            case = intervalle % serie.nb_cases
+            if serie.intervalles[case] == intervalle:
+                arrivees += serie.arrivees[case]
+                departs += serie.departs[case]
+                recettes += serie.recettes[case]
+                sejours += serie.sejours[case]
+                occupation_max = max(occupation_max, serie.occupation_max[case])
+        return {"arrivees": arrivees, "departs": departs, "recettes": recettes,
+                "sejour_moyen": sejours / departs if departs else None,
+                "occupation_max": occupation_max}
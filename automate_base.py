@@ -1,4 +1,27 @@
-from typing import Dict, List, Optional
+from array import array
+from itertools import islice, repeat
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from dependances import numpy_optionnel
+from evenements import ConsoleSink, EvenementSink
+
+
+class BilanExecution(NamedTuple):
+    """
+    Résultat de l'exécution d'une suite d'événements.
+
+    Un événement bloqué laisse l'automate dans son état, comme Automate.transition.
+
+    Attributes:
+        etat_final: ID de l'état atteint
+        acceptes: Nombre d'événements ayant provoqué une transition
+        bloques: Nombre d'événements bloqués (inconnus compris)
+        premier_rejet: Position du premier événement bloqué (-1 si aucun)
+    """
+    etat_final: int
+    acceptes: int
+    bloques: int
+    premier_rejet: int
 
 
 class Etat:
@@ -46,12 +69,17 @@ class Automate:
         list_etats: Dictionnaire des états {id: Etat}
         list_transitions: Liste de toutes les transitions
         etat_courant: État actuel du système
+        sink: Destination des événements (console par défaut)
+        version: Compteur incrémenté à chaque ajout d'état ou de transition
+            (permet aux vues de savoir si la structure a changé)
     """
     
-    def __init__(self) -> None:
+    def __init__(self, sink: Optional[EvenementSink] = None) -> None:
         self.list_etats: Dict[int, Etat] = {}
         self.list_transitions: List[Transition] = []
         self.etat_courant: Optional[Etat] = None
+        self.sink = sink if sink is not None else ConsoleSink()
+        self.version = 0
 
     def ajouter_etat(self, etat: Etat) -> None:
         """
@@ -61,9 +89,11 @@ class Automate:
             etat: L'objet Etat à ajouter
         """
         self.list_etats[etat.id_etat] = etat
+        self.version += 1
         if etat.type_etat == "initial":
             self.etat_courant = etat
-            print(f"[Automate] État initial défini: {etat.label_etat}")
+            self.sink.emettre("automate", "[Automate] État initial défini: {label}",
+                              label=etat.label_etat)
 
     def ajouter_transition(self, id_src: int, id_dst: int, evt: str) -> None:
         """
@@ -82,8 +112,10 @@ class Automate:
             self.list_transitions.append(nouvelle_trans)
             
             src.transitions[evt] = id_dst
+            self.version += 1
         else:
-            print(f"[Erreur] État source {id_src} ou destination {id_dst} inexistant.")
+            self.sink.emettre("erreur", "[Erreur] État source {src} ou destination {dst} inexistant.",
+                              src=id_src, dst=id_dst)
 
     def transition(self, evt: str) -> bool:
         """
@@ -101,8 +133,312 @@ class Automate:
             nouveau_etat = self.list_etats[dst_id]
             
             self.etat_courant = nouveau_etat
-            print(f"[Transition] '{evt}': {ancien_etat.label_etat} -> {nouveau_etat.label_etat}")
+            self.sink.emettre("transition", "[Transition] '{evt}': {src} -> {dst}",
+                              evt=evt, src=ancien_etat.label_etat, dst=nouveau_etat.label_etat)
             return True
         else:
-            print(f"[Bloqué] Événement '{evt}' impossible depuis l'état '{self.etat_courant.label_etat}'")
+            self.sink.emettre("bloque", "[Bloqué] Événement '{evt}' impossible depuis l'état '{etat}'",
+                              evt=evt, etat=self.etat_courant.label_etat)
+            return False
+
+
+    def compiler(self) -> "AutomateCompile":
+        """
+        Fige l'automate sous forme de table de transitions dense.
+        
+        Les états et les événements sont renumérotés en entiers consécutifs
+        (dans l'ordre d'ajout). L'API ajouter_etat/ajouter_transition reste le
+        moyen de construire l'automate ; la forme compilée sert à l'exécution.
+        
+        Returns:
+            Un AutomateCompile positionné sur l'état courant
+        """
+        return AutomateCompile(self)
+
+    def executer(self, evenements: Iterable[str]) -> BilanExecution:
+        """
+        Exécute une suite d'événements depuis l'état courant, sans affichage.
+        
+        L'automate est compilé à chaque appel : pour rejouer de nombreuses
+        suites, utiliser directement compiler() puis AutomateCompile.executer*.
+        
+        Args:
+            evenements: Événements (itérable ou générateur, consommé une fois)
+            
+        Returns:
+            Le bilan de l'exécution ; etat_courant est positionné sur l'état atteint
+        """
+        compile_ = self.compiler()
+        bilan = compile_.executer(evenements)
+        if compile_.etat_courant >= 0:
+            self.etat_courant = self.list_etats[bilan.etat_final]
+        return bilan
+
+
+class AutomateCompile:
+    """
+    Forme compilée d'un Automate : table de transitions plate indexée par entiers.
+    
+    La case table[etat * nb_evenements + evenement] contient l'index de l'état
+    destination, ou -1 si la transition n'existe pas. Les noms d'événements
+    sont traduits une fois en codes via code_evenement().
+    
+    Attributes:
+        ids_etats: ID d'origine de chaque état, par index
+        labels: Label de chaque état, par index
+        types: Type de chaque état, par index
+        index_etats: Dictionnaire {id d'origine: index}
+        evenements: Nom de chaque événement, par code
+        codes_evenements: Dictionnaire {événement: code}
+        nb_evenements: Nombre d'événements distincts (largeur d'une ligne)
+        table: Table des transitions (array d'entiers signés, ou memoryview
+            d'un artefact projeté en mémoire)
+        etat_initial: Index de l'état initial (-1 si aucun)
+        etat_courant: Index de l'état courant
+    """
+    
+    def __init__(self, automate: Automate) -> None:
+        ids_etats = list(automate.list_etats)
+        index_etats = {id_etat: i for i, id_etat in enumerate(ids_etats)}
+        
+        evenements: List[str] = []
+        codes: Dict[str, int] = {}
+        for etat in automate.list_etats.values():
+            for evt in etat.transitions:
+                if evt not in codes:
+                    codes[evt] = len(evenements)
+                    evenements.append(evt)
+        nb_evenements = len(evenements)
+        
+        table = array("i", [-1]) * (len(ids_etats) * nb_evenements)
+        for i, etat in enumerate(automate.list_etats.values()):
+            base = i * nb_evenements
+            for evt, id_dst in etat.transitions.items():
+                table[base + codes[evt]] = index_etats[id_dst]
+        
+        etat_initial = -1
+        for i, etat in enumerate(automate.list_etats.values()):
+            if etat.type_etat == "initial":
+                etat_initial = i
+        self._initialiser(ids_etats, [e.label_etat for e in automate.list_etats.values()],
+                          [e.type_etat for e in automate.list_etats.values()],
+                          evenements, table, etat_initial)
+        courant = automate.etat_courant
+        self.etat_courant = self.index_etats[courant.id_etat] if courant else self.etat_initial
+
+    @classmethod
+    def depuis_table(cls, ids_etats: Sequence[int], labels: Sequence[str], types: Sequence[str],
+                     evenements: Sequence[str], table: Sequence[int],
+                     etat_initial: int) -> "AutomateCompile":
+        """
+        Reconstruit une forme compilée à partir de ses tableaux, sans passer
+        par les objets Etat (chargement d'un artefact précompilé).
+        
+        Args:
+            ids_etats: ID de chaque état, par index
+            labels: Label de chaque état, par index
+            types: Type de chaque état, par index
+            evenements: Nom de chaque événement, par code
+            table: Table des transitions (len(ids_etats) * len(evenements) cases)
+            etat_initial: Index de l'état initial (-1 si aucun)
+            
+        Returns:
+            Un AutomateCompile positionné sur l'état initial
+        """
+        compile_ = cls.__new__(cls)
+        compile_._initialiser(list(ids_etats), list(labels), list(types), list(evenements),
+                              table, etat_initial)
+        compile_.etat_courant = etat_initial
+        return compile_
+
+    def _initialiser(self, ids_etats: List[int], labels: List[str], types: List[str],
+                     evenements: List[str], table: Sequence[int], etat_initial: int) -> None:
+        self.ids_etats = ids_etats
+        self.labels = labels
+        self.types = types
+        self.index_etats: Dict[int, int] = {id_etat: i for i, id_etat in enumerate(ids_etats)}
+        self.evenements = evenements
+        self.codes_evenements: Dict[str, int] = {evt: code for code, evt in enumerate(evenements)}
+        self.nb_evenements = len(evenements)
+        self.table = table
+        self.etat_initial = etat_initial
+
+    def code_evenement(self, evt: str) -> int:
+        """
+        Traduit un nom d'événement en code entier.
+        
+        Args:
+            evt: Nom de l'événement
+            
+        Returns:
+            Le code de l'événement
+            
+        Raises:
+            KeyError: Si l'événement n'apparaît dans aucune transition
+        """
+        return self.codes_evenements[evt]
+
+    def suivant(self, etat: int, code_evt: int) -> int:
+        """
+        Calcule l'état atteint depuis un état donné, sans rien modifier.
+        
+        Args:
+            etat: Index de l'état source
+            code_evt: Code de l'événement
+            
+        Returns:
+            Index de l'état destination, ou -1 si la transition est impossible
+            (code hors de [0, nb_evenements) compris)
+        """
+        if not 0 <= code_evt < self.nb_evenements:  # Sinon lecture dans la ligne d'un autre état
+            return -1
+        return self.table[etat * self.nb_evenements + code_evt]
+
+    def transition(self, code_evt: int) -> bool:
+        """
+        Exécute une transition par simple lecture de la table (sans affichage).
+        
+        Args:
+            code_evt: Code de l'événement (voir code_evenement)
+            
+        Returns:
+            True si le changement d'état a eu lieu, False sinon (toujours
+            False sans état courant ou pour un code hors de [0, nb_evenements))
+        """
+        if self.etat_courant < 0 or not 0 <= code_evt < self.nb_evenements:
             return False
+        dst = self.table[self.etat_courant * self.nb_evenements + code_evt]
+        if dst < 0:
+            return False
+        self.etat_courant = dst
+        return True
+
+    def executer(self, evenements: Iterable[str]) -> BilanExecution:
+        """
+        Exécute une suite d'événements depuis l'état courant.
+        
+        Les événements sont lus au fil de l'eau (mémoire constante, même pour
+        un flux non borné) ; un événement inconnu de l'automate est bloqué.
+        
+        Args:
+            evenements: Noms des événements (itérable ou générateur)
+            
+        Returns:
+            Le bilan de l'exécution ; etat_courant est positionné sur l'état atteint
+        """
+        return self.executer_codes(map(self.codes_evenements.get, evenements, repeat(-1)))
+
+    def executer_codes(self, codes: Iterable[int]) -> BilanExecution:
+        """
+        Exécute une suite de codes d'événements depuis l'état courant.
+        
+        Args:
+            codes: Codes des événements (array, liste ou générateur) ; un code
+                hors de [0, nb_evenements) est bloqué
+            
+        Returns:
+            Le bilan de l'exécution ; etat_courant est positionné sur l'état
+            atteint. Sans état courant (ni initial), tous les événements sont bloqués.
+        """
+        table, k = self.table, self.nb_evenements
+        etat = self.etat_courant
+        if etat < 0:
+            n = sum(1 for _ in codes)
+            return BilanExecution(-1, 0, n, 0 if n else -1)
+        base = etat * k
+        n = bloques = 0
+        premier_rejet = -1
+        for n, code in enumerate(codes, 1):
+            dst = table[base + code] if 0 <= code < k else -1
+            if dst >= 0:
+                etat = dst
+                base = dst * k
+            else:
+                if premier_rejet < 0:
+                    premier_rejet = n - 1
+                bloques += 1
+        self.etat_courant = etat
+        return BilanExecution(self.ids_etats[etat] if etat >= 0 else -1, n - bloques, bloques, premier_rejet)
+
+    def executer_lot(self, sequences: Sequence[Sequence[int]]) -> List[BilanExecution]:
+        """
+        Exécute des suites de codes indépendantes, chacune depuis l'état initial.
+        
+        Avec NumPy, toutes les suites avancent ensemble : une étape traite un
+        événement de chaque suite par quelques opérations vectorisées, soit une
+        boucle Python par position au lieu d'une par événement. Sans NumPy,
+        les suites sont exécutées l'une après l'autre. etat_courant n'est pas
+        modifié.
+        
+        Args:
+            sequences: Suites de codes d'événements (longueurs quelconques)
+            
+        Returns:
+            Un bilan par suite, dans l'ordre
+        """
+        np = numpy_optionnel()
+        if np is None or self.etat_initial < 0:
+            courant = self.etat_courant
+            bilans = []
+            for codes in sequences:
+                self.etat_courant = self.etat_initial
+                bilans.append(self.executer_codes(codes))
+            self.etat_courant = courant
+            return bilans
+        return self._executer_lot_numpy(np, sequences)
+
+    def _executer_lot_numpy(self, np: Any, sequences: Sequence[Sequence[int]]) -> List[BilanExecution]:
+        """Version vectorisée de executer_lot (suites alignées dans une matrice)."""
+        k = self.nb_evenements
+        longueurs = np.fromiter((len(codes) for codes in sequences), dtype=np.int64, count=len(sequences))
+        longueur = int(longueurs.max(initial=0))
+        codes = np.full((len(sequences), longueur), -1, dtype=np.int64)
+        for i, suite in enumerate(sequences):
+            codes[i, :len(suite)] = suite
+        codes[codes >= k] = -1
+        # Dernière case à -1 : cible des codes invalides et des suites terminées
+        table = np.append(np.asarray(self.table, dtype=np.intc), -1)  # Liste, array('i') ou mmap
+        invalide = len(table) - 1
+        etats = np.full(len(sequences), self.etat_initial, dtype=np.int64)
+        bloques = np.zeros(len(sequences), dtype=np.int64)
+        premier_rejet = np.full(len(sequences), -1, dtype=np.int64)
+        for t in range(longueur):
+            actifs = t < longueurs
+            colonne = codes[:, t]
+            cases = np.where((colonne >= 0) & actifs, etats * k + colonne, invalide)
+            dst = table[cases]
+            rejet = (dst < 0) & actifs
+            etats = np.where(dst >= 0, dst, etats)
+            bloques += rejet
+            premier_rejet[rejet & (premier_rejet < 0)] = t
+        ids = self.ids_etats
+        return [BilanExecution(ids[e], n - b, b, p)
+                for e, n, b, p in zip(etats.tolist(), longueurs.tolist(), bloques.tolist(), premier_rejet.tolist())]
+
+    def executer_sequences(self, sequences: Iterable[Iterable[str]],
+                           taille_lot: int = 1024) -> Iterator[BilanExecution]:
+        """
+        Exécute des suites d'événements nommés, chacune depuis l'état initial.
+        
+        Les suites sont lues et traitées par lots de taille_lot (executer_lot) :
+        la mémoire dépend de la taille d'un lot, pas du nombre de suites.
+        
+        Args:
+            sequences: Suites d'événements (itérable ou générateur de suites)
+            taille_lot: Nombre de suites traitées ensemble
+            
+        Yields:
+            Un bilan par suite, dans l'ordre
+        """
+        code = self.codes_evenements.get
+        suites = iter(sequences)
+        while True:
+            lot = [[code(evt, -1) for evt in suite] for suite in islice(suites, taille_lot)]
+            if not lot:
+                return
+            yield from self.executer_lot(lot)
+
+    @property
+    def label_courant(self) -> str:
+        """Label de l'état courant."""
+        return self.labels[self.etat_courant]
@@ -0,0 +1,819 @@
+"""
+Micro-benchmarks du cœur du parking et des chemins de rendu de l'interface.
+
+Les mesures peuvent être écrites en JSON et comparées à une référence
+enregistrée ; le code de sortie vaut 1 en cas de régression.
+
+Usage:
+    python benchmarks.py                                  # Affichage seul
+    python benchmarks.py --rapide --json resultats.json   # Tailles réduites
+    python benchmarks.py --enregistrer-reference          # Écrit benchmarks_reference.json
+    python benchmarks.py --reference benchmarks_reference.json --tolerance 0.25
+
+La référence dépend de la machine : elle n'est pas versionnée. En intégration
+continue, elle est produite sur le même runner à partir du commit de base,
+dans le même mode (--rapide ou non) que la mesure comparée :
+    git checkout <base> && python benchmarks.py --rapide --enregistrer-reference
+    git checkout <branche> && python benchmarks.py --rapide --reference benchmarks_reference.json
+Une référence prise dans l'autre mode est refusée (code de sortie 2).
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from allocation import AllocateurPlaces
+from analyse_automate import minimiser
+from automate_base import Automate, Etat
+from definition_automate import charger_automate, construire_automate, lire_definition
+from evenements import ConsoleSink, NullSink, RingBufferSink
+from journal import JournalEvenements
+from occupation import CODE_ABONNE, CODE_VISITEUR
+from parking_async import ParkingAsync
+from parking_system import ParkingSystem
+from registre_plaques import RegistrePlaques
+from stockage import StockageSessions
+from tarification import CacheTarifs, GrilleTarifaire
+
+
+REFERENCE_DEFAULT = "benchmarks_reference.json"
+TOLERANCE_DEFAULT = 0.25  # Écart relatif toléré avant de signaler une régression
+
+# Mesure = (valeur, unité) ; une unité en "/s" est un débit (plus grand = meilleur),
+# les autres (ms, µs, s, octets) sont des coûts (plus petit = meilleur)
+Mesures = Dict[str, Tuple[float, str]]
+
+
+# Cycle complet entrée + sortie visiteur (revient à DISPONIBLE)
+CYCLE_EVENEMENTS = [
+    "detecter_entree", "lire_plaque", "acces_valide", "vehicule_entre",
+    "demande_sortie", "paiement_requis", "paiement_valide", "vehicule_sorti",
+    "parking_plein",  # Bloqué depuis STATIONNEMENT : mesure aussi le chemin refusé
+]
+
+
+def _mesurer(fonction: Callable[[], int]) -> float:
+    """Exécute `fonction` (qui retourne le nombre d'opérations) et renvoie ops/s."""
+    debut = time.perf_counter()
+    nb_operations = fonction()
+    return nb_operations / (time.perf_counter() - debut)
+
+
+def bench_transition(nb_cycles: int = 100_000) -> Dict[str, float]:
+    """
+    Compare Automate.transition (parcours de dictionnaires) et la forme compilée.
+
+    La sortie console du mode dictionnaire est redirigée vers un tampon pour ne
+    mesurer que le coût de formatage, pas celui du terminal.
+
+    Args:
+        nb_cycles: Nombre de cycles complets à rejouer
+
+    Returns:
+        Dictionnaire {mode: événements/s}
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        automate = ParkingSystem().automate
+
+    def dict_walk() -> int:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(nb_cycles):
+                for evt in CYCLE_EVENEMENTS:
+                    automate.transition(evt)
+        return nb_cycles * len(CYCLE_EVENEMENTS)
+
+    compile_ = automate.compiler()
+    codes = [compile_.code_evenement(evt) for evt in CYCLE_EVENEMENTS]
+
+    def table() -> int:
+        transition = compile_.transition
+        for _ in range(nb_cycles):
+            for code in codes:
+                transition(code)
+        return nb_cycles * len(codes)
+
+    return {"dict_walk": _mesurer(dict_walk), "compile": _mesurer(table)}
+
+
+def bench_sinks(nb_cycles: int = 20_000) -> Dict[str, float]:
+    """
+    Mesure les cycles entrée + sortie par seconde selon le sink d'événements.
+
+    Args:
+        nb_cycles: Nombre de cycles à exécuter par sink
+
+    Returns:
+        Dictionnaire {sink: cycles/s}
+    """
+    resultats = {}
+    for nom, sink in [("console", ConsoleSink()), ("ring", RingBufferSink()), ("null", NullSink())]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            parking = ParkingSystem(places_totales=1, sink=sink)
+
+            def cycles() -> int:
+                for _ in range(nb_cycles):
+                    parking.gerer_entree()
+                    parking.gerer_sortie()
+                return nb_cycles
+
+            resultats[nom] = _mesurer(cycles)
+    return resultats
+
+
+def bench_sessions(nb_voies: int, nb_vehicules: int = 20_000) -> Dict[str, float]:
+    """
+    Entrelace `nb_voies` entrées simultanées en tourniquet.
+
+    Args:
+        nb_voies: Nombre de sessions en cours à tout instant
+        nb_vehicules: Nombre total de véhicules à faire entrer
+
+    Returns:
+        Dictionnaire {"vehicules_s": débit, "octets_session": mémoire par session}
+    """
+    parking = ParkingSystem(places_totales=nb_vehicules, sink=NullSink())
+
+    tracemalloc.start()
+    avant = tracemalloc.take_snapshot()
+    voies = [parking.etapes_entree() for _ in range(nb_voies)]
+    for voie in voies:
+        next(voie)
+    apres = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    octets = sum(d.size_diff for d in apres.compare_to(avant, "filename"))
+    for voie in voies:
+        voie.close()
+
+    def tourniquet() -> int:
+        restants = nb_vehicules
+        voies = []
+        while restants or voies:
+            while restants and len(voies) < nb_voies:
+                voies.append(parking.etapes_entree())
+                restants -= 1
+            actives = []
+            for voie in voies:
+                if next(voie, None) is not None:
+                    actives.append(voie)
+            voies = actives
+        return nb_vehicules
+
+    return {"vehicules_s": _mesurer(tourniquet), "octets_session": octets / nb_voies}
+
+
+def bench_allocation(nb_places: int, nb_operations: int = 200_000) -> float:
+    """
+    Mesure acquisitions + libérations par seconde sur un parking à moitié plein.
+
+    Args:
+        nb_places: Taille du parking
+        nb_operations: Nombre de couples acquérir/libérer
+
+    Returns:
+        Opérations (acquérir + libérer) par seconde
+    """
+    allocateur = AllocateurPlaces(nb_places)
+    for _ in range(nb_places // 2):
+        allocateur.acquerir()
+
+    def cycles() -> int:
+        for _ in range(nb_operations):
+            allocateur.liberer(allocateur.place_occupee_aleatoire())
+            allocateur.acquerir()
+        return 2 * nb_operations
+
+    return _mesurer(cycles)
+
+
+def bench_tarification(nb_sorties: int = 1_000_000) -> float:
+    """
+    Mesure le calcul par lot des montants (grille à paliers et plafond).
+
+    Args:
+        nb_sorties: Nombre de sorties dans le lot
+
+    Returns:
+        Sorties tarifées par seconde
+    """
+    grille = GrilleTarifaire(tarif_horaire=2.0, paliers=[(1, 2.0), (3, 5.0)], plafond_journalier=20.0)
+    rng = random.Random(0)
+    durees = [rng.uniform(0, 3 * 86400) for _ in range(nb_sorties)]
+    types = bytearray(rng.choice([CODE_VISITEUR, CODE_ABONNE]) for _ in range(nb_sorties))
+
+    def lot() -> int:
+        grille.calculer_lot(durees, types)
+        return nb_sorties
+
+    return _mesurer(lot)
+
+
+def bench_cache_tarifs(nb_sorties: int = 500_000) -> Dict[str, float]:
+    """
+    Compare le calcul unitaire direct et le cache LRU sur des durées réalistes.
+
+    Args:
+        nb_sorties: Nombre de sorties tarifées
+
+    Returns:
+        Dictionnaire {mode: sorties/s}
+    """
+    grille = GrilleTarifaire(tarif_horaire=2.0, paliers=[(1, 2.0), (3, 5.0)], plafond_journalier=20.0)
+    cache = CacheTarifs(grille)
+    rng = random.Random(0)
+    durees = [rng.expovariate(1 / 7200) for _ in range(nb_sorties)]
+
+    def direct() -> int:
+        for duree in durees:
+            grille.calculer(duree)
+        return nb_sorties
+
+    def avec_cache() -> int:
+        for duree in durees:
+            cache.montant(duree)
+        return nb_sorties
+
+    return {"direct": _mesurer(direct), "cache": _mesurer(avec_cache)}
+
+
+def bench_journal(nb_cycles: int = 20_000) -> Dict[str, float]:
+    """
+    Compare le cycle entrée + sortie sans journal, avec un fsync par événement
+    et avec validation groupée (group commit).
+
+    Args:
+        nb_cycles: Nombre de cycles entrée + sortie visiteur
+
+    Returns:
+        Dictionnaire {mode: événements journalisés/s} (3 événements par cycle)
+    """
+    modes = {"sans": None, "fsync_1": 1, "groupe_256": 256}
+    resultats = {}
+    for mode, taille_groupe in modes.items():
+        with tempfile.TemporaryDirectory() as repertoire:
+            journal = JournalEvenements(repertoire, taille_groupe=taille_groupe) if taille_groupe else None
+            parking = ParkingSystem(places_totales=10, sink=NullSink(), journal=journal)
+            # Le mode fsync_1 est borné à quelques milliers d'événements pour rester court
+            n = nb_cycles if taille_groupe != 1 else min(nb_cycles, 1000)
+
+            def cycles() -> int:
+                for _ in range(n):
+                    place = parking.gerer_entree(horodatage=0.0)
+                    parking.gerer_sortie(montant=2.0, place=place)
+                if journal is not None:
+                    journal.fermer()
+                return 3 * n
+
+            resultats[mode] = _mesurer(cycles)
+    return resultats
+
+
+def bench_stockage(nb_sessions: int = 1_000_000) -> Dict[str, float]:
+    """
+    Mesure le coût d'enregistrement d'une session et d'un rapport mensuel.
+
+    Args:
+        nb_sessions: Nombre de sessions insérées (réparties sur environ 3 mois)
+
+    Returns:
+        Dictionnaire : µs par enregistrement, ms par rapport de recettes mensuel
+        et par historique d'une place
+    """
+    with tempfile.TemporaryDirectory() as repertoire:
+        stockage = StockageSessions(os.path.join(repertoire, "sessions.db"))
+        rng = random.Random(0)
+        sessions = []
+        for i in range(nb_sessions):
+            entree = i * 8.0
+            sessions.append((rng.randrange(2000), "ABONNE" if i % 5 == 0 else "VISITEUR",
+                             entree, entree + rng.expovariate(1 / 7200), 4.0))
+
+        debut = time.perf_counter()
+        for session in sessions:
+            stockage.enregistrer(*session)
+        stockage.valider()
+        us_session = (time.perf_counter() - debut) / nb_sessions * 1e6
+
+        mois = 30 * 86400.0
+        debut = time.perf_counter()
+        for k in range(3):
+            stockage.recettes(k * mois, (k + 1) * mois)
+        ms_rapport = (time.perf_counter() - debut) / 3 * 1000
+
+        debut = time.perf_counter()
+        for place in range(100):
+            stockage.sessions_place(place, 0.0, mois)
+        ms_place = (time.perf_counter() - debut) / 100 * 1000
+        stockage.fermer()
+    return {"us_session": us_session, "ms_rapport_mois": ms_rapport, "ms_historique_place": ms_place}
+
+
+def bench_concurrence(nb_threads: int, nb_cycles: int = 40_000) -> Dict[str, float]:
+    """
+    Mesure le débit d'un ParkingSystem partagé par plusieurs contrôleurs (threads).
+
+    Le temps d'attente du verrou est mesuré en remplaçant ParkingSystem.verrou
+    par un verrou instrumenté ; il inclut l'attente du GIL pendant acquire().
+
+    Args:
+        nb_threads: Nombre de contrôleurs concurrents
+        nb_cycles: Nombre total de cycles entrée + sortie, répartis entre les threads
+
+    Returns:
+        Dictionnaire : cycles/s et part du temps passée à attendre le verrou
+    """
+    parking = ParkingSystem(places_totales=1000, sink=NullSink())
+    verrou = parking.verrou
+    attente = [0.0]
+
+    class VerrouMesure:
+        def __enter__(self):
+            debut = time.perf_counter()
+            verrou.acquire()
+            attente[0] += time.perf_counter() - debut
+
+        def __exit__(self, *exc):
+            verrou.release()
+
+    parking.verrou = VerrouMesure()
+    par_thread = nb_cycles // nb_threads
+
+    def controleur(_: int) -> None:
+        for _ in range(par_thread):
+            place = parking.gerer_entree(horodatage=0.0)
+            parking.gerer_sortie(montant=1.0, place=place, horodatage=60.0)
+
+    debut = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=nb_threads) as pool:
+        list(pool.map(controleur, range(nb_threads)))
+    ecoule = time.perf_counter() - debut
+    assert parking.recettes_totales == par_thread * nb_threads
+    return {"cycles_s": par_thread * nb_threads / ecoule,
+            "attente_verrou": attente[0] / (ecoule * nb_threads)}
+
+
+def bench_async(nb_voies: int, nb_vehicules: int = 20_000) -> float:
+    """
+    Débit de la façade asyncio avec des périphériques simulés (une suspension
+    par lecture de plaque et par paiement).
+
+    Args:
+        nb_voies: Nombre de voies servies en parallèle par la boucle
+        nb_vehicules: Nombre total de cycles entrée + sortie
+
+    Returns:
+        Véhicules/s
+    """
+    parking = ParkingSystem(places_totales=max(nb_voies, 10), sink=NullSink())
+
+    async def lire_plaque() -> str:
+        await asyncio.sleep(0)
+        return "AA-000-AA"
+
+    async def payer(montant: float, place) -> bool:
+        await asyncio.sleep(0)
+        return True
+
+    facade = ParkingAsync(parking, lire_plaque=lire_plaque, payer=payer)
+
+    async def voie(n: int) -> None:
+        for _ in range(n):
+            place = await facade.entree(horodatage=0.0)
+            await facade.sortie(place=place, montant=1.0, horodatage=60.0)
+
+    async def scenario() -> int:
+        await asyncio.gather(*(voie(nb_vehicules // nb_voies) for _ in range(nb_voies)))
+        return nb_vehicules // nb_voies * nb_voies
+
+    return _mesurer(lambda: asyncio.run(scenario()))
+
+
+def bench_registre(nb_plaques: int = 1_000_000, nb_controles: int = 200_000) -> Dict[str, float]:
+    """
+    Contrôles d'accès par seconde avec un registre d'un million de plaques.
+
+    Args:
+        nb_plaques: Nombre d'abonnés enregistrés (liste noire : 1 % de ce nombre)
+        nb_controles: Nombre de plaques contrôlées (moitié abonnés, moitié inconnues)
+
+    Returns:
+        Dictionnaire : temps de chargement (s), contrôles/s, et octets par
+        plaque du filtre de Bloom
+    """
+    rng = random.Random(0)
+    abonnes = {f"AB-{i:07d}": float("inf") for i in range(nb_plaques)}
+    liste_noire = [f"NR-{i:07d}" for i in range(nb_plaques // 100)]
+    registre = RegistrePlaques()
+    debut = time.perf_counter()
+    registre.charger(abonnes, liste_noire)
+    chargement = time.perf_counter() - debut
+
+    plaques = [f"ab {rng.randrange(nb_plaques):07d}" if i % 2 else f"zz-{i:07d}"
+               for i in range(nb_controles)]
+
+    def controles() -> int:
+        verifier = registre.verifier
+        for plaque in plaques:
+            verifier(plaque)
+        return nb_controles
+
+    return {"chargement_s": chargement, "controles_s": _mesurer(controles),
+            "octets_bloom_par_plaque": registre.octets_filtre() / len(liste_noire)}
+
+
+def bench_minimisation(nb_etats: int, nb_evenements: int = 8) -> float:
+    """
+    Minimise un automate aléatoire (presque toujours déjà minimal : chaque
+    classe doit être isolée, cas le plus coûteux pour Hopcroft).
+
+    Args:
+        nb_etats: Nombre d'états
+        nb_evenements: Nombre d'événements distincts
+
+    Returns:
+        Durée de la minimisation (secondes)
+    """
+    rng = random.Random(2)
+    automate = Automate(NullSink())
+    for i in range(nb_etats):
+        automate.ajouter_etat(Etat(i, f"E{i}", "initial" if i == 0 else rng.choice(["normal", "final"])))
+    for i in range(nb_etats):
+        for evt in range(nb_evenements):
+            if rng.random() < 0.9:
+                automate.ajouter_transition(i, rng.randrange(nb_etats), f"evt{evt}")
+    debut = time.perf_counter()
+    minimiser(automate)
+    return time.perf_counter() - debut
+
+
+def bench_definition(nb_etats: int, nb_evenements: int = 8) -> Dict[str, float]:
+    """
+    Chargement d'une définition JSON : construction des objets Automate puis
+    compilation, comparée à la projection de l'artefact en cache.
+
+    Args:
+        nb_etats: Nombre d'états de la définition
+        nb_evenements: Nombre d'événements distincts
+
+    Returns:
+        Durées en millisecondes : "objets", "premier_chargement" (compilation
+        et écriture de l'artefact), "artefact" (mmap d'un artefact existant)
+    """
+    rng = random.Random(3)
+    definition = {
+        "etats": [{"id": i, "label": f"E{i}", "type": "initial" if i == 0 else "normal"}
+                  for i in range(nb_etats)],
+        "transitions": [[i, rng.randrange(nb_etats), f"evt{evt}"]
+                        for i in range(nb_etats) for evt in range(nb_evenements) if rng.random() < 0.9],
+    }
+    with tempfile.TemporaryDirectory() as repertoire:
+        chemin = os.path.join(repertoire, "automate.json")
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            json.dump(definition, fichier)
+        etapes = {
+            "objets": lambda: construire_automate(lire_definition(chemin), NullSink()).compiler(),
+            "premier_chargement": lambda: charger_automate(chemin),
+            "artefact": lambda: charger_automate(chemin),
+        }
+        resultats = {}
+        for mode, etape in etapes.items():
+            debut = time.perf_counter()
+            etape()
+            resultats[mode] = (time.perf_counter() - debut) * 1000
+    return resultats
+
+
+def bench_rejeu(nb_evenements: int = 1_000_000, longueur_suite: int = 100) -> Dict[str, float]:
+    """
+    Rejeu d'événements hors ligne sur l'automate du parking (cycle de référence).
+
+    Args:
+        nb_evenements: Nombre total d'événements rejoués par mode
+        longueur_suite: Longueur des suites indépendantes du mode par lot
+
+    Returns:
+        Débits (événements/s) : "transition" (un appel par événement),
+        "flux" (générateur de noms), "codes" (array de codes), "lot" (suites
+        indépendantes, vectorisées si NumPy est installé)
+    """
+    automate = ParkingSystem(sink=NullSink()).automate
+    graphe = automate.compiler()
+    nb_cycles = nb_evenements // len(CYCLE_EVENEMENTS)
+    codes = [graphe.codes_evenements[evt] for evt in CYCLE_EVENEMENTS]
+    suite = codes * (longueur_suite // len(codes))
+
+    def transitions() -> int:
+        for _ in range(nb_cycles):
+            for evt in CYCLE_EVENEMENTS:
+                automate.transition(evt)
+        return nb_cycles * len(CYCLE_EVENEMENTS)
+
+    def flux() -> int:
+        bilan = graphe.executer(evt for _ in range(nb_cycles) for evt in CYCLE_EVENEMENTS)
+        return bilan.acceptes + bilan.bloques
+
+    tableau = array("i", codes * nb_cycles)
+
+    def tableau_codes() -> int:
+        bilan = graphe.executer_codes(tableau)
+        return bilan.acceptes + bilan.bloques
+
+    def lot() -> int:
+        bilans = graphe.executer_lot([suite] * (nb_evenements // len(suite)))
+        return sum(b.acceptes + b.bloques for b in bilans)
+
+    graphe.executer_lot([suite])  # Import éventuel de NumPy hors mesure
+    return {"transition": _mesurer(transitions), "flux": _mesurer(flux),
+            "codes": _mesurer(tableau_codes), "lot": _mesurer(lot)}
+
+
+def bench_graph_frames(nb_frames: int = 40) -> Dict[str, float]:
+    """
+    Mesure GraphWidget.draw_graph avec le backend Qt offscreen.
+
+    Args:
+        nb_frames: Nombre de mises à jour mesurées
+
+    Returns:
+        Médianes en ms : image mise à jour (draw_graph + traitement des
+        événements Qt, fond en cache), et rendu complet du canvas (coût d'un
+        fond à refaire, par exemple après un redimensionnement)
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from graphe_automate import GraphWidget
+
+    app = QApplication.instance() or QApplication([])
+    with contextlib.redirect_stdout(io.StringIO()):
+        widget = GraphWidget(ParkingSystem().automate)
+    widget.resize(900, 400)
+    widget.show()
+    app.processEvents()
+
+    chemin = ["DISPONIBLE", "IDENTIFICATION", "VERIFICATION_ACCES",
+              "BARRIERE_ENTREE_OUVERTE", "STATIONNEMENT"]
+    resultats = {}
+    for mode in ("image", "rendu_complet"):
+        durees = []
+        for i in range(nb_frames):
+            k = i % len(chemin)
+            debut = time.perf_counter()
+            if mode == "image":
+                widget.draw_graph(chemin[k], chemin[:k + 1])
+            else:
+                widget.canvas.draw()
+            app.processEvents()
+            durees.append((time.perf_counter() - debut) * 1000)
+        resultats[mode] = statistics.median(durees)
+    widget.close()
+    return resultats
+
+
+def bench_demarrage_gui(nb_lancements: int = 5) -> Dict[str, float]:
+    """
+    Mesure le démarrage à froid de l'interface dans des processus neufs.
+
+    Le temps d'import est lu dans la sortie de `python -X importtime` (ligne
+    cumulée de gui_parking) ; le premier affichage va du lancement de
+    l'interpréteur à la fenêtre montrée et peinte une première fois.
+
+    Args:
+        nb_lancements: Nombre de processus lancés par mesure
+
+    Returns:
+        Médianes en ms : import de gui_parking, premier affichage du tableau de bord
+    """
+    import subprocess
+
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    repertoire = os.path.dirname(os.path.abspath(__file__))
+    imports, affichages = [], []
+    for _ in range(nb_lancements):
+        sortie = subprocess.run([sys.executable, "-X", "importtime", "-c", "import gui_parking"],
+                                cwd=repertoire, env=env, capture_output=True, text=True, check=True)
+        ligne = next(l for l in sortie.stderr.splitlines() if l.endswith("| gui_parking"))
+        imports.append(int(ligne.split("|")[1]) / 1000)
+
+        debut = time.perf_counter()
+        subprocess.run([sys.executable, "-c",
+                        "from PyQt5.QtWidgets import QApplication\n"
+                        "from gui_parking import ParkingDashboard\n"
+                        "app = QApplication([])\n"
+                        "fenetre = ParkingDashboard()\n"
+                        "fenetre.show()\n"
+                        "app.processEvents()\n"],
+                       cwd=repertoire, env=env, capture_output=True, check=True)
+        affichages.append((time.perf_counter() - debut) * 1000)
+    return {"import": statistics.median(imports), "premier_affichage": statistics.median(affichages)}
+
+
+def bench_update_clocks(nb_places: int, nb_rafraichissements: int = 20) -> float:
+    """
+    Mesure ParkingDashboard.update_clocks (avec le rendu Qt) sur un parking plein.
+
+    Args:
+        nb_places: Nombre de places du tableau de bord
+        nb_rafraichissements: Nombre de rafraîchissements mesurés
+
+    Returns:
+        Médiane en ms d'un rafraîchissement (mise à jour + traitement des événements Qt)
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    from gui_parking import ParkingDashboard
+
+    app = QApplication.instance() or QApplication([])
+    with contextlib.redirect_stdout(io.StringIO()):
+        tableau = ParkingDashboard(places_totales=nb_places)
+        tableau.show()
+        systeme = tableau.worker.system
+        systeme.sink = NullSink()
+        for i in range(nb_places):
+            tableau.update_place(systeme.gerer_entree(est_abonne=i % 2 == 0), 0)
+    app.processEvents()
+
+    durees = []
+    for _ in range(nb_rafraichissements):
+        tableau.textes_slots = [""] * len(tableau.textes_slots)  # Force la réécriture de chaque minuteur
+        debut = time.perf_counter()
+        tableau.update_clocks()
+        app.processEvents()
+        durees.append((time.perf_counter() - debut) * 1000)
+    tableau.close()
+    return statistics.median(durees)
+
+
+def executer_suite(rapide: bool = False, filtre: str = "") -> Mesures:
+    """
+    Exécute les benchmarks et rassemble les mesures.
+
+    Args:
+        rapide: Tailles réduites (pour un contrôle en quelques secondes)
+        filtre: Ne garde que les sections dont le nom contient cette chaîne
+
+    Returns:
+        {nom: (valeur, unité)}
+    """
+    k = 10 if rapide else 1
+    mesures: Mesures = {}
+
+    def section(nom: str) -> bool:
+        return filtre in nom
+
+    if section("transition"):
+        for mode, debit in bench_transition(100_000 // k).items():
+            mesures[f"transition.{mode}"] = (debit, "evt/s")
+    if section("cycle"):
+        for nom, debit in bench_sinks(20_000 // k).items():
+            mesures[f"cycle.sink_{nom}"] = (debit, "cycles/s")
+    if section("sessions"):
+        for nb_voies in (1, 10, 100, 500):
+            r = bench_sessions(nb_voies, 20_000 // k)
+            mesures[f"sessions.{nb_voies}_voies"] = (r["vehicules_s"], "vehicules/s")
+            mesures[f"sessions.{nb_voies}_voies_memoire"] = (r["octets_session"], "octets")
+    if section("allocation"):
+        for nb_places in (10, 1_000, 100_000):
+            mesures[f"allocation.{nb_places}_places"] = (bench_allocation(nb_places, 200_000 // k), "op/s")
+    if section("tarification"):
+        mesures["tarification.lot"] = (bench_tarification(1_000_000 // k), "sorties/s")
+        for mode, debit in bench_cache_tarifs(500_000 // k).items():
+            mesures[f"tarification.{mode}"] = (debit, "sorties/s")
+    if section("journal"):
+        for mode, debit in bench_journal(20_000 // k).items():
+            mesures[f"journal.{mode}"] = (debit, "evt/s")
+    if section("concurrence"):
+        for nb_threads in (1, 4, 16):
+            r = bench_concurrence(nb_threads, 40_000 // k)
+            mesures[f"concurrence.{nb_threads}_threads"] = (r["cycles_s"], "cycles/s")
+    if section("async"):
+        for nb_voies in (1, 100, 500):
+            mesures[f"async.{nb_voies}_voies"] = (bench_async(nb_voies, 20_000 // k), "vehicules/s")
+    if section("registre"):
+        r = bench_registre(1_000_000 // k, 200_000 // k)
+        mesures["registre.chargement"] = (r["chargement_s"], "s")
+        mesures["registre.controles"] = (r["controles_s"], "controles/s")
+    if section("stockage"):
+        r = bench_stockage(1_000_000 // k)
+        mesures["stockage.enregistrement"] = (r["us_session"], "µs")
+        mesures["stockage.rapport_mois"] = (r["ms_rapport_mois"], "ms")
+        mesures["stockage.historique_place"] = (r["ms_historique_place"], "ms")
+    if section("analyse"):
+        for nb_etats in (10_000 // k, 50_000 // k):  # Nommée d'après la taille réellement mesurée
+            mesures[f"analyse.minimisation_{nb_etats}_etats"] = (bench_minimisation(nb_etats), "s")
+    if section("rejeu"):
+        for mode, debit in bench_rejeu(1_000_000 // k).items():
+            mesures[f"rejeu.{mode}"] = (debit, "evt/s")
+    if section("definition"):
+        for mode, ms in bench_definition(20_000 // k).items():
+            mesures[f"definition.chargement_{mode}"] = (ms, "ms")
+    if section("gui"):
+        try:
+            for mode, ms in bench_demarrage_gui(2 if rapide else 5).items():
+                mesures[f"gui.demarrage_{mode}"] = (ms, "ms")
+            for mode, ms in bench_graph_frames().items():
+                mesures[f"gui.draw_graph_{mode}"] = (ms, "ms")
+            for nb_places in (10, 1_000):
+                mesures[f"gui.update_clocks_{nb_places}_places"] = (bench_update_clocks(nb_places), "ms")
+        except ImportError:
+            print("gui : PyQt5/matplotlib absents, mesures ignorées", file=sys.stderr)
+    return mesures
+
+
+def comparer(mesures: Mesures, reference: Mesures,
+             tolerance: float = TOLERANCE_DEFAULT) -> List[Tuple[str, float, float]]:
+    """
+    Compare des mesures à une référence.
+
+    Args:
+        mesures: Mesures courantes
+        reference: Mesures de référence (seules les mesures communes sont comparées)
+        tolerance: Dégradation relative tolérée (0.25 = 25 %)
+
+    Returns:
+        Liste des régressions (nom, valeur de référence, valeur courante)
+    """
+    regressions = []
+    for nom, (valeur, unite) in mesures.items():
+        if nom not in reference:
+            continue
+        ancienne = reference[nom][0]
+        if unite.endswith("/s"):
+            degradee = valeur < ancienne * (1 - tolerance)
+        else:
+            degradee = valeur > ancienne * (1 + tolerance)
+        if degradee:
+            regressions.append((nom, ancienne, valeur))
+    return regressions
+
+
+def _lire_mesures(chemin: str) -> Tuple[Mesures, bool]:
+    """Relit un fichier de mesures : (mesures, True si elles ont été prises en mode rapide)."""
+    with open(chemin, encoding="utf-8") as fichier:
+        donnees = json.load(fichier)
+    mesures = {nom: (m["valeur"], m["unite"]) for nom, m in donnees["mesures"].items()}
+    return mesures, bool(donnees.get("rapide", False))
+
+
+def _ecrire_mesures(chemin: str, mesures: Mesures, rapide: bool) -> None:
+    donnees = {
+        "python": platform.python_version(),
+        "plateforme": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "rapide": rapide,
+        "mesures": {nom: {"valeur": valeur, "unite": unite} for nom, (valeur, unite) in mesures.items()},
+    }
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        json.dump(donnees, fichier, indent=2, ensure_ascii=False)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks du parking.")
+    parser.add_argument("--rapide", action="store_true", help="Tailles réduites")
+    parser.add_argument("--filtre", default="", help="Sections à exécuter (sous-chaîne du nom)")
+    parser.add_argument("--json", help="Fichier où écrire les mesures")
+    parser.add_argument("--reference", help="Référence à laquelle comparer les mesures")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE_DEFAULT,
+                        help="Dégradation relative tolérée (défaut : 0.25)")
+    parser.add_argument("--enregistrer-reference", action="store_true",
+                        help=f"Écrit les mesures dans {REFERENCE_DEFAULT}")
+    args = parser.parse_args()
+
+    reference: Mesures = {}
+    if args.reference:
+        reference, reference_rapide = _lire_mesures(args.reference)
+        if reference_rapide != args.rapide:
+            mode = "rapide" if reference_rapide else "complet"
+            print(f"Référence {args.reference} prise en mode {mode} : relancer dans le même mode "
+                  f"(tailles différentes, comparaison impossible).", file=sys.stderr)
+            return 2
+    mesures = executer_suite(args.rapide, args.filtre)
+    for nom, (valeur, unite) in mesures.items():
+        ligne = f"{nom:<36} {valeur:>16,.2f} {unite}"
+        if nom in reference and reference[nom][0]:
+            ligne += f"   ({valeur / reference[nom][0] - 1:+.1%} / référence)"
+        print(ligne)
+
+    if args.json:
+        _ecrire_mesures(args.json, mesures, args.rapide)
+    if args.enregistrer_reference:
+        _ecrire_mesures(REFERENCE_DEFAULT, mesures, args.rapide)
+
+    regressions = comparer(mesures, reference, args.tolerance)
+    for nom, ancienne, valeur in regressions:
+        print(f"RÉGRESSION {nom} : {ancienne:,.2f} -> {valeur:,.2f}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+Générateur de charge pour serveur.py : débit imposé, latences p50/p99.
+
+Chaque connexion envoie ses requêtes à intervalles réguliers (charge en
+boucle ouverte : l'envoi n'attend pas les réponses) et alterne entrées et
+sorties des places obtenues.
+
+Usage:
+    python client_charge.py --debit 5000 --duree 10 --connexions 50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import deque
+from typing import Dict, List
+
+from serveur import PORT_DEFAULT
+
+
+async def _connexion(hote: str, port: int, debit: float, duree: float,
+                     latences: List[float], compteurs: Dict[str, int]) -> None:
+    """Pilote une connexion persistante au débit `debit` (requêtes/s) pendant `duree` secondes."""
+    lecteur, ecrivain = await asyncio.open_connection(hote, port)
+    envois: Dict[int, float] = {}
+    places: deque = deque()
+
+    async def recevoir() -> None:
+        while True:
+            ligne = await lecteur.readline()
+            if not ligne:
+                return
+            reponse = json.loads(ligne)
+            latences.append(time.perf_counter() - envois.pop(reponse["id"]))
+            compteurs["reponses"] += 1
+            if not reponse["ok"]:
+                compteurs["refus"] += 1
+            elif reponse.get("place") is not None:
+                places.append(reponse["place"])
+
+    reception = asyncio.ensure_future(recevoir())
+    periode = 1.0 / debit
+    debut = time.perf_counter()
+    n = 0
+    while True:
+        prochain = debut + n * periode
+        if prochain - debut >= duree:
+            break
+        attente = prochain - time.perf_counter()
+        if attente > 0:
+            await asyncio.sleep(attente)
+        requete = {"id": n, "op": "sortie", "place": places.popleft()} if places \
+            else {"id": n, "op": "entree", "abonne": n % 5 == 0}
+        envois[n] = prochain  # Latence mesurée depuis l'instant prévu (pas de biais d'omission)
+        ecrivain.write(json.dumps(requete).encode() + b"\n")
+        await ecrivain.drain()
+        compteurs["requetes"] += 1
+        n += 1
+    ecrivain.write_eof()  # Le serveur répond aux requêtes en cours puis ferme
+    await reception
+    ecrivain.close()
+
+
+async def executer_charge(hote: str = "127.0.0.1", port: int = PORT_DEFAULT, debit: float = 1000.0,
+                          duree: float = 5.0, connexions: int = 10) -> Dict[str, float]:
+    """
+    Envoie une charge régulière au serveur et mesure les latences.
+
+    Args:
+        hote: Adresse du serveur
+        port: Port du serveur
+        debit: Débit total visé (requêtes/s, réparti entre les connexions)
+        duree: Durée d'envoi (secondes)
+        connexions: Nombre de connexions persistantes
+
+    Returns:
+        Dictionnaire : requêtes, réponses, refus, débit obtenu, p50_ms, p99_ms
+    """
+    latences: List[float] = []
+    compteurs = {"requetes": 0, "reponses": 0, "refus": 0}
+    debut = time.perf_counter()
+    await asyncio.gather(*(_connexion(hote, port, debit / connexions, duree, latences, compteurs)
+                           for _ in range(connexions)))
+    ecoule = time.perf_counter() - debut
+    centiles = statistics.quantiles(latences, n=100) if len(latences) > 1 else [0.0] * 99
+    return {**compteurs,
+            "debit_obtenu": compteurs["reponses"] / ecoule,
+            "p50_ms": centiles[49] * 1000,
+            "p99_ms": centiles[98] * 1000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Générateur de charge pour le service du parking.")
+    parser.add_argument("--hote", default="127.0.0.1", help="Adresse du serveur")
+    parser.add_argument("--port", type=int, default=PORT_DEFAULT, help="Port du serveur")
+    parser.add_argument("--debit", type=float, default=1000.0, help="Requêtes par seconde (total)")
+    parser.add_argument("--duree", type=float, default=5.0, help="Durée d'envoi (s)")
+    parser.add_argument("--connexions", type=int, default=10, help="Connexions persistantes")
+    args = parser.parse_args()
+
+    resultats = asyncio.run(executer_charge(args.hote, args.port, args.debit, args.duree, args.connexions))
+    for cle, valeur in resultats.items():
+        print(f"{cle:>14} : {valeur:,.2f}" if isinstance(valeur, float) else f"{cle:>14} : {valeur}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""
+Définitions déclaratives d'automates (JSON ou TOML) et artefacts compilés.
+
+Format d'une définition :
+    nom = "parking"
+    etats = [
+        {id = 0, label = "DISPONIBLE", type = "initial"},
+        {id = 1, label = "IDENTIFICATION"},               # type "normal" par défaut
+    ]
+    transitions = [
+        [0, 1, "detecter_entree"],                        # [source, destination, événement]
+        ["IDENTIFICATION", "DISPONIBLE", "abandon"],      # un état peut être désigné par son label
+    ]
+
+Une définition validée est compilée en un artefact binaire (table de
+transitions de AutomateCompile) rangé dans un cache sur disque, sous une clé
+dérivée du contenu du fichier. Au démarrage suivant, charger_automate
+projette l'artefact en mémoire (mmap) : ni analyse du fichier, ni validation,
+ni objets Etat ; les processus qui chargent la même définition partagent les
+mêmes pages.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tomllib
+from array import array
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from automate_base import Automate, AutomateCompile, Etat
+from evenements import EvenementSink
+
+
+TYPES_ETATS = ("initial", "normal", "final", "puits")
+REPERTOIRE_CACHE_DEFAULT = "__pycache__"  # Sous-dossier du fichier de définition
+
+_MAGIC = b"AUTOMATE"
+_VERSION_FORMAT = 1
+# magic, version, nb_etats, nb_evenements, etat_initial, taille des métadonnées (ordre natif)
+_ENTETE = struct.Struct("=8sIIIiI")
+
+
+class DefinitionInvalide(ValueError):
+    """
+    Définition d'automate rejetée par la validation.
+
+    Attributes:
+        erreurs: Liste de toutes les erreurs relevées
+    """
+
+    def __init__(self, erreurs: List[str]) -> None:
+        super().__init__("Définition d'automate invalide :\n  - " + "\n  - ".join(erreurs))
+        self.erreurs = erreurs
+
+
+def _decoder(contenu: bytes, chemin: str) -> Dict[str, Any]:
+    """Décode le contenu d'un fichier de définition selon son extension (.toml ou .json)."""
+    if chemin.endswith(".toml"):
+        return tomllib.loads(contenu.decode("utf-8"))
+    return json.loads(contenu)
+
+
+def lire_definition(chemin: str) -> Dict[str, Any]:
+    """
+    Lit et valide un fichier de définition.
+
+    Args:
+        chemin: Fichier .toml ou .json
+
+    Returns:
+        La définition (dictionnaire)
+
+    Raises:
+        DefinitionInvalide: Si la définition est incohérente
+    """
+    with open(chemin, "rb") as fichier:
+        definition = _decoder(fichier.read(), chemin)
+    valider_definition(definition)
+    return definition
+
+
+def _resoudre(ref: Any, ids: Dict[int, int], labels: Dict[str, int]) -> Optional[int]:
+    """ID d'un état désigné par son ID ou son label (None si inconnu)."""
+    if isinstance(ref, bool):
+        return None
+    if isinstance(ref, int):
+        return ref if ref in ids else None
+    if isinstance(ref, str):
+        return labels.get(ref)
+    return None
+
+
+def valider_definition(definition: Any) -> None:
+    """
+    Vérifie la cohérence d'une définition et relève toutes les erreurs.
+
+    Contrôles : présence des listes etats et transitions, ID entiers et
+    labels uniques, types connus, un et un seul état initial, états des
+    transitions existants, au plus une destination par couple (état,
+    événement), aucune transition sortant d'un état "puits".
+
+    Raises:
+        DefinitionInvalide: Si au moins une erreur est relevée
+    """
+    if not isinstance(definition, dict):
+        raise DefinitionInvalide(["la définition doit être un objet (table)"])
+    erreurs: List[str] = []
+    etats = definition.get("etats")
+    transitions = definition.get("transitions", [])
+    if not isinstance(etats, list) or not etats:
+        erreurs.append("'etats' doit être une liste non vide")
+        etats = []
+    if not isinstance(transitions, list):
+        erreurs.append("'transitions' doit être une liste")
+        transitions = []
+
+    ids: Dict[int, int] = {}
+    labels: Dict[str, int] = {}
+    types: Dict[int, str] = {}
+    nb_initiaux = 0
+    for n, etat in enumerate(etats):
+        if not isinstance(etat, dict):
+            erreurs.append(f"état n°{n} : objet attendu")
+            continue
+        id_etat, label, type_etat = etat.get("id"), etat.get("label"), etat.get("type", "normal")
+        if not isinstance(id_etat, int) or isinstance(id_etat, bool):
+            erreurs.append(f"état n°{n} : 'id' entier attendu")
+            continue
+        if not isinstance(label, str) or not label:
+            erreurs.append(f"état {id_etat} : 'label' non vide attendu")
+            continue
+        if id_etat in ids:
+            erreurs.append(f"état {id_etat} : ID en double")
+        if label in labels:
+            erreurs.append(f"état {id_etat} : label '{label}' en double")
+        if type_etat not in TYPES_ETATS:
+            erreurs.append(f"état {id_etat} : type '{type_etat}' inconnu")
+        ids.setdefault(id_etat, n)
+        labels.setdefault(label, id_etat)
+        types.setdefault(id_etat, type_etat)
+        nb_initiaux += type_etat == "initial"
+    if etats and nb_initiaux != 1:
+        erreurs.append(f"un et un seul état initial attendu ({nb_initiaux} trouvé(s))")
+
+    destinations: Dict[Tuple[int, str], int] = {}
+    for n, transition in enumerate(transitions):
+        if not isinstance(transition, list) or len(transition) != 3:
+            erreurs.append(f"transition n°{n} : [source, destination, événement] attendu")
+            continue
+        source, destination, evt = transition
+        src, dst = _resoudre(source, ids, labels), _resoudre(destination, ids, labels)
+        if src is None:
+            erreurs.append(f"transition n°{n} : état source {source!r} inconnu")
+        if dst is None:
+            erreurs.append(f"transition n°{n} : état destination {destination!r} inconnu")
+        if not isinstance(evt, str) or not evt:
+            erreurs.append(f"transition n°{n} : événement non vide attendu")
+            continue
+        if src is None or dst is None:
+            continue
+        if types[src] == "puits":
+            erreurs.append(f"transition n°{n} : l'état puits {source!r} ne peut pas avoir de sortie")
+        if (src, evt) in destinations:
+            erreurs.append(f"transition n°{n} : '{evt}' depuis {source!r} déjà défini "
+                           f"(vers {destinations[(src, evt)]})")
+        else:
+            destinations[(src, evt)] = dst
+
+    if erreurs:
+        raise DefinitionInvalide(erreurs)
+
+
+def _transitions_resolues(definition: Dict[str, Any]) -> List[Tuple[int, int, str]]:
+    """Transitions (ID source, ID destination, événement) d'une définition validée."""
+    ids = {etat["id"]: n for n, etat in enumerate(definition["etats"])}
+    labels = {etat["label"]: etat["id"] for etat in definition["etats"]}
+    return [(_resoudre(src, ids, labels), _resoudre(dst, ids, labels), evt)
+            for src, dst, evt in definition.get("transitions", [])]
+
+
+def construire_automate(definition: Dict[str, Any], sink: Optional[EvenementSink] = None) -> Automate:
+    """
+    Construit un Automate à partir d'une définition.
+
+    Args:
+        definition: Définition (voir le format en tête de module)
+        sink: Destination des événements de l'automate (console par défaut)
+
+    Returns:
+        L'Automate, positionné sur son état initial
+
+    Raises:
+        DefinitionInvalide: Si la définition est incohérente
+    """
+    valider_definition(definition)
+    automate = Automate(sink=sink)
+    for etat in definition["etats"]:
+        automate.ajouter_etat(Etat(etat["id"], etat["label"], etat.get("type", "normal")))
+    for src, dst, evt in _transitions_resolues(definition):
+        automate.ajouter_transition(src, dst, evt)
+    return automate
+
+
+def compiler_definition(definition: Dict[str, Any]) -> AutomateCompile:
+    """
+    Compile une définition en table de transitions, sans créer d'objets Etat.
+
+    Raises:
+        DefinitionInvalide: Si la définition est incohérente
+    """
+    valider_definition(definition)
+    etats = definition["etats"]
+    index_etats = {etat["id"]: i for i, etat in enumerate(etats)}
+    transitions = _transitions_resolues(definition)
+    evenements = list(dict.fromkeys(evt for _, _, evt in transitions))
+    codes = {evt: code for code, evt in enumerate(evenements)}
+    k = len(evenements)
+    table = array("i", [-1]) * (len(etats) * k)
+    for src, dst, evt in transitions:
+        table[index_etats[src] * k + codes[evt]] = index_etats[dst]
+    types = [etat.get("type", "normal") for etat in etats]
+    return AutomateCompile.depuis_table([etat["id"] for etat in etats],
+                                        [etat["label"] for etat in etats], types,
+                                        evenements, table, types.index("initial"))
+
+
+def automate_depuis_compile(graphe: AutomateCompile, sink: Optional[EvenementSink] = None) -> Automate:
+    """
+    Reconstruit un Automate (affichage, analyse) à partir d'une forme compilée.
+
+    Args:
+        graphe: Forme compilée (par exemple chargée par charger_automate)
+        sink: Destination des événements de l'automate (console par défaut)
+
+    Returns:
+        L'Automate, positionné sur son état initial
+    """
+    automate = Automate(sink=sink)
+    for id_etat, label, type_etat in zip(graphe.ids_etats, graphe.labels, graphe.types):
+        automate.ajouter_etat(Etat(id_etat, label, type_etat))
+    k = graphe.nb_evenements
+    for i, dst in enumerate(graphe.table):
+        if dst >= 0:
+            automate.ajouter_transition(graphe.ids_etats[i // k], graphe.ids_etats[dst],
+                                        graphe.evenements[i % k])
+    return automate
+
+
+def ecrire_artefact(graphe: AutomateCompile, chemin: str) -> None:
+    """
+    Écrit la forme compilée dans un artefact binaire (remplacement atomique).
+
+    Disposition : en-tête, métadonnées JSON (ID, labels, types, événements),
+    bourrage jusqu'à un multiple de 4 octets, puis la table en entiers 32 bits
+    dans l'ordre d'octets de la machine.
+    """
+    meta = json.dumps({"ids": graphe.ids_etats, "labels": graphe.labels, "types": graphe.types,
+                       "evenements": graphe.evenements}).encode("utf-8")
+    meta += b" " * (-(_ENTETE.size + len(meta)) % 4)
+    entete = _ENTETE.pack(_MAGIC, _VERSION_FORMAT, len(graphe.ids_etats), graphe.nb_evenements,
+                          graphe.etat_initial, len(meta))
+    temporaire = f"{chemin}.{os.getpid()}.tmp"
+    with open(temporaire, "wb") as fichier:
+        fichier.write(entete)
+        fichier.write(meta)
+        fichier.write(array("i", graphe.table).tobytes())
+        fichier.flush()
+        os.fsync(fichier.fileno())
+    os.replace(temporaire, chemin)  # Un chargement concurrent voit l'ancien ou le nouvel artefact, jamais un mélange
+
+
+def ouvrir_artefact(chemin: str) -> AutomateCompile:
+    """
+    Projette un artefact en mémoire (lecture seule).
+
+    La table de l'AutomateCompile retourné est une vue sur les pages du
+    fichier : elle n'est ni copiée ni décodée, et reste valide tant que
+    l'objet existe. La taille du fichier est comparée à celle annoncée par
+    l'en-tête, ce qui écarte un artefact tronqué ou incohérent.
+
+    Raises:
+        ValueError: Si le fichier n'est pas un artefact de ce format, ou
+            s'il est tronqué ou incohérent
+    """
+    with open(chemin, "rb") as fichier:
+        projection = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)  # ValueError si vide
+    try:
+        if len(projection) < _ENTETE.size:
+            raise ValueError(f"{chemin} : artefact d'automate tronqué.")
+        magic, version, nb_etats, nb_evenements, etat_initial, taille_meta = _ENTETE.unpack_from(projection)
+        if magic != _MAGIC or version != _VERSION_FORMAT:
+            raise ValueError(f"{chemin} : artefact d'automate inconnu ou d'une autre version.")
+        debut_table = _ENTETE.size + taille_meta
+        if len(projection) != debut_table + 4 * nb_etats * nb_evenements:
+            raise ValueError(f"{chemin} : {len(projection)} octets, "
+                             f"{debut_table + 4 * nb_etats * nb_evenements} annoncés par l'en-tête.")
+        meta = json.loads(projection[_ENTETE.size:debut_table])
+        if not (isinstance(meta, dict) and len(meta.get("ids", ())) == nb_etats
+                and len(meta.get("evenements", ())) == nb_evenements and 0 <= etat_initial < nb_etats):
+            raise ValueError(f"{chemin} : métadonnées d'artefact incohérentes avec l'en-tête.")
+        ids, labels, types, evenements = meta["ids"], meta["labels"], meta["types"], meta["evenements"]
+    except (KeyError, TypeError) as erreur:
+        projection.close()
+        raise ValueError(f"{chemin} : métadonnées d'artefact invalides ({erreur!r}).") from erreur
+    except ValueError:
+        projection.close()
+        raise
+    table = memoryview(projection)[debut_table:].cast("i")
+    return AutomateCompile.depuis_table(ids, labels, types, evenements, table, etat_initial)
+
+
+def cle_contenu(contenu: bytes) -> str:
+    """Clé de cache d'un fichier de définition : SHA-256 du contenu, du format et de la plate-forme."""
+    empreinte = hashlib.sha256(f"{_VERSION_FORMAT}:{sys.byteorder}:{array('i').itemsize}:".encode())
+    empreinte.update(contenu)
+    return empreinte.hexdigest()
+
+
+def chemin_artefact(chemin: str, contenu: bytes, repertoire_cache: Optional[str] = None) -> str:
+    """Emplacement de l'artefact d'un fichier de définition dans le cache."""
+    if repertoire_cache is None:
+        repertoire_cache = os.path.join(os.path.dirname(os.path.abspath(chemin)), REPERTOIRE_CACHE_DEFAULT)
+    nom = os.path.splitext(os.path.basename(chemin))[0]
+    return os.path.join(repertoire_cache, f"{nom}.{cle_contenu(contenu)[:16]}.automate")
+
+
+def charger_automate(chemin: str, repertoire_cache: Optional[str] = None) -> AutomateCompile:
+    """
+    Charge un fichier de définition sous forme compilée, via le cache d'artefacts.
+
+    Si l'artefact correspondant au contenu actuel du fichier existe, il est
+    simplement projeté en mémoire. Sinon la définition est lue, validée,
+    compilée et l'artefact écrit avant d'être projeté : toute modification du
+    fichier change la clé et déclenche une recompilation. Un artefact
+    illisible (tronqué par un arrêt brutal, modifié) est recompilé de même.
+
+    Args:
+        chemin: Fichier de définition (.toml ou .json)
+        repertoire_cache: Dossier des artefacts (par défaut __pycache__ à côté du fichier)
+
+    Returns:
+        L'AutomateCompile, positionné sur l'état initial
+
+    Raises:
+        DefinitionInvalide: Si la définition est incohérente
+    """
+    with open(chemin, "rb") as fichier:
+        contenu = fichier.read()
+    artefact = chemin_artefact(chemin, contenu, repertoire_cache)
+    if os.path.exists(artefact):
+        try:
+            return ouvrir_artefact(artefact)
+        except ValueError:
+            pass  # Artefact invalide : remplacé ci-dessous
+    definition = _decoder(contenu, chemin)
+    graphe = compiler_definition(definition)
+    os.makedirs(os.path.dirname(artefact), exist_ok=True)
+    ecrire_artefact(graphe, artefact)
+    return ouvrir_artefact(artefact)
+
+
+def definition_depuis_automate(automate: Union[Automate, AutomateCompile],
+                               nom: str = "") -> Dict[str, Any]:
+    """
+    Exporte un automate au format de définition (pour l'écrire en JSON, par exemple).
+
+    Args:
+        automate: Automate ou forme compilée
+        nom: Nom de la définition
+
+    Returns:
+        La définition (dictionnaire)
+    """
+    if isinstance(automate, Automate):
+        automate = automate.compiler()
+    k = automate.nb_evenements
+    etats = [{"id": id_etat, "label": label, "type": type_etat}
+             for id_etat, label, type_etat in zip(automate.ids_etats, automate.labels, automate.types)]
+    transitions = [[automate.ids_etats[i // k], automate.ids_etats[dst], automate.evenements[i % k]]
+                   for i, dst in enumerate(automate.table) if dst >= 0]
+    return {"nom": nom, "etats": etats, "transitions": transitions}
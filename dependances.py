@@ -0,0 +1,24 @@
+"""
+Dépendances optionnelles, importées à la première utilisation.
+
+NumPy accélère les calculs par lot (tarification, rejeu d'automate,
+requêtes d'occupation). Sans lui, chaque appelant retombe sur une boucle
+Python aux résultats identiques ; le coût de l'import n'est payé qu'au
+premier calcul qui en a besoin.
+"""
+from typing import Any
+
+
+_numpy: Any = ...  # Module NumPy (None s'il est absent), ... tant qu'il n'a pas été importé
+
+
+def numpy_optionnel() -> Any:
+    """Retourne le module NumPy (None s'il n'est pas installé), importé au premier appel."""
+    global _numpy
+    if _numpy is ...:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
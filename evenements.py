@@ -0,0 +1,163 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+class Evenement:
+    """
+    Enregistrement structuré émis par le système.
+
+    Le message n'est formaté qu'à la demande (texte()), afin que les sinks
+    qui n'affichent rien ne paient pas le coût du formatage.
+
+    Attributes:
+        categorie: Catégorie de l'événement ("transition", "entree", ...)
+        gabarit: Gabarit str.format du message lisible
+        champs: Valeurs structurées utilisées par le gabarit
+        horodatage: Instant d'émission (time.time())
+    """
+
+    __slots__ = ("categorie", "gabarit", "champs", "horodatage")
+
+    def __init__(self, categorie: str, gabarit: str, champs: Dict[str, Any]) -> None:
+        self.categorie = categorie
+        self.gabarit = gabarit
+        self.champs = champs
+        self.horodatage = time.time()
+
+    def texte(self) -> str:
+        """Rend le message lisible."""
+        return self.gabarit.format(**self.champs)
+
+    def en_dict(self) -> Dict[str, Any]:
+        """Rend l'enregistrement sous forme sérialisable (JSON)."""
+        return {"ts": self.horodatage, "categorie": self.categorie,
+                "message": self.texte(), **self.champs}
+
+    def __repr__(self) -> str:
+        return f"Evenement({self.categorie}: {self.texte()})"
+
+
+class EvenementSink:
+    """
+    Destination des événements émis par l'automate et le parking.
+
+    Les sous-classes redéfinissent recevoir() ; emettre() est le point d'appel
+    unique utilisé par le code métier.
+    """
+
+    def emettre(self, categorie: str, gabarit: str, **champs: Any) -> None:
+        """
+        Émet un événement vers le sink.
+
+        Args:
+            categorie: Catégorie de l'événement
+            gabarit: Gabarit du message (formaté paresseusement)
+            **champs: Valeurs structurées de l'événement
+        """
+        self.recevoir(Evenement(categorie, gabarit, champs))
+
+    def recevoir(self, evenement: Evenement) -> None:
+        """Traite un événement reçu."""
+        raise NotImplementedError
+
+    def fermer(self) -> None:
+        """Libère les ressources du sink (rien par défaut)."""
+
+
+class NullSink(EvenementSink):
+    """Sink qui ignore tout : aucun objet créé, aucun formatage."""
+
+    def emettre(self, categorie: str, gabarit: str, **champs: Any) -> None:
+        pass
+
+    def recevoir(self, evenement: Evenement) -> None:
+        pass
+
+
+class ConsoleSink(EvenementSink):
+    """Sink historique : affiche chaque message sur la sortie standard."""
+
+    def emettre(self, categorie: str, gabarit: str, **champs: Any) -> None:
+        print(gabarit.format(**champs))
+
+    def recevoir(self, evenement: Evenement) -> None:
+        print(evenement.texte())
+
+
+class RingBufferSink(EvenementSink):
+    """
+    Conserve les derniers événements en mémoire, sans les formater.
+
+    Attributes:
+        tampon: File bornée des derniers événements
+    """
+
+    def __init__(self, capacite: int = 1000) -> None:
+        self.tampon: deque = deque(maxlen=capacite)
+
+    def recevoir(self, evenement: Evenement) -> None:
+        self.tampon.append(evenement)
+
+    def evenements(self, categorie: Optional[str] = None) -> List[Evenement]:
+        """
+        Retourne les événements conservés, du plus ancien au plus récent.
+
+        Args:
+            categorie: Filtre optionnel sur la catégorie
+        """
+        if categorie is None:
+            return list(self.tampon)
+        return [e for e in self.tampon if e.categorie == categorie]
+
+
+class JsonlSink(EvenementSink):
+    """
+    Écrit les événements en JSON Lines depuis un thread dédié, par lots.
+
+    L'appelant ne fait qu'empiler l'événement ; le formatage et l'écriture
+    ont lieu dans le thread d'écriture, qui vide la file d'un coup (jusqu'à
+    taille_lot événements) à chaque réveil.
+
+    Attributes:
+        chemin: Fichier de sortie (ouvert en ajout)
+        taille_lot: Nombre maximal d'événements écrits par lot
+    """
+
+    _FIN = object()
+
+    def __init__(self, chemin: str, taille_lot: int = 512) -> None:
+        self.chemin = chemin
+        self.taille_lot = taille_lot
+        self._file: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._boucle_ecriture, daemon=True)
+        self._thread.start()
+
+    def recevoir(self, evenement: Evenement) -> None:
+        self._file.put(evenement)
+
+    def _boucle_ecriture(self) -> None:
+        with open(self.chemin, "a", encoding="utf-8") as fichier:
+            termine = False
+            while not termine:
+                lot = [self._file.get()]
+                while len(lot) < self.taille_lot:
+                    try:
+                        lot.append(self._file.get_nowait())
+                    except queue.Empty:
+                        break
+                if any(e is self._FIN for e in lot):
+                    lot = [e for e in lot if e is not self._FIN]
+                    termine = True
+                lignes = [json.dumps(e.en_dict(), ensure_ascii=False, default=str) + "\n" for e in lot]
+                fichier.writelines(lignes)
+                fichier.flush()
+
+    def fermer(self) -> None:
+        """Écrit les événements en attente puis arrête le thread."""
+        if self._thread.is_alive():
+            self._file.put(self._FIN)
+            self._thread.join()
@@ -0,0 +1,352 @@
+"""
+Widget du graphe de l'automate (matplotlib + networkx).
+
+Module séparé de gui_parking : matplotlib et networkx représentent
+l'essentiel du temps d'import de l'interface. Le tableau de bord ne
+l'importe qu'au premier affichage de la vue graphe.
+"""
+# Bibliothèques standard
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# Bibliothèques tierces
+import networkx as nx
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from PyQt5.QtWidgets import QVBoxLayout, QWidget
+
+
+# Disposition fixe des états du parking (espacée pour de grandes bulles)
+POSITIONS_ETATS: Dict[str, Tuple[float, float]] = {
+    "COMPLET": (0.0, 8.0),
+    "DISPONIBLE": (0.0, 4.0),
+    "IDENTIFICATION": (4.0, 4.0),
+    "VERIFICATION_ACCES": (8.0, 4.0),
+    "BARRIERE_ENTREE_OUVERTE": (12.0, 4.0),
+    "STATIONNEMENT": (12.0, 0.0),
+    "CALCUL_TARIF": (8.0, 0.0),
+    "ATTENTE_PAIEMENT": (4.0, 0.0),
+    "BARRIERE_SORTIE_OUVERTE": (0.0, 0.0),
+}
+
+
+class GraphWidget(QWidget):
+    """
+    Widget d'affichage du graphe de l'automate.
+    
+    La partie statique (nœuds au repos, arêtes, étiquettes) est rendue une
+    fois dans une image de fond mise en cache. Chaque image ne recopie que ce
+    fond puis dessine par-dessus les éléments dynamiques (état actif, nœud
+    sélectionné, chemin parcouru, titre, info-bulle) et les affiche par blit.
+    Le fond est refait quand la taille du canvas change (clé fond_cle) ou
+    quand l'automate gagne des états ou des transitions (Automate.version).
+    """
+    
+    def __init__(self, automate) -> None:
+        super().__init__()
+        self.automate = automate
+        
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.figure = Figure(facecolor='#2b2b2b')
+        self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(self.canvas)
+        
+        self.canvas.mpl_connect('button_press_event', self.on_click)
+        self.canvas.mpl_connect('draw_event', self._sur_rendu_complet)
+        self.selected_node: Optional[str] = None
+        self.tooltip_annot = None
+        
+        self.G = nx.DiGraph()
+        self.pos: Optional[Dict] = None
+        self._positions: Dict[Tuple[int, bool], Dict] = {}  # (version, manuel) -> positions
+        self.fond = None      # Image de la partie statique (copy_from_bbox)
+        self.fond_cle = None  # (largeur, hauteur, version de l'automate) du fond en cache
+        self.temps_frames: deque = deque(maxlen=120)  # Durée (s) des derniers draw_graph
+        
+        self.labels_map = {
+            "DISPONIBLE": "1. DISPO-\nNIBLE",
+            "IDENTIFICATION": "2. IDENTI-\nFICATION",
+            "VERIFICATION_ACCES": "3. VERIF\nACCÈS",
+            "BARRIERE_ENTREE_OUVERTE": "4. BARRIÈRE\nOUVERTE",
+            "STATIONNEMENT": "5. VÉHICULE\nGARÉ",
+            "CALCUL_TARIF": "6. CALCUL\nTARIF",
+            "ATTENTE_PAIEMENT": "7. ATTENTE\nPAIEMENT",
+            "BARRIERE_SORTIE_OUVERTE": "8. BARRIÈRE\nSORTIE",
+            "COMPLET": "COMPLET"
+        }
+        
+        self.state_info = {
+            "DISPONIBLE": "Le système est prêt à accueillir un véhicule. (Attente détection)",
+            "IDENTIFICATION": "Lecture de la plaque ou du badge d'abonné.",
+            "VERIFICATION_ACCES": "Vérification des droits d'accès dans la base de données.",
+            "BARRIERE_ENTREE_OUVERTE": "Accès autorisé, la barrière s'ouvre.",
+            "STATIONNEMENT": "Véhicule garé. Le système surveille la place.",
+            "CALCUL_TARIF": "Calcul du montant à payer selon la durée.",
+            "ATTENTE_PAIEMENT": "Le conducteur doit régler le montant affiché.",
+            "BARRIERE_SORTIE_OUVERTE": "Paiement validé (ou gratuit), sortie autorisée.",
+            "COMPLET": "Aucune place disponible. Entrée bloquée."
+        }
+        
+        self._construire_structure()
+        self.update_layout(force_manual=True)
+
+    def _construire_structure(self):
+        self.G = nx.DiGraph()
+        for id_etat, etat in self.automate.list_etats.items():
+            self.G.add_node(etat.label_etat)
+        for t in self.automate.list_transitions:
+            src, dst = t.etat_source.label_etat, t.etat_dest.label_etat
+            lbl = t.etiquette.replace("vehicule_", "").replace("barriere_", "").replace("detecter_", "").replace("paiement_", "").replace("abonne_", "abonne")
+            if src == "BARRIERE_SORTIE_OUVERTE" and dst == "DISPONIBLE": lbl = "sorti/libéré"
+            self.G.add_edge(src, dst, label=lbl)
+        self.version_structure = self.automate.version
+
+    def update_layout(self, force_manual=True):
+        """
+        Place les nœuds puis recrée les artistes (et donc le fond en cache).
+        
+        Les positions sont calculées une fois par version de l'automate : la
+        disposition fixe POSITIONS_ETATS, les états qu'elle ne connaît pas
+        étant alignés sur une rangée en dessous (ou spring_layout seul si
+        force_manual est faux).
+        """
+        self.mode_manuel = force_manual
+        cle = (self.version_structure, force_manual)
+        if cle not in self._positions:
+            if force_manual:
+                pos = {n: POSITIONS_ETATS[n] for n in self.G if n in POSITIONS_ETATS}
+                inconnus = [n for n in self.G if n not in POSITIONS_ETATS]
+                y = min((y for _, y in pos.values()), default=4.0) - 4.0
+                pos.update((n, (4.0 * i, y)) for i, n in enumerate(inconnus))
+            else:
+                pos = {n: tuple(p) for n, p in nx.spring_layout(self.G, center=(6.0, 4.0), scale=6.0, seed=0).items()}
+            self._positions[cle] = pos
+        self.pos = self._positions[cle]
+        self._creer_artistes()
+        self.draw_graph(getattr(self, 'last_label', "DISPONIBLE"), getattr(self, 'last_history', []))
+        
+    def on_click(self, event):
+        if event.inaxes is None: return
+        # Trouver le noeud le plus proche
+        min_dist = float('inf')
+        closest = None
+        for node, (x, y) in self.pos.items():
+            dist = (x - event.xdata)**2 + (y - event.ydata)**2
+            if dist < min_dist:
+                min_dist = dist
+                closest = node
+        
+        if closest and min_dist < 1.0: # Seuil de clic
+            self.selected_node = closest if self.selected_node != closest else None
+            if hasattr(self, 'last_label'):
+                self.draw_graph(self.last_label, self.last_history)
+
+    def _style_noeud(self, node):
+        """Retourne (couleur de fond, couleur de bord, taille) d'un nœud au repos."""
+        if node == "COMPLET":
+            return '#ffcccc', 'red', 5000
+        if node == "STATIONNEMENT":
+            return '#ccffcc', 'green', 5000
+        if "BARRIERE" in node:
+            return '#ccccff', 'blue', 5000
+        return '#eeeeee', '#bdc3c7', 5000
+
+    def _creer_artistes(self):
+        """
+        Crée une fois pour toutes les artistes matplotlib du graphe.
+        
+        Les artistes statiques forment le fond en cache. Les artistes
+        dynamiques (animated=True, exclus du rendu complet) sont seulement
+        modifiés par draw_graph puis dessinés sur le fond.
+        """
+        self.figure.clear()
+        self.fond = None
+        ax = self.figure.add_subplot(111)
+        ax.set_facecolor('#2b2b2b')
+        self.ax = ax
+        self.noeuds = list(self.G.nodes())
+        labels = {n: self.labels_map.get(n, n) for n in self.noeuds}
+
+        # 1. Nodes (resting style)
+        styles = [self._style_noeud(n) for n in self.noeuds]
+        nx.draw_networkx_nodes(self.G, self.pos, ax=ax, nodelist=self.noeuds,
+                               node_color=[s[0] for s in styles], edgecolors=[s[1] for s in styles],
+                               linewidths=3, node_size=[s[2] for s in styles])
+
+        # 2. Labels inside nodes
+        self.textes_noeuds = nx.draw_networkx_labels(self.G, self.pos, ax=ax, labels=labels, 
+                                                     font_size=9, font_weight="bold", font_family="Arial")
+
+        # 3. Edges (default style) + historical overlay (Dashed, Blue), hidden until used.
+        #    Edges whose straight line would cross another node are drawn as arcs.
+        self.aretes_historique = {}
+        self.textes_aretes = {}
+        edge_labels = nx.get_edge_attributes(self.G, 'label')
+        groupes: Dict[str, List] = {}
+        for arete in self.G.edges():
+            groupes.setdefault(f'arc3,rad={self._courbure(*arete)}', []).append(arete)
+        for style, aretes in groupes.items():
+            nx.draw_networkx_edges(self.G, self.pos, ax=ax, edgelist=aretes, edge_color='#ecf0f1', 
+                                   arrows=True, arrowsize=25, width=2.0, 
+                                   connectionstyle=style,
+                                   min_source_margin=20, min_target_margin=20)
+            overlay = nx.draw_networkx_edges(self.G, self.pos, ax=ax, edgelist=aretes,
+                                             edge_color='#3498db', style='dashed', alpha=0.8,
+                                             arrows=True, arrowsize=25, width=2.5,
+                                             connectionstyle=style,
+                                             min_source_margin=20, min_target_margin=20)
+            self.aretes_historique.update(zip(aretes, overlay))
+            for patch in overlay:
+                patch.set_visible(False)
+
+            # Edge Labels
+            self.textes_aretes.update(nx.draw_networkx_edge_labels(
+                self.G, self.pos, ax=ax, connectionstyle=style,
+                edge_labels={a: edge_labels[a] for a in aretes},
+                font_color='#f39c12', font_size=8,
+                bbox=dict(facecolor='#2b2b2b', edgecolor='none', alpha=0.6)))
+        self.aretes_visibles = set()
+
+        # 4. Selected node (Yellow, slightly bigger) and active node (Red), plus resting nodes
+        #    redrawn over the history arrows that end under them
+        self.marqueurs = {
+            role: ax.scatter([0.0], [0.0], s=taille, c=couleur, edgecolors=bord,
+                             linewidths=4, zorder=2, visible=False)  # Bord élargi : couvre l'anticrénelage du fond
+            for role, couleur, bord, taille in (("selection", '#f1c40f', '#f39c12', 5500),
+                                                ("actif", '#e74c3c', '#c0392b', 5000))}
+        self.noeuds_marques: Dict[str, Optional[str]] = {"selection": None, "actif": None}
+        self.noeuds_chemin = ax.scatter([0.0], [0.0], s=5000, linewidths=3, zorder=2)
+
+        # Title, tooltip & Limits
+        xs = [x for x, _ in self.pos.values()]
+        ys = [y for _, y in self.pos.values()]
+        self.titre = ax.set_title("", color="white", fontsize=14, fontweight='bold')
+        self.info = ax.text((min(xs) + max(xs)) / 2, max(ys) + 1, "",
+                            bbox=dict(facecolor='#f1c40f', alpha=0.9, boxstyle='round,pad=0.5'),
+                            fontsize=10, color='black', ha='center', visible=False)
+        ax.set_xlim(min(xs) - 2, max(xs) + 2) 
+        ax.set_ylim(min(ys) - 2, max(ys) + 2) 
+        ax.axis('off')
+
+        for artiste in [*self.aretes_historique.values(), *self.marqueurs.values(),
+                        self.noeuds_chemin, self.titre, self.info]:
+            artiste.set_animated(True)
+
+    def _courbure(self, src: str, dst: str) -> float:
+        """
+        Courbure (arc3) de l'arête src -> dst : 0 si le segment ne passe sur
+        aucun autre nœud, sinon un arc tourné vers l'extérieur du graphe.
+        """
+        (x1, y1), (x2, y2) = self.pos[src], self.pos[dst]
+        dx, dy = x2 - x1, y2 - y1
+        longueur = (dx * dx + dy * dy) ** 0.5
+        traverse = longueur > 0 and any(
+            0 < ((x - x1) * dx + (y - y1) * dy) / longueur ** 2 < 1
+            and abs(dx * (y - y1) - dy * (x - x1)) / longueur < 0.5
+            for node, (x, y) in self.pos.items() if node not in (src, dst))
+        if not traverse:
+            return 0.0
+        # arc3 décale le point de contrôle de rad * (dy, -dx) : on l'oriente à l'opposé du centre
+        cx = sum(x for x, _ in self.pos.values()) / len(self.pos)
+        cy = sum(y for _, y in self.pos.values()) / len(self.pos)
+        vers_exterieur = dy * ((x1 + x2) / 2 - cx) - dx * ((y1 + y2) / 2 - cy)
+        return 0.35 if vers_exterieur > 0 else -0.35
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        if hasattr(self, 'last_label'):
+            self.draw_graph(self.last_label, self.last_history)
+
+    def _placer_marqueur(self, role: str, node: Optional[str]) -> None:
+        """Place le marqueur `role` sur un nœud (None = masqué)."""
+        node = node if node in self.pos else None
+        point = self.marqueurs[role]
+        if node is not None:
+            point.set_offsets([self.pos[node]])
+        point.set_visible(node is not None)
+        self.noeuds_marques[role] = node
+
+    def _cle_fond(self) -> Tuple[float, float, int]:
+        return self.figure.bbox.width, self.figure.bbox.height, self.version_structure
+
+    def _sur_rendu_complet(self, event) -> None:
+        """Après un rendu complet (premier affichage, redimensionnement) : refait le fond."""
+        self.fond = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.fond_cle = self._cle_fond()
+        self._dessiner_dynamique()
+
+    def _dessiner_dynamique(self) -> None:
+        """
+        Dessine les éléments dynamiques sur le fond, dans l'ordre d'empilement
+        du rendu complet. Seuls les nœuds et étiquettes (statiques) recouverts
+        par le chemin ou un marqueur sont redessinés par-dessus : le tracé du
+        texte domine le coût d'une image.
+        """
+        draw_artist = self.ax.draw_artist
+        touches = {n for arete in self.aretes_visibles for n in arete}
+        for arete in self.aretes_visibles:
+            draw_artist(self.aretes_historique[arete])
+        for arete in self.aretes_visibles:
+            draw_artist(self.textes_aretes[arete])
+        if touches:
+            noeuds = sorted(touches)
+            styles = [self._style_noeud(n) for n in noeuds]
+            self.noeuds_chemin.set_offsets([self.pos[n] for n in noeuds])
+            self.noeuds_chemin.set_facecolor([s[0] for s in styles])
+            self.noeuds_chemin.set_edgecolor([s[1] for s in styles])
+            draw_artist(self.noeuds_chemin)  # Pointes de flèches sous les bords des nœuds
+        for role, node in self.noeuds_marques.items():
+            if node is not None:
+                draw_artist(self.marqueurs[role])
+                touches.add(node)
+        for node in touches:
+            draw_artist(self.textes_noeuds[node])
+        draw_artist(self.titre)
+        if self.info.get_visible():
+            draw_artist(self.info)
+
+    def draw_graph(self, current_label, history=[]):
+        """Met à jour les éléments dynamiques et les compose sur le fond en cache."""
+        debut = time.perf_counter()
+        self.last_label = current_label
+        self.last_history = history
+        if self.automate.version != self.version_structure:
+            # Nouvel état ou nouvelle transition : graphe, positions et fond à refaire
+            self._construire_structure()
+            self.update_layout(self.mode_manuel)
+            return
+
+        self._placer_marqueur("actif", current_label)
+        self._placer_marqueur("selection", self.selected_node if self.selected_node != current_label else None)
+
+        # Historical edges: only toggle the ones that changed
+        hist_edges = set()
+        for i in range(len(history) - 1):
+            arete = (history[i], history[i+1])
+            if arete in self.aretes_historique:
+                hist_edges.add(arete)
+        for arete in self.aretes_visibles ^ hist_edges:
+            self.aretes_historique[arete].set_visible(arete in hist_edges)
+        self.aretes_visibles = hist_edges
+
+        self.titre.set_text(f"ÉTAT : {self.labels_map.get(current_label, current_label).replace(chr(10), ' ')}")
+
+        # Tooltip for selected node
+        if self.selected_node:
+            info = self.state_info.get(self.selected_node, "Pas d'info.")
+            self.info.set_text(f"INFO ({self.selected_node}):\n{info}")
+        self.info.set_visible(bool(self.selected_node))
+
+        if not self.isVisible():
+            return  # Page masquée : l'image sera composée à l'affichage (showEvent)
+        if self.fond is None or self.fond_cle != self._cle_fond():
+            self.canvas.draw()  # Rendu complet ; _sur_rendu_complet refait le fond
+        else:
+            self.canvas.restore_region(self.fond)
+            self._dessiner_dynamique()
+            self.canvas.blit(self.figure.bbox)
+        self.temps_frames.append(time.perf_counter() - debut)
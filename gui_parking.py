@@ -2,13 +2,9 @@
 import random
 import sys
 import time
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Generator, List, Optional, Set
 
 # Bibliothèques tierces
-import matplotlib.pyplot as plt
-import networkx as nx
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import (
@@ -19,6 +15,7 @@ from PyQt5.QtWidgets import (
     QLabel,
     QMainWindow,
     QPushButton,
+    QScrollArea,
     QStackedWidget,
     QTextEdit,
     QVBoxLayout,
@@ -35,12 +32,18 @@ except ImportError:
 
 # Imports locaux
 from parking_system import ParkingSystem
+from tarification import GrilleTarifaire
 
 
 # ==================== CONSTANTES ====================
 # Animation et timing
 DELAI_ANIMATION = 0.8  # Secondes entre chaque étape d'animation
 DELAI_PAIEMENT = 500   # Millisecondes avant finalisation sortie
+INTERVALLE_STATUT = 16 # Millisecondes minimum entre deux mises à jour du dashboard
+
+# Tarif de démonstration (accéléré : facturé à la seconde)
+FORFAIT_DEMO = 5.0
+TARIF_DEMO_SECONDE = 0.5
 
 # Couleurs UI (Tailwind-inspired)
 COULEUR_EMERALD = "#10b981"    # Places libres, succès
@@ -55,6 +58,28 @@ COULEUR_SLATE_LIGHT = "#334155" # Boutons
 # Tailles des widgets
 TAILLE_SLOT_WIDTH = 110
 TAILLE_SLOT_HEIGHT = 90
+COLONNES_GRILLE_MIN = 5
+COLONNES_GRILLE_MAX = 10
+
+# Styles des slots (appliqués uniquement lors d'un changement d'état)
+STYLE_SLOT_LIBRE = f"""
+    background-color: {COULEUR_EMERALD}; 
+    color: white; 
+    border-radius: 8px;
+    border: 2px solid transparent;
+"""
+STYLE_SLOT_OCCUPE = f"""
+    background-color: {COULEUR_ROSE}; 
+    color: white; 
+    border-radius: 8px;
+    border: 2px solid #e11d48;
+"""
+STYLE_SLOT_PAIEMENT = f"""
+    background-color: {COULEUR_AMBER}; 
+    color: white; 
+    border-radius: 8px;
+    border: 2px solid #d97706;
+"""
 TAILLE_KPI_CARD_WIDTH = 180
 TAILLE_KPI_CARD_HEIGHT = 85
 
@@ -90,21 +115,61 @@ class ParkingWorker(QObject):
 
     def __init__(self, places_totales: int = 10) -> None:
         super().__init__()
-        self.system = ParkingSystem(places_totales=places_totales)
-        self.occupation_map: List[Optional[str]] = [None] * places_totales
-        self.entry_times: List[Optional[float]] = [None] * places_totales
+        self.system = ParkingSystem(places_totales=places_totales, tarification=GrilleTarifaire(
+            tarif_horaire=TARIF_DEMO_SECONDE * 3600, forfait=FORFAIT_DEMO), pas_facturation=1.0)
+        self.paiements_en_cours: Set[int] = set()
+        self.animations_en_cours: Set[Generator] = set()
         self.history_states: List[str] = ["DISPONIBLE"]
+        self.dernier_statut: Dict = {}
+        
+        self.timer_statut = QTimer(self)
+        self.timer_statut.setSingleShot(True)
+        self.timer_statut.setInterval(INTERVALLE_STATUT)
+        self.timer_statut.timeout.connect(self._emettre_statut)
 
     def log(self, message: str) -> None:
         """Émet un message de log."""
         self.log_signal.emit(message)
-        print(message)
-
-    def _animation_step(self) -> None:
-        """Callback pour animer le graphe étape par étape."""
-        self.update_status()
-        QApplication.processEvents()
-        time.sleep(DELAI_ANIMATION)               
+        self.system.sink.emettre("gui", "{message}", message=message)
+
+    def _animer(self, etapes: Generator, suite: Callable[[Any], None],
+                echec: Optional[Callable[[Exception], None]] = None) -> None:
+        """
+        Anime un déroulement d'entrée/sortie sans bloquer la boucle d'événements.
+        
+        Chaque étape du générateur est exécutée puis la suivante est planifiée
+        DELAI_ANIMATION plus tard par un QTimer : plusieurs véhicules peuvent
+        être animés en parallèle et l'interface reste réactive. Une étape qui
+        échoue (par exemple une sortie devancée par une autre) arrête
+        l'animation proprement au lieu de laisser l'interface en suspens.
+        
+        Args:
+            etapes: Générateur issu de ParkingSystem.etapes_entree/etapes_sortie
+            suite: Appelée avec la valeur de retour du générateur une fois terminé
+            echec: Appelée avec l'exception si une étape échoue (remise en
+                état de l'interface)
+        """
+        self.animations_en_cours.add(etapes)
+        
+        def pas() -> None:
+            try:
+                next(etapes)
+            except StopIteration as fin:
+                self.animations_en_cours.discard(etapes)
+                suite(fin.value)
+                return
+            except Exception as erreur:  # Non rattrapée dans un slot, elle arrêterait l'application
+                etapes.close()
+                self.animations_en_cours.discard(etapes)
+                self.log(f"[Erreur] {erreur}")
+                if echec is not None:
+                    echec(erreur)
+                self.update_status()
+                return
+            self.update_status()
+            QTimer.singleShot(int(DELAI_ANIMATION * 1000), pas)
+        
+        pas()
 
     def play_sound(self, sound_type: str) -> None:
         """Joue un son selon le type d'événement."""
@@ -122,282 +187,118 @@ class ParkingWorker(QObject):
     def entree_auto(self, est_abonne: bool) -> None:
         """Gère l'entrée automatique d'un véhicule."""
         self.play_sound("click")
-        if self.system.automate.etat_courant.label_etat == "DISPONIBLE":
+        if self.system.label_courant == "DISPONIBLE":
             self.history_states = ["DISPONIBLE"]
 
         if self.system.places_libres > 0:
-            try:
-                idx = self.occupation_map.index(None)
-                type_client = "ABONNE" if est_abonne else "VISITEUR"
-                
-                self.system.gerer_entree(est_abonne=est_abonne, pause_callback=self._animation_step)
-                
-                self.occupation_map[idx] = type_client
-                self.entry_times[idx] = time.time()
-                
-                icon = "👑" if est_abonne else "🚗"
-                self.log(f"--- {icon} Entrée {type_client} (Place P-{idx+1}) ---")
-                
-                self.update_grid_signal.emit(idx, 0)
-                self.update_status()
-            except ValueError:
-                self.log("Erreur interne place.")
+            self._animer(self.system.etapes_entree(est_abonne),
+                         lambda idx: self._finaliser_entree(idx, est_abonne))
         else:
             self.play_sound("warning")
             self.system.gerer_entree(est_abonne)
             self.update_status()
 
+    def _finaliser_entree(self, idx: Optional[int], est_abonne: bool) -> None:
+        """Finalise l'entrée une fois le véhicule garé."""
+        if idx is None:
+            self.play_sound("warning")
+            self.log("--- ⛔ Entrée refusée ---")
+            self.update_status()
+            return
+        
+        type_client = "ABONNE" if est_abonne else "VISITEUR"
+        icon = "👑" if est_abonne else "🚗"
+        self.log(f"--- {icon} Entrée {type_client} (Place P-{idx+1}) ---")
+        
+        self.update_grid_signal.emit(idx, 0)
+        self.update_status()
+
     def sortie_specifique(self, idx: int) -> None:
         """Déclenche la sortie pour un slot spécifique."""
-        if self.occupation_map[idx] is None:
-            return
+        occupation = self.system.occupation
+        if not occupation.est_occupee(idx) or idx in self.paiements_en_cours:
+            return  # Place libre ou sortie déjà en cours
 
         self.play_sound("click")
-        type_stocke = self.occupation_map[idx]
-        est_abonne = (type_stocke == "ABONNE")
+        est_abonne = (occupation.type_client(idx) == "ABONNE")
         
-        start_time = self.entry_times[idx]
-        duration = time.time() - start_time if start_time else 0
-        prix_calcule = 0.0 if est_abonne else (5.0 + duration * 0.5)
+        duration = time.time() - occupation.heure_entree(idx)
+        prix_calcule = self.system.calculer_montant(duration, est_abonne)
 
         nom = "Abonné" if est_abonne else "Visiteur"
         self.log(f"--- 🛑 Sortie P-{idx+1} ({nom}). Durée: {int(duration)}s. Facture: {prix_calcule:.2f} DH ---")
         
-        self.entry_times[idx] = None
+        self.paiements_en_cours.add(idx)
         
         self.update_grid_signal.emit(idx, -1)
         self.update_status()
 
-        QTimer.singleShot(DELAI_PAIEMENT, lambda: self._finaliser_sortie(idx, est_abonne, prix_calcule))
+        QTimer.singleShot(DELAI_PAIEMENT, lambda: self._animer(
+            self.system.etapes_sortie(est_abonne, prix_calcule, idx),
+            lambda _: self._finaliser_sortie(idx),
+            lambda _: self._annuler_sortie(idx)))
 
     def sortie_auto(self) -> None:
-        """Simule une sortie aléatoire."""
-        indices_occupes = [i for i, x in enumerate(self.occupation_map) if x is not None]
-        if not indices_occupes:
+        """Simule une sortie aléatoire (parmi les véhicules garés dont la sortie n'est pas lancée)."""
+        idx = self.system.place_garee(random, exclues=self.paiements_en_cours)
+        if idx is None:
             self.log("[Erreur] Le parking est vide !")
             return
 
-        idx = random.choice(indices_occupes)
         self.sortie_specifique(idx)
 
-    def _finaliser_sortie(self, idx: int, est_abonne: bool, prix: float) -> None:
-        """Finalise la sortie après le paiement."""
-        self.system.gerer_sortie(est_abonne=est_abonne, pause_callback=self._animation_step, montant=prix)
+    def _finaliser_sortie(self, idx: int) -> None:
+        """Finalise la sortie une fois le véhicule sorti."""
         self.play_sound("success")
         
-        self.occupation_map[idx] = None
+        self.paiements_en_cours.discard(idx)
         
         self.update_grid_signal.emit(idx, 1)
         self.update_status()
         self.log("--- ✅ Barrière ouverte ---")
 
+    def _annuler_sortie(self, idx: int) -> None:
+        """Remet le slot dans son état réel après une sortie qui n'a pas abouti."""
+        self.paiements_en_cours.discard(idx)
+        self.update_grid_signal.emit(idx, 0 if self.system.occupation.est_occupee(idx) else 1)
+
     def update_status(self) -> None:
-        """Met à jour le statut et émet le signal."""
-        status = self.system.get_status()
-        current_state = status["etat_automate"]
+        """
+        Enregistre l'état courant dans l'historique et planifie une émission.
         
+        Les appels rapprochés sont regroupés : au plus une émission de
+        status_signal par INTERVALLE_STATUT.
+        """
+        current_state = self.system.etat_affiche()
         if not self.history_states or self.history_states[-1] != current_state:
             self.history_states.append(current_state)
 
-        status["history"] = self.history_states
-        self.status_signal.emit(status)
+        if not self.timer_statut.isActive():
+            self.timer_statut.start()
 
-
-class GraphWidget(QWidget):
-    """Widget d'affichage du graphe de l'automate."""
-    
-    def __init__(self, automate) -> None:
-        super().__init__()
-        self.automate = automate
-        
-        layout = QVBoxLayout()
-        self.setLayout(layout)
-        layout.setContentsMargins(0, 0, 0, 0)
-
-        self.figure = Figure(facecolor='#2b2b2b')
-        self.canvas = FigureCanvas(self.figure)
-        layout.addWidget(self.canvas)
-        
-        self.canvas.mpl_connect('button_press_event', self.on_click)
-        self.selected_node: Optional[str] = None
-        self.tooltip_annot = None
-        
-        self.G = nx.DiGraph()
-        self.pos: Optional[Dict] = None
-        
-        self.labels_map = {
-            "DISPONIBLE": "1. DISPO-\nNIBLE",
-            "IDENTIFICATION": "2. IDENTI-\nFICATION",
-            "VERIFICATION_ACCES": "3. VERIF\nACCÈS",
-            "BARRIERE_ENTREE_OUVERTE": "4. BARRIÈRE\nOUVERTE",
-            "STATIONNEMENT": "5. VÉHICULE\nGARÉ",
-            "CALCUL_TARIF": "6. CALCUL\nTARIF",
-            "ATTENTE_PAIEMENT": "7. ATTENTE\nPAIEMENT",
-            "BARRIERE_SORTIE_OUVERTE": "8. BARRIÈRE\nSORTIE",
-            "COMPLET": "COMPLET"
-        }
-        
-        self.state_info = {
-            "DISPONIBLE": "Le système est prêt à accueillir un véhicule. (Attente détection)",
-            "IDENTIFICATION": "Lecture de la plaque ou du badge d'abonné.",
-            "VERIFICATION_ACCES": "Vérification des droits d'accès dans la base de données.",
-            "BARRIERE_ENTREE_OUVERTE": "Accès autorisé, la barrière s'ouvre.",
-            "STATIONNEMENT": "Véhicule garé. Le système surveille la place.",
-            "CALCUL_TARIF": "Calcul du montant à payer selon la durée.",
-            "ATTENTE_PAIEMENT": "Le conducteur doit régler le montant affiché.",
-            "BARRIERE_SORTIE_OUVERTE": "Paiement validé (ou gratuit), sortie autorisée.",
-            "COMPLET": "Aucune place disponible. Entrée bloquée."
-        }
+    def _emettre_statut(self) -> None:
+        """Émet uniquement les champs du statut qui ont changé depuis la dernière émission."""
+        status = self.system.get_status()
+        status["history"] = list(self.history_states)
         
-        self._construire_structure()
-        self.update_layout(force_manual=True)
-
-    def _construire_structure(self):
-        for id_etat, etat in self.automate.list_etats.items():
-            self.G.add_node(etat.label_etat)
-        for t in self.automate.list_transitions:
-            src, dst = t.etat_source.label_etat, t.etat_dest.label_etat
-            lbl = t.etiquette.replace("vehicule_", "").replace("barriere_", "").replace("detecter_", "").replace("paiement_", "").replace("abonne_", "abonne")
-            if src == "BARRIERE_SORTIE_OUVERTE" and dst == "DISPONIBLE": lbl = "sorti/libéré"
-            self.G.add_edge(src, dst, label=lbl)
-
-    def update_layout(self, force_manual=True):
-        if force_manual:
-            # Layout espacé pour grandes bulles
-            self.pos = {
-                "COMPLET": (0.0, 8.0), 
-                "DISPONIBLE": (0.0, 4.0),
-                "IDENTIFICATION": (4.0, 4.0), 
-                "VERIFICATION_ACCES": (8.0, 4.0),
-                "BARRIERE_ENTREE_OUVERTE": (12.0, 4.0), 
-                "STATIONNEMENT": (12.0, 0.0),
-                "CALCUL_TARIF": (8.0, 0.0), 
-                "ATTENTE_PAIEMENT": (4.0, 0.0),
-                "BARRIERE_SORTIE_OUVERTE": (0.0, 0.0)
-            }
-        else:
-            self.pos = nx.spring_layout(self.G)
-        self.draw_graph("DISPONIBLE")
-        
-    def on_click(self, event):
-        if event.inaxes is None: return
-        # Trouver le noeud le plus proche
-        min_dist = float('inf')
-        closest = None
-        for node, (x, y) in self.pos.items():
-            dist = (x - event.xdata)**2 + (y - event.ydata)**2
-            if dist < min_dist:
-                min_dist = dist
-                closest = node
-        
-        if closest and min_dist < 1.0: # Seuil de clic
-            self.selected_node = closest if self.selected_node != closest else None
-            # On redessine avec l'état courant stocké (hack: on ne l'a pas ici, on suppose DISPONIBLE ou on attend refresh)
-            # Mieux : on stocke last_label et last_history
-            if hasattr(self, 'last_label'):
-                self.draw_graph(self.last_label, getattr(self, 'last_history', []))
-
-    def draw_graph(self, current_label, history=[]):
-        self.last_label = current_label
-        self.last_history = history
-        
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.set_facecolor('#2b2b2b')
-
-        node_colors = []
-        edge_colors = []
-        node_sizes = []
-        
-        for node in self.G.nodes():
-            size = 5000
-            
-            if node == current_label:
-                node_colors.append('#e74c3c') # Rouge Actif
-                edge_colors.append('#c0392b')
-            elif node == self.selected_node:
-                node_colors.append('#f1c40f') # Selection (Jaune)
-                edge_colors.append('#f39c12')
-                size = 5500 # Slightly bigger
-            elif node == "COMPLET":
-                node_colors.append('#ffcccc')
-                edge_colors.append('red')
-            elif node == "STATIONNEMENT":
-                node_colors.append('#ccffcc')
-                edge_colors.append('green')
-            elif "BARRIERE" in node:
-                node_colors.append('#ccccff')
-                edge_colors.append('blue')
-            else:
-                node_colors.append('#eeeeee')
-                edge_colors.append('#bdc3c7')
-            
-            node_sizes.append(size)
-
-        # 1. Draw Nodes
-        nx.draw_networkx_nodes(self.G, self.pos, ax=ax, node_color=node_colors, 
-                               edgecolors=edge_colors, linewidths=3, node_size=node_sizes)
-
-        # 2. Labels inside nodes
-        nx.draw_networkx_labels(self.G, self.pos, ax=ax, labels=self.labels_map, 
-                                font_size=9, font_weight="bold", font_family="Arial")
-
-        # 3. Draw Edges (Historical vs Normal)
-        # Identify historical edges
-        hist_edges = []
-        for i in range(len(history) - 1):
-            u, v = history[i], history[i+1]
-            if self.G.has_edge(u, v):
-                hist_edges.append((u, v))
-                
-        # Draw all edges first (default style)
-        nx.draw_networkx_edges(self.G, self.pos, ax=ax, edge_color='#ecf0f1', 
-                               arrows=True, arrowsize=25, width=2.0, 
-                               connectionstyle='arc3,rad=0.0',
-                               min_source_margin=20, min_target_margin=20)
-        
-        # Overdraw historical edges (Dashed, Blue)
-        if hist_edges:
-            nx.draw_networkx_edges(self.G, self.pos, ax=ax, edgelist=hist_edges,
-                                   edge_color='#3498db', style='dashed', alpha=0.8,
-                                   arrows=True, arrowsize=25, width=2.5,
-                                   connectionstyle='arc3,rad=0.0',
-                                   min_source_margin=20, min_target_margin=20)
-
-        # Edge Labels
-        edge_labels = nx.get_edge_attributes(self.G, 'label')
-        nx.draw_networkx_edge_labels(self.G, self.pos, edge_labels=edge_labels, 
-                                     font_color='#f39c12', font_size=8, ax=ax, 
-                                     bbox=dict(facecolor='#2b2b2b', edgecolor='none', alpha=0.6))
-
-        # Title & Limits
-        ax.set_title(f"ÉTAT : {self.labels_map.get(current_label, current_label).replace(chr(10), ' ')}", 
-                     color="white", fontsize=14, fontweight='bold')
-        ax.set_xlim(-2, 14) 
-        ax.set_ylim(-2, 10) 
-        ax.axis('off')
-        
-        # Tooltip for selected node
-        if self.selected_node:
-            info = self.state_info.get(self.selected_node, "Pas d'info.")
-            ax.text(6, 9, f"INFO ({self.selected_node}):\n{info}", 
-                    bbox=dict(facecolor='#f1c40f', alpha=0.9, boxstyle='round,pad=0.5'),
-                    fontsize=10, color='black', ha='center')
-
-
-
-        self.canvas.draw()
+        delta = {k: v for k, v in status.items() if self.dernier_statut.get(k) != v}
+        if delta:
+            self.dernier_statut = status
+            self.status_signal.emit(delta)
 
 
 class ParkingDashboard(QMainWindow):
     """Interface principale du tableau de bord de parking."""
     
-    def __init__(self) -> None:
+    def __init__(self, places_totales: int = 10) -> None:
         super().__init__()
         self.setWindowTitle("Projet 8 - Smart City Parking Dashboard")
         self.setGeometry(100, 100, 1200, 800)
         
         self.simulation_start = time.time()
+        self.etat_affiche = "DISPONIBLE"
+        self.historique_affiche: List[str] = []
+        self.affiche_complet = False
         
         self.setStyleSheet(f"""
             QMainWindow {{ background-color: {COULEUR_SLATE_DARK}; }}
@@ -416,7 +317,7 @@ class ParkingDashboard(QMainWindow):
             QPushButton:pressed {{ background-color: {COULEUR_SLATE_MID}; }}
         """)
         
-        self.worker = ParkingWorker(places_totales=10)
+        self.worker = ParkingWorker(places_totales=places_totales)
         self.worker.log_signal.connect(self.append_log)
         self.worker.status_signal.connect(self.update_dashboard)
         self.worker.update_grid_signal.connect(self.update_place)
@@ -477,8 +378,14 @@ class ParkingDashboard(QMainWindow):
         grid_layout.setSpacing(15)
         grid_layout.setContentsMargins(15, 15, 15, 15)
         self.places_widgets = []
+        
+        # Dernier statut (1 libre, 0 occupé, -1 paiement) et dernier texte affichés par slot
+        nb_places = self.worker.system.places_totales
+        self.etats_slots: List[int] = [1] * nb_places
+        self.textes_slots: List[str] = [""] * nb_places
+        colonnes = min(COLONNES_GRILLE_MAX, max(COLONNES_GRILLE_MIN, (nb_places + 1) // 2))
 
-        for i in range(10):
+        for i in range(nb_places):
             # Layout interne pour chaque place (Icon + Text + Timer)
             # Utilisation de ClickableLabel pour interactivité
             lbl = ClickableLabel(i, f"P-{i+1}\nLIBRE")
@@ -487,16 +394,19 @@ class ParkingDashboard(QMainWindow):
             lbl.setAlignment(Qt.AlignCenter)
             lbl.setFixedSize(TAILLE_SLOT_WIDTH, TAILLE_SLOT_HEIGHT)
             lbl.setFont(QFont("Segoe UI", 10, QFont.Bold))
-            lbl.setStyleSheet(f"""
-                background-color: {COULEUR_EMERALD}; 
-                color: white; 
-                border-radius: 8px;
-                border: 2px solid transparent;
-            """)
-            grid_layout.addWidget(lbl, i//5, i%5)
+            lbl.setStyleSheet(STYLE_SLOT_LIBRE)
+            grid_layout.addWidget(lbl, i // colonnes, i % colonnes)
             self.places_widgets.append(lbl)
-            
-        layout.addWidget(grid_frame)
+            self.textes_slots[i] = lbl.text()
+        
+        if nb_places > 2 * colonnes:
+            # Grandes grilles : défilement, seuls les slots visibles sont rafraîchis
+            scroll = QScrollArea()
+            scroll.setWidget(grid_frame)
+            scroll.setStyleSheet(f"QScrollArea {{ background-color: {COULEUR_SLATE_MID}; border: none; border-radius: 12px; }}")
+            layout.addWidget(scroll, 1)
+        else:
+            layout.addWidget(grid_frame)
 
         # 3. CONTROLS & MONITORING
         bottom = QHBoxLayout()
@@ -545,11 +455,10 @@ class ParkingDashboard(QMainWindow):
             }
         """)
         
-        # Page 1: Graph
-        self.graph_widget = GraphWidget(self.worker.system.automate)
+        # Page 1: Graph, construit au premier affichage (import matplotlib/networkx différé)
+        self.graph_widget = None
         
         self.stack.addWidget(self.logs)       
-        self.stack.addWidget(self.graph_widget) 
         
         bottom.addLayout(btns, 1)
         bottom.addWidget(self.stack, 3) 
@@ -590,58 +499,100 @@ class ParkingDashboard(QMainWindow):
     def toggle_view(self):
         current = self.stack.currentIndex()
         if current == 0:
+            self._creer_graphe()
             self.stack.setCurrentIndex(1)
         else:
             self.stack.setCurrentIndex(0)
 
+    def _creer_graphe(self) -> None:
+        """Importe et construit le graphe de l'automate lors de sa première ouverture."""
+        if self.graph_widget is not None:
+            return
+        QApplication.setOverrideCursor(Qt.WaitCursor)  # ≈ 1 s : import de matplotlib et networkx
+        try:
+            from graphe_automate import GraphWidget
+            
+            self.graph_widget = GraphWidget(self.worker.system.automate)
+            self.graph_widget.draw_graph(self.etat_affiche, self.historique_affiche)
+            self.stack.addWidget(self.graph_widget)
+        finally:
+            QApplication.restoreOverrideCursor()
+
     def update_dashboard(self, stats):
-        val_money = stats.get("recettes", 0.0)
-        self.card_money.findChildren(QLabel)[1].setText(f"{val_money:.2f} DH")
-        self.card_visit.findChildren(QLabel)[1].setText(str(stats.get("visiteurs", 0)))
-        self.card_sub.findChildren(QLabel)[1].setText(str(stats.get("abonnes", 0)))
-        
-        lbl_etat = stats.get("etat_automate", "???")
-        self.lbl_system_status.setText(lbl_etat)
-        
-        if lbl_etat == "COMPLET":
-            self.lbl_system_status.setStyleSheet(f"background-color: {COULEUR_ROSE}; padding: 8px 16px; border-radius: 6px;")
-        else:
-            self.lbl_system_status.setStyleSheet(f"background-color: {COULEUR_EMERALD}; padding: 8px 16px; border-radius: 6px;")
-        
-        history = stats.get("history", [])
-        self.graph_widget.draw_graph(lbl_etat, history)
+        """Applique un statut partiel : seuls les champs présents (modifiés) sont redessinés."""
+        if "recettes" in stats:
+            self.card_money.findChildren(QLabel)[1].setText(f"{stats['recettes']:.2f} DH")
+        if "visiteurs_presents" in stats:
+            self.card_visit.findChildren(QLabel)[1].setText(str(stats["visiteurs_presents"]))
+        if "abonnes_presents" in stats:
+            self.card_sub.findChildren(QLabel)[1].setText(str(stats["abonnes_presents"]))
+        
+        if "etat_automate" in stats:
+            lbl_etat = stats["etat_automate"]
+            self.lbl_system_status.setText(lbl_etat)
+            
+            complet = (lbl_etat == "COMPLET")
+            if complet != self.affiche_complet:
+                self.affiche_complet = complet
+                couleur = COULEUR_ROSE if complet else COULEUR_EMERALD
+                self.lbl_system_status.setStyleSheet(f"background-color: {couleur}; padding: 8px 16px; border-radius: 6px;")
+        
+        if "etat_automate" in stats or "history" in stats:
+            self.etat_affiche = stats.get("etat_automate", self.etat_affiche)
+            self.historique_affiche = stats.get("history", self.historique_affiche)
+            if self.graph_widget is not None:
+                self.graph_widget.draw_graph(self.etat_affiche, self.historique_affiche)
 
     def append_log(self, text):
         self.logs.append(text)
         self.logs.verticalScrollBar().setValue(self.logs.verticalScrollBar().maximum())
 
     def update_place(self, idx: int, status: int) -> None:
-        """Met à jour l'affichage d'un slot de parking."""
+        """
+        Met à jour l'affichage d'un slot de parking lors d'un changement d'état.
+        
+        C'est le seul endroit où la feuille de style d'un slot est modifiée.
+        """
         l = self.places_widgets[idx]
+        self.etats_slots[idx] = status
         
         if status == 1:
-            l.setStyleSheet(f"""
-                background-color: {COULEUR_EMERALD}; 
-                color: white; 
-                border-radius: 8px;
-                border: 2px solid transparent;
-            """)
-            l.setText(f"P-{idx+1}\nLIBRE")
+            l.setStyleSheet(STYLE_SLOT_LIBRE)
+            self._afficher_texte_slot(idx, f"P-{idx+1}\nLIBRE")
             l.setCursor(Qt.ArrowCursor)
             
         elif status == 0:
+            l.setStyleSheet(STYLE_SLOT_OCCUPE)
+            self._rafraichir_timer_slot(idx, time.time())
             l.setCursor(Qt.PointingHandCursor)
             
         elif status == -1:
-            l.setStyleSheet(f"""
-                background-color: {COULEUR_AMBER}; 
-                color: white; 
-                border-radius: 8px;
-                border: 2px solid #d97706;
-            """)
-            l.setText(f"P-{idx+1}\n⏳ PAIEMENT")
+            l.setStyleSheet(STYLE_SLOT_PAIEMENT)
+            self._afficher_texte_slot(idx, f"P-{idx+1}\n⏳ PAIEMENT")
             l.setCursor(Qt.ArrowCursor)
 
+    def _afficher_texte_slot(self, idx: int, txt: str) -> None:
+        """Change le texte d'un slot seulement s'il diffère de celui affiché."""
+        if txt != self.textes_slots[idx]:
+            self.textes_slots[idx] = txt
+            self.places_widgets[idx].setText(txt)
+
+    def _rafraichir_timer_slot(self, idx: int, current_time: float) -> None:
+        """Affiche l'occupant et la durée de stationnement d'un slot occupé."""
+        occupation = self.worker.system.occupation
+        duration_sec = int(current_time - occupation.heure_entree(idx))
+        mm, ss = divmod(duration_sec, 60)
+        hh, mm = divmod(mm, 60)
+        
+        icon = "👑" if occupation.type_client(idx) == "ABONNE" else "🚗"
+        
+        txt = (f"<div style='text-align: center;'>"
+               f"<span style='font-size:10pt; font-weight:bold;'>P-{idx+1}</span> "
+               f"<span style='font-size:16pt;'>{icon}</span><br>"
+               f"<span style='font-size:11pt; font-family:Consolas; font-weight:bold;'>{hh:02d}:{mm:02d}:{ss:02d}</span>"
+               f"</div>")
+        self._afficher_texte_slot(idx, txt)
+
     def update_clocks(self) -> None:
         """Met à jour les horloges et les timers des slots."""
         elapsed = time.time() - self.simulation_start
@@ -649,31 +600,12 @@ class ParkingDashboard(QMainWindow):
         self.lbl_sim_time.setText(f"⏱ SESSION: {m:02d}:{s:02d}")
         
         current_time = time.time()
-        for idx in range(10):
-            entry = self.worker.entry_times[idx]
-            occ_type = self.worker.occupation_map[idx]
-            widget = self.places_widgets[idx]
-            
-            if entry is not None and occ_type is not None:
-                duration_sec = int(current_time - entry)
-                mm, ss = divmod(duration_sec, 60)
-                hh, mm = divmod(mm, 60)
-                
-                icon = "👑" if occ_type == "ABONNE" else "🚗"
-                
-                txt = (f"<div style='text-align: center;'>"
-                       f"<span style='font-size:10pt; font-weight:bold;'>P-{idx+1}</span> "
-                       f"<span style='font-size:16pt;'>{icon}</span><br>"
-                       f"<span style='font-size:11pt; font-family:Consolas; font-weight:bold;'>{hh:02d}:{mm:02d}:{ss:02d}</span>"
-                       f"</div>")
-                widget.setText(txt)
-                
-                widget.setStyleSheet(f"""
-                    background-color: {COULEUR_ROSE}; 
-                    color: white; 
-                    border-radius: 8px;
-                    border: 2px solid #e11d48;
-                """)
+        for idx in self.worker.system.occupation.places_occupees():
+            if self.etats_slots[idx] != 0:
+                continue  # Paiement en cours
+            if self.places_widgets[idx].visibleRegion().isEmpty():
+                continue  # Hors de la zone visible : rafraîchi au prochain tick visible
+            self._rafraichir_timer_slot(idx, current_time)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
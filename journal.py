@@ -0,0 +1,251 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+NOM_JOURNAL = "journal.jsonl"
+NOM_INSTANTANE = "instantane.json"
+_ENCODEUR = json.JSONEncoder(check_circular=False)  # Enregistrements plats : pas de cycle possible
+
+
+class JournalEvenements:
+    """
+    Journal d'écriture anticipée (append-only, JSON Lines) avec instantanés.
+
+    Les enregistrements sont accumulés en mémoire ; un thread d'écriture
+    unique les écrit et les synchronise sur disque par groupes (group
+    commit) : un fsync pour taille_groupe enregistrements, ou au plus tard
+    delai_groupe secondes après le premier enregistrement en attente.
+    ajouter ne fait donc aucune entrée-sortie : l'appelant (qui tient souvent
+    le verrou du parking) n'attend jamais un fsync. Un appelant qui a besoin
+    de la durabilité l'attend explicitement (valider, attendre). Un
+    instantané remplace atomiquement l'état complet et vide le journal ; la
+    reprise relit l'instantané puis la queue.
+
+    Attributes:
+        repertoire: Dossier contenant le journal et l'instantané
+        taille_groupe: Nombre d'enregistrements déclenchant une validation
+        delai_groupe: Délai maximal (s) avant validation d'un groupe incomplet
+        intervalle_instantane: Nombre d'enregistrements entre deux instantanés
+        synchroniser: True pour appeler os.fsync à chaque validation
+        seq: Numéro du dernier enregistrement ajouté
+        seq_valide: Numéro du dernier enregistrement durable (synchronisé sur
+            disque ou couvert par un instantané)
+        depuis_instantane: Enregistrements ajoutés depuis le dernier instantané
+    """
+
+    def __init__(self, repertoire: str, taille_groupe: int = 256, delai_groupe: float = 0.05,
+                 intervalle_instantane: int = 100_000, synchroniser: bool = True) -> None:
+        self.repertoire = repertoire
+        self.taille_groupe = taille_groupe
+        self.delai_groupe = delai_groupe
+        self.intervalle_instantane = intervalle_instantane
+        self.synchroniser = synchroniser
+        os.makedirs(repertoire, exist_ok=True)
+
+        self._chemin_journal = os.path.join(repertoire, NOM_JOURNAL)
+        self._chemin_instantane = os.path.join(repertoire, NOM_INSTANTANE)
+        self._condition = threading.Condition(threading.Lock())  # Protège l'état en mémoire
+        self._verrou_fichier = threading.Lock()  # Sérialise écritures et troncature
+        self._en_attente: List[Dict[str, Any]] = []  # Sérialisés par le thread d'écriture
+        self._echeance = 0.0  # Instant (monotonic) de validation du groupe en cours
+        self._urgent = False  # Validation demandée par valider()
+        self._ferme = False
+        self._erreur: Optional[Exception] = None  # Échec du thread d'écriture
+
+        self._tronquer_fin_partielle()
+        instantane, queue = self.relire()
+        self.seq = queue[-1]["seq"] if queue else (instantane["seq"] if instantane else 0)
+        self.seq_valide = self.seq
+        self.depuis_instantane = len(queue)
+        self._fichier = open(self._chemin_journal, "a", encoding="utf-8")
+        self._ecrivain = threading.Thread(target=self._ecrire_en_continu, name="journal", daemon=True)
+        self._ecrivain.start()
+
+    def _tronquer_fin_partielle(self) -> None:
+        """Supprime une dernière ligne incomplète (arrêt pendant une écriture)."""
+        if not os.path.exists(self._chemin_journal):
+            return
+        with open(self._chemin_journal, "rb+") as fichier:
+            contenu = fichier.read()
+            if contenu and not contenu.endswith(b"\n"):
+                fichier.truncate(contenu.rfind(b"\n") + 1)
+
+    def _verifier_utilisable(self) -> None:
+        """Lève l'erreur d'écriture du thread, ou ValueError si le journal est fermé (condition tenue)."""
+        if self._erreur is not None:
+            raise OSError(f"Écriture du journal impossible : {self._erreur}") from self._erreur
+        if self._ferme:
+            raise ValueError("Journal fermé.")
+
+    def ajouter(self, type_evt: str, **donnees: Any) -> int:
+        """
+        Ajoute un enregistrement au groupe en cours (sans entrée-sortie).
+
+        Args:
+            type_evt: Type d'événement ("entree", "refus", "annulation",
+                "paiement", "sortie")
+            **donnees: Données de l'événement (sérialisables en JSON)
+
+        Returns:
+            Le numéro de séquence attribué
+
+        Raises:
+            ValueError: Si le journal est fermé
+            OSError: Si une écriture précédente a échoué
+        """
+        with self._condition:
+            self._verifier_utilisable()
+            self.seq += 1
+            self.depuis_instantane += 1
+            self._en_attente.append({"seq": self.seq, "type": type_evt, **donnees})
+            if len(self._en_attente) == 1:
+                self._echeance = time.monotonic() + self.delai_groupe
+                self._condition.notify()
+            elif len(self._en_attente) >= self.taille_groupe:
+                self._condition.notify()
+            return self.seq
+
+    def _groupe_pret(self) -> bool:
+        """Indique si le groupe en attente doit être écrit maintenant (condition tenue)."""
+        return bool(self._en_attente) and (self._urgent or self._ferme
+                                           or len(self._en_attente) >= self.taille_groupe
+                                           or time.monotonic() >= self._echeance)
+
+    def _ecrire_en_continu(self) -> None:
+        """Boucle du thread d'écriture : écrit et synchronise chaque groupe prêt."""
+        while True:
+            with self._condition:
+                while not self._groupe_pret():
+                    if self._ferme:
+                        return
+                    attente = self._echeance - time.monotonic() if self._en_attente else None
+                    self._condition.wait(attente)
+                groupe, self._en_attente = self._en_attente, []
+                seq, self._urgent = self.seq, False
+            try:
+                # Un instantané pris entre-temps a pu vider le fichier : les lignes
+                # qu'il couvre sont alors ignorées à la relecture (seq <= seq de l'instantané).
+                lignes = [_ENCODEUR.encode(enregistrement) + "\n" for enregistrement in groupe]
+                with self._verrou_fichier:
+                    self._fichier.writelines(lignes)
+                    self._fichier.flush()
+                    if self.synchroniser:
+                        os.fsync(self._fichier.fileno())
+            except (OSError, TypeError, ValueError) as erreur:  # Disque, ou donnée non sérialisable
+                with self._condition:
+                    self._erreur = erreur
+                    self._condition.notify_all()
+                return
+            with self._condition:
+                self.seq_valide = max(self.seq_valide, seq)
+                self._condition.notify_all()
+
+    def attendre(self, seq: int, delai: Optional[float] = None) -> bool:
+        """
+        Attend que l'enregistrement seq soit durable, sans forcer la validation.
+
+        Args:
+            seq: Numéro de séquence renvoyé par ajouter
+            delai: Attente maximale (s), None pour attendre sans limite
+
+        Returns:
+            True si l'enregistrement est durable, False si le délai a expiré
+
+        Raises:
+            OSError: Si l'écriture a échoué
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.seq_valide >= seq or self._erreur is not None, delai)
+            if self.seq_valide < seq:
+                self._verifier_utilisable()
+            return self.seq_valide >= seq
+
+    def valider(self) -> None:
+        """
+        Fait écrire tout de suite les enregistrements en attente et attend
+        leur synchronisation sur disque.
+
+        Raises:
+            ValueError: Si le journal est fermé
+            OSError: Si l'écriture a échoué
+        """
+        with self._condition:
+            self._verifier_utilisable()
+            if self._en_attente:
+                self._urgent = True
+                self._condition.notify_all()
+            seq = self.seq
+        self.attendre(seq)
+
+    def instantane_du(self) -> bool:
+        """Indique si un nouvel instantané devrait être pris."""
+        return self.depuis_instantane >= self.intervalle_instantane
+
+    def instantane(self, etat: Dict[str, Any]) -> None:
+        """
+        Enregistre l'état complet puis vide le journal.
+
+        L'instantané est écrit dans un fichier temporaire puis renommé : en cas
+        d'arrêt brutal, c'est l'ancien ou le nouveau qui subsiste, jamais un
+        fichier partiel.
+
+        Args:
+            etat: État sérialisable du système à l'instant du dernier enregistrement
+        """
+        with self._verrou_fichier, self._condition:
+            self._verifier_utilisable()
+            temporaire = self._chemin_instantane + ".tmp"
+            with open(temporaire, "w", encoding="utf-8") as fichier:
+                json.dump({"seq": self.seq, "etat": etat}, fichier)
+                fichier.flush()
+                os.fsync(fichier.fileno())
+            os.replace(temporaire, self._chemin_instantane)
+            self._fichier.truncate(0)
+            self._en_attente.clear()  # Couverts par l'instantané
+            self.seq_valide = self.seq
+            self.depuis_instantane = 0
+            self._condition.notify_all()
+
+    def relire(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Relit l'instantané et les enregistrements qui le suivent.
+
+        Une dernière ligne tronquée (arrêt pendant une écriture) est ignorée ;
+        elle est supprimée à la prochaine ouverture du journal.
+
+        Returns:
+            (instantané {"seq", "etat"} ou None, enregistrements postérieurs)
+        """
+        instantane = None
+        if os.path.exists(self._chemin_instantane):
+            with open(self._chemin_instantane, encoding="utf-8") as fichier:
+                instantane = json.load(fichier)
+        seq_min = instantane["seq"] if instantane else 0
+
+        queue = []
+        if os.path.exists(self._chemin_journal):
+            with open(self._chemin_journal, encoding="utf-8") as fichier:
+                for ligne in fichier:
+                    try:
+                        enregistrement = json.loads(ligne)
+                    except json.JSONDecodeError:
+                        break
+                    if enregistrement["seq"] > seq_min:
+                        queue.append(enregistrement)
+        return instantane, queue
+
+    def fermer(self) -> None:
+        """Valide les enregistrements en attente, arrête le thread d'écriture et ferme le journal."""
+        with self._condition:
+            if self._ferme:
+                return
+            self._ferme = True
+            self._condition.notify_all()
+        self._ecrivain.join()
+        with self._verrou_fichier:
+            self._fichier.close()
+        if self._erreur is not None:
+            raise OSError(f"Écriture du journal impossible : {self._erreur}") from self._erreur
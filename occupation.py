@@ -0,0 +1,123 @@
+import itertools
+import math
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from dependances import numpy_optionnel
+
+
+# Codes de type de client (uint8)
+CODE_LIBRE = 0
+CODE_VISITEUR = 1
+CODE_ABONNE = 2
+
+CODES_TYPES: Dict[str, int] = {"VISITEUR": CODE_VISITEUR, "ABONNE": CODE_ABONNE}
+TYPES_CODES: Dict[int, str] = {code: nom for nom, code in CODES_TYPES.items()}
+
+# Empreinte mémoire : 1 octet (type) + 8 octets (horodatage) + 1 bit (validité)
+OCTETS_PAR_PLACE = 1 + 8 + 1 / 8
+
+
+class RegistreOccupation:
+    """
+    Occupation des places stockée dans des tableaux typés contigus.
+
+    Chaque place coûte OCTETS_PAR_PLACE (≈ 9,1 octets) au lieu de deux listes
+    d'objets Python (≈ 40 octets) : aucune allocation par véhicule et rien à
+    parcourir pour le ramasse-miettes. Les comptages par type sont délégués à
+    bytearray.count ; les requêtes sur les horodatages sont vectorisées avec
+    NumPy s'il est installé (vue sans copie sur le tableau), sinon elles
+    parcourent le tableau contigu.
+
+    Attributes:
+        nb_places: Nombre de places
+        types: Code du type de client par place (CODE_LIBRE si libre)
+        entrees: Horodatage d'entrée par place (+inf si libre)
+        validite: Bitmap des horodatages valides (bit à 1 = place occupée)
+    """
+
+    def __init__(self, nb_places: int) -> None:
+        self.nb_places = nb_places
+        self.types = bytearray(nb_places)
+        self.entrees = array("d", [math.inf]) * nb_places
+        self.validite = bytearray((nb_places + 7) // 8)
+
+    def occuper(self, place: int, type_client: str, horodatage: float) -> None:
+        """
+        Enregistre un véhicule sur une place.
+
+        Args:
+            place: Index de la place
+            type_client: "VISITEUR" ou "ABONNE"
+            horodatage: Instant d'entrée
+        """
+        self.types[place] = CODES_TYPES[type_client]
+        self.entrees[place] = horodatage
+        self.validite[place >> 3] |= 1 << (place & 7)
+
+    def liberer(self, place: int) -> Tuple[Optional[str], Optional[float]]:
+        """
+        Libère une place.
+
+        Args:
+            place: Index de la place
+
+        Returns:
+            (type de client, horodatage d'entrée) de l'occupant, ou (None, None)
+        """
+        occupant = (self.type_client(place), self.heure_entree(place))
+        self.types[place] = CODE_LIBRE
+        self.entrees[place] = math.inf
+        self.validite[place >> 3] &= ~(1 << (place & 7)) & 0xFF
+        return occupant
+
+    def est_occupee(self, place: int) -> bool:
+        """Indique si la place a un horodatage valide."""
+        return bool(self.validite[place >> 3] & (1 << (place & 7)))
+
+    def type_client(self, place: int) -> Optional[str]:
+        """Type de client garé sur la place, ou None si elle est libre."""
+        return TYPES_CODES.get(self.types[place])
+
+    def heure_entree(self, place: int) -> Optional[float]:
+        """Horodatage d'entrée de l'occupant, ou None si la place est libre."""
+        return self.entrees[place] if self.est_occupee(place) else None
+
+    def compter(self, type_client: Optional[str] = None) -> int:
+        """
+        Compte les places occupées.
+
+        Args:
+            type_client: "VISITEUR", "ABONNE", ou None pour tous types
+
+        Returns:
+            Le nombre de places occupées correspondantes
+        """
+        if type_client is None:
+            return self.nb_places - self.types.count(CODE_LIBRE)
+        return self.types.count(CODES_TYPES[type_client])
+
+    def places_occupees(self) -> List[int]:
+        """Liste des places occupées, par index croissant."""
+        return list(itertools.compress(range(self.nb_places), self.types))
+
+    def stationnes_depuis(self, duree_min: float, maintenant: float) -> List[int]:
+        """
+        Places dont l'occupant est garé depuis plus de `duree_min`.
+
+        Args:
+            duree_min: Durée minimale de stationnement (mêmes unités que les horodatages)
+            maintenant: Instant de référence
+
+        Returns:
+            Les index des places concernées, par ordre croissant
+        """
+        seuil = maintenant - duree_min
+        np = numpy_optionnel()
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(self.entrees, dtype=np.float64) < seuil).tolist()
+        return [place for place, entree in enumerate(self.entrees) if entree < seuil]
+
+    def octets(self) -> int:
+        """Mémoire occupée par les tableaux (hors en-têtes d'objets)."""
+        return len(self.types) + self.entrees.itemsize * len(self.entrees) + len(self.validite)
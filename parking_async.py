@@ -0,0 +1,120 @@
+import time
+from typing import Awaitable, Callable, Optional
+
+from parking_system import ParkingSystem
+
+
+# Périphériques asynchrones (lecteur de plaques, contrôle d'accès, terminal de paiement)
+LecteurPlaque = Callable[[], Awaitable[str]]
+ControleAcces = Callable[[Optional[str], bool], Awaitable[bool]]
+TerminalPaiement = Callable[[float, Optional[int]], Awaitable[bool]]
+
+
+class ParkingAsync:
+    """
+    Façade asyncio d'un ParkingSystem pour les contrôleurs de barrière.
+
+    Chaque entrée ou sortie est une coroutine qui déroule les générateurs
+    etapes_entree / etapes_sortie : aux points où gerer_entree appelait
+    pause_callback, la coroutine attend le périphérique correspondant. Une
+    seule boucle d'événements sert ainsi des centaines de voies ; le cœur
+    (synchrone, quelques microsecondes par étape) n'est jamais bloqué par les
+    entrées-sorties.
+
+    Un périphérique absent (None) est considéré comme répondant aussitôt
+    favorablement.
+
+    Attributes:
+        parking: Système piloté
+        lire_plaque: Coroutine de lecture de plaque, appelée en IDENTIFICATION
+        verifier_acces: Coroutine (plaque, est_abonne) -> accès autorisé,
+            appelée en VERIFICATION_ACCES ; est_abonne est le type de client
+            retenu par le cœur (celui du registre de plaques s'il y en a un,
+            sinon celui déclaré par l'appelant)
+        payer: Coroutine (montant, place) -> paiement accepté, appelée en
+            ATTENTE_PAIEMENT
+    """
+
+    def __init__(self, parking: ParkingSystem,
+                 lire_plaque: Optional[LecteurPlaque] = None,
+                 verifier_acces: Optional[ControleAcces] = None,
+                 payer: Optional[TerminalPaiement] = None) -> None:
+        self.parking = parking
+        self.lire_plaque = lire_plaque
+        self.verifier_acces = verifier_acces
+        self.payer = payer
+
+    async def entree(self, est_abonne: bool = False, zone: Optional[int] = None,
+                     horodatage: Optional[float] = None,
+                     plaque: Optional[str] = None) -> Optional[int]:
+        """
+        Fait entrer un véhicule.
+
+        La plaque lue et la réponse du contrôle d'accès sont transmises au
+        générateur etapes_entree : le registre de plaques est consulté et un
+        refus passe par acces_refuse et le journal, comme en synchrone. Si
+        l'accès est refusé, ou si la coroutine est annulée avant l'entrée, la
+        place réservée est rendue.
+
+        Args:
+            est_abonne: True si le véhicule est un abonné, False pour visiteur
+            zone: Zone de stationnement préférée
+            horodatage: Instant d'entrée enregistré (time.time() par défaut)
+            plaque: Plaque déjà connue (sinon lue par lire_plaque)
+
+        Returns:
+            L'index de la place attribuée, ou None si l'entrée est refusée
+        """
+        instant = time.time() if horodatage is None else horodatage
+        etapes = self.parking.etapes_entree(est_abonne, zone, horodatage, plaque)
+        try:
+            etat = next(etapes)
+            while True:
+                reponse = None
+                if etat == "IDENTIFICATION" and self.lire_plaque is not None and plaque is None:
+                    plaque = reponse = await self.lire_plaque()
+                elif etat == "VERIFICATION_ACCES" and self.verifier_acces is not None:
+                    registre = self.parking.registre
+                    if registre is not None and plaque is not None:
+                        est_abonne = registre.verifier(plaque, instant).est_abonne  # Même décision que le cœur
+                    reponse = bool(await self.verifier_acces(plaque, est_abonne))
+                etat = etapes.send(reponse)
+        except StopIteration as fin:
+            return fin.value
+        finally:
+            etapes.close()  # Rend la place si l'entrée n'a pas abouti
+
+    async def sortie(self, est_abonne: bool = False, place: Optional[int] = None,
+                     montant: Optional[float] = None,
+                     horodatage: Optional[float] = None) -> bool:
+        """
+        Fait sortir un véhicule.
+
+        Args:
+            est_abonne: True si le véhicule est un abonné, False pour visiteur
+            place: Place libérée (une place garée quelconque si None)
+            montant: Montant à payer (calculé d'après la durée de
+                stationnement de la place si None)
+            horodatage: Instant de sortie (time.time() par défaut)
+
+        Returns:
+            True si le véhicule est sorti, False si le paiement a échoué
+            (le véhicule reste alors garé)
+        """
+        horodatage = time.time() if horodatage is None else horodatage
+        if place is None:
+            place = self.parking.place_garee()  # Choisie avant le tarif, réclamée au premier pas
+        if montant is None:
+            entree = self.parking.occupation.heure_entree(place) if place is not None else None
+            montant = 0.0 if entree is None else self.parking.calculer_montant(horodatage - entree, est_abonne)
+
+        etapes = self.parking.etapes_sortie(est_abonne, montant, place, horodatage)
+        try:
+            for etat in etapes:
+                if etat == "ATTENTE_PAIEMENT" and self.payer is not None:
+                    if not await self.payer(montant, place):
+                        self.parking.sink.emettre("paiement", ">> Paiement refusé", montant=montant)
+                        return False
+            return True
+        finally:
+            etapes.close()
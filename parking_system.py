@@ -1,10 +1,63 @@
-from typing import Optional, Callable
-from automate_base import Automate, Etat
+import itertools
+import random
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, List, Optional, Sequence, Set
+from allocation import AllocateurPlaces
+from analytique import Analytique
+from automate_base import Automate
+from definition_automate import (DefinitionInvalide, automate_depuis_compile, charger_automate,
+                                 compiler_definition)
+from evenements import ConsoleSink, EvenementSink
+from journal import JournalEvenements
+from occupation import RegistreOccupation
+from registre_plaques import RegistrePlaques
+from stockage import StockageSessions
+from tarification import CacheTarifs, GrilleTarifaire
 
 
 # Constantes de configuration
 PLACES_TOTALES_DEFAULT = 10
 TARIF_HORAIRE_DEFAULT = 2.5
+PAS_FACTURATION_DEFAULT = 60.0  # Secondes : facturation à la minute entamée
+TAILLE_CACHE_TARIFS_DEFAULT = 4096
+
+# Automate par défaut (format de definition_automate)
+DEFINITION_PARKING: Dict[str, Any] = {
+    "nom": "parking",
+    "etats": [
+        {"id": 0, "label": "DISPONIBLE", "type": "initial"},
+        {"id": 1, "label": "IDENTIFICATION"},
+        {"id": 2, "label": "VERIFICATION_ACCES"},
+        {"id": 3, "label": "BARRIERE_ENTREE_OUVERTE"},
+        {"id": 4, "label": "STATIONNEMENT"},
+        {"id": 5, "label": "CALCUL_TARIF"},
+        {"id": 6, "label": "ATTENTE_PAIEMENT"},
+        {"id": 7, "label": "BARRIERE_SORTIE_OUVERTE"},
+        {"id": 99, "label": "COMPLET"},
+    ],
+    "transitions": [
+        # Entrée
+        [0, 1, "detecter_entree"],
+        [1, 2, "lire_plaque"],
+        [2, 3, "acces_valide"],
+        [2, 0, "acces_refuse"],
+        [3, 4, "vehicule_entre"],
+        # Sortie
+        [4, 5, "demande_sortie"],
+        [5, 6, "paiement_requis"],
+        [5, 7, "abonne_gratuit"],
+        [6, 7, "paiement_valide"],
+        [7, 0, "vehicule_sorti"],
+        # Saturation
+        [0, 99, "parking_plein"],
+        [99, 0, "place_liberee"],
+    ],
+}
+# États et événements pilotés par ParkingSystem : toute définition de site doit les contenir
+ETATS_REQUIS = (0, 4, 99)
+EVENEMENTS_REQUIS = tuple(dict.fromkeys(evt for _, _, evt in DEFINITION_PARKING["transitions"]))
 
 
 class ParkingSystem:
@@ -18,127 +71,686 @@ class ParkingSystem:
         places_totales: Nombre total de places disponibles
         places_libres: Nombre de places actuellement libres
         tarif_horaire: Tarif horaire pour les visiteurs
+        tarification: Grille tarifaire appliquée aux sorties
+        cache_tarifs: Cache LRU des montants par tranche facturable
         recettes_totales: Montant total des recettes
         total_visiteurs: Nombre total de visiteurs accueillis
         total_abonnes: Nombre total d'abonnés accueillis
-        automate: Instance de l'automate à états finis
+        automate: Automate d'affichage (graphe de l'interface, analyse), construit
+            au premier accès à partir de graphe
+        graphe: Forme compilée de l'automate, partagée par toutes les sessions et
+            par l'état global affiché
+        sessions: Sessions véhicule en cours {id_session: index d'état}
+        allocateur: Attribution des places individuelles
+        occupation: Occupant (type de client, heure d'entrée) de chaque place
+        sink: Destination des événements (console par défaut)
+        journal: Journal d'écriture anticipée pour la reprise (None = pas de persistance)
+        stockage: Historique SQLite des sessions terminées (None = non conservé)
+        analytique: Statistiques par minute/heure/jour (None = non calculées)
+        registre: Abonnés et liste noire par plaque (None = pas de contrôle d'accès)
+        verrou: Verrou protégeant l'état partagé (plusieurs contrôleurs de barrière
+            peuvent piloter le même système depuis des threads différents)
     """
     
     def __init__(self, places_totales: int = PLACES_TOTALES_DEFAULT, 
-                 tarif_horaire: float = TARIF_HORAIRE_DEFAULT) -> None:
+                 tarif_horaire: float = TARIF_HORAIRE_DEFAULT,
+                 sink: Optional[EvenementSink] = None,
+                 allocateur: Optional[AllocateurPlaces] = None,
+                 tarification: Optional[GrilleTarifaire] = None,
+                 pas_facturation: float = PAS_FACTURATION_DEFAULT,
+                 taille_cache_tarifs: int = TAILLE_CACHE_TARIFS_DEFAULT,
+                 journal: Optional[JournalEvenements] = None,
+                 stockage: Optional[StockageSessions] = None,
+                 analytique: Optional[Analytique] = None,
+                 registre: Optional[RegistrePlaques] = None,
+                 definition: Optional[str] = None) -> None:
+        self.sink = sink if sink is not None else ConsoleSink()
         self.places_totales = places_totales
         self.places_libres = places_totales
         self.tarif_horaire = tarif_horaire
+        self.tarification = tarification if tarification is not None else GrilleTarifaire(tarif_horaire)
+        self.cache_tarifs = CacheTarifs(self.tarification, taille_cache_tarifs, pas_facturation)
+        self.allocateur = allocateur if allocateur is not None else AllocateurPlaces(places_totales)
+        if self.allocateur.nb_places != places_totales:
+            raise ValueError(f"L'allocateur gère {self.allocateur.nb_places} places, "
+                             f"{places_totales} attendues.")
+        self.occupation = RegistreOccupation(places_totales)
+        self.journal = journal
+        self.stockage = stockage
+        self.analytique = analytique
+        self.registre = registre
+        self.verrou = threading.RLock()
         
         self.recettes_totales = 0.0
         self.total_visiteurs = 0
         self.total_abonnes = 0
         
-        self.automate = Automate()
-        self._construire_automate()
-        print(f"[ParkingSystem] Initialisé : {places_totales} places.")
-
-    def _construire_automate(self) -> None:
-        """Construit la structure de l'automate à états finis."""
-        etats = [
-            Etat(0, "DISPONIBLE", "initial"),
-            Etat(1, "IDENTIFICATION"),
-            Etat(2, "VERIFICATION_ACCES"),
-            Etat(3, "BARRIERE_ENTREE_OUVERTE"),
-            Etat(4, "STATIONNEMENT"),
-            Etat(5, "CALCUL_TARIF"),
-            Etat(6, "ATTENTE_PAIEMENT"),
-            Etat(7, "BARRIERE_SORTIE_OUVERTE"),
-            Etat(99, "COMPLET")
-        ]
-        for e in etats:
-            self.automate.ajouter_etat(e)
-
-        # Transitions d'entrée
-        self.automate.ajouter_transition(0, 1, "detecter_entree")
-        self.automate.ajouter_transition(1, 2, "lire_plaque")
-        self.automate.ajouter_transition(2, 3, "acces_valide")
-        self.automate.ajouter_transition(3, 4, "vehicule_entre")
-        
-        # Transitions de sortie
-        self.automate.ajouter_transition(4, 5, "demande_sortie")
-        self.automate.ajouter_transition(5, 6, "paiement_requis")
-        self.automate.ajouter_transition(5, 7, "abonne_gratuit")
-        self.automate.ajouter_transition(6, 7, "paiement_valide")
-        self.automate.ajouter_transition(7, 0, "vehicule_sorti")
-        
-        # Gestion saturation
-        self.automate.ajouter_transition(0, 99, "parking_plein")
-        self.automate.ajouter_transition(99, 0, "place_liberee")
+        if definition is None:
+            self.graphe = compiler_definition(DEFINITION_PARKING)
+        else:
+            self.graphe = charger_automate(definition)  # Artefact précompilé projeté en mémoire
+            self._verifier_graphe()
+        self._etat_courant = self.graphe.etat_initial  # Index de l'état global affiché
+        self._automate: Optional[Automate] = None
+        self.sessions: Dict[int, int] = {}
+        self._reservations: Dict[int, str] = {}  # Réservations ouvertes {place: type de client}
+        self._sorties: Set[int] = set()  # Places réclamées par une sortie en cours
+        self._ids_sessions = itertools.count()
+        self.sink.emettre("parking", "[ParkingSystem] Initialisé : {places} places.",
+                          places=places_totales)
+
+    def _verifier_graphe(self) -> None:
+        """Vérifie qu'un automate de site contient les états et événements pilotés par le système."""
+        erreurs = [f"état {id_etat} requis" for id_etat in ETATS_REQUIS
+                   if id_etat not in self.graphe.index_etats]
+        erreurs += [f"événement '{evt}' requis" for evt in EVENEMENTS_REQUIS
+                    if evt not in self.graphe.codes_evenements]
+        if erreurs:
+            raise DefinitionInvalide(erreurs)
+
+    @property
+    def automate(self) -> Automate:
+        """Automate d'affichage, reconstruit depuis graphe au premier accès puis tenu à jour."""
+        with self.verrou:
+            if self._automate is None:
+                automate = automate_depuis_compile(self.graphe, self.sink)
+                automate.etat_courant = automate.list_etats[self.graphe.ids_etats[self._etat_courant]]
+                self._automate = automate
+            return self._automate
+
+    @property
+    def label_courant(self) -> str:
+        """Label de l'état global (dernier état atteint par une session ou par saturation)."""
+        return self.graphe.labels[self._etat_courant]
+
+    def _changer_etat(self, etat: int) -> None:
+        """Positionne l'état global (index dans graphe) et l'automate d'affichage s'il existe."""
+        self._etat_courant = etat
+        if self._automate is not None:
+            self._automate.etat_courant = self._automate.list_etats[self.graphe.ids_etats[etat]]
+
+    def _transition_globale(self, evt: str) -> bool:
+        """Applique un événement à l'état global (mêmes événements émis que Automate.transition)."""
+        src = self._etat_courant
+        dst = self.graphe.suivant(src, self.graphe.codes_evenements[evt])
+        if dst < 0:
+            self.sink.emettre("bloque", "[Bloqué] Événement '{evt}' impossible depuis l'état '{etat}'",
+                              evt=evt, etat=self.graphe.labels[src])
+            return False
+        self._changer_etat(dst)
+        self.sink.emettre("transition", "[Transition] '{evt}': {src} -> {dst}",
+                          evt=evt, src=self.graphe.labels[src], dst=self.graphe.labels[dst])
+        return True
+
+    def _signaler_complet(self) -> None:
+        """
+        Passe l'état global à COMPLET s'il n'y est pas déjà (verrou tenu).
+        
+        La saturation concerne le parking, pas une session : elle part de
+        DISPONIBLE quel que soit le dernier état atteint par une session.
+        """
+        if self.graphe.ids_etats[self._etat_courant] != 99:
+            self._changer_etat(self.graphe.index_etats[0])
+            self._transition_globale("parking_plein")
+
+    def etat_affiche(self) -> str:
+        """Label de l'état à afficher (COMPLET dès qu'il ne reste aucune place)."""
+        if self.places_libres == 0:
+            return "COMPLET"
+        return self.label_courant
 
     def get_status(self) -> dict:
         """
         Retourne l'état actuel du système.
         
+        visiteurs et abonnes sont des cumuls depuis le démarrage ;
+        visiteurs_presents et abonnes_presents comptent les véhicules garés.
+        Avec un module analytique, arrivees_heure et recettes_heure portent
+        sur les 60 dernières minutes.
+        
         Returns:
             Dictionnaire contenant les statistiques du parking
         """
-        etat_label = self.automate.etat_courant.label_etat
-        if self.places_libres == 0:
-            etat_label = "COMPLET"
-            
-        return {
-            "etat_automate": etat_label,
+        with self.verrou:
+            return self._statut()
+
+    def _statut(self) -> dict:
+        """Construit le statut (verrou tenu)."""
+        status = {
+            "etat_automate": self.etat_affiche(),
             "places_libres": self.places_libres,
             "places_totales": self.places_totales,
             "recettes": self.recettes_totales,
             "visiteurs": self.total_visiteurs,
-            "abonnes": self.total_abonnes
+            "abonnes": self.total_abonnes,
+            "visiteurs_presents": self.occupation.compter("VISITEUR"),
+            "abonnes_presents": self.occupation.compter("ABONNE"),
+            "sessions_en_cours": len(self.sessions),
+            "cache_tarifs_hits": self.cache_tarifs.hits,
+            "cache_tarifs_misses": self.cache_tarifs.misses
         }
+        if self.analytique is not None:
+            derniere_heure = self.analytique.resume("minute", 60)
+            status["arrivees_heure"] = derniere_heure["arrivees"]
+            status["recettes_heure"] = derniere_heure["recettes"]
+        return status
 
-    def gerer_entree(self, est_abonne: bool = False, 
-                     pause_callback: Optional[Callable] = None) -> None:
+    def _journaliser(self, type_evt: str, **donnees: Any) -> None:
+        """Ajoute un événement au journal et prend un instantané si l'intervalle est atteint."""
+        if self.journal is None:
+            return
+        self.journal.ajouter(type_evt, **donnees)
+        if self.journal.instantane_du():
+            self.instantane()
+
+    def etat_persistant(self) -> Dict[str, Any]:
         """
-        Gère l'entrée d'un véhicule dans le parking.
+        Retourne l'état durable du système (compteurs, recettes, occupants).
+        
+        Les sessions en cours n'en font pas partie : un véhicule qui n'est pas
+        encore garé n'occupe pas de place après une reprise. Les réservations
+        ouvertes sont donc retirées des places et des totaux ; leur issue
+        (entree, refus ou annulation) est journalisée plus tard et rejouée
+        après l'instantané.
+        
+        Returns:
+            Dictionnaire sérialisable en JSON
+        """
+        occupation = self.occupation
+        with self.verrou:
+            abonnes_reserves = sum(1 for client in self._reservations.values() if client == "ABONNE")
+            return {
+                "places_libres": self.places_libres + len(self._reservations),
+                "recettes": self.recettes_totales,
+                "visiteurs": self.total_visiteurs - (len(self._reservations) - abonnes_reserves),
+                "abonnes": self.total_abonnes - abonnes_reserves,
+                "occupants": [[place, occupation.type_client(place), occupation.entrees[place]]
+                              for place in occupation.places_occupees()]
+            }
+
+    def instantane(self) -> None:
+        """Enregistre un instantané de l'état dans le journal (qui est alors vidé)."""
+        if self.journal is not None:
+            with self.verrou:
+                self.journal.instantane(self.etat_persistant())
+
+    def restaurer(self) -> int:
+        """
+        Reconstruit l'état à partir du journal : dernier instantané puis
+        rejeu des événements qui le suivent.
+        
+        Returns:
+            Le nombre d'événements rejoués après l'instantané
+            
+        Raises:
+            ValueError: Si le système n'a pas de journal
+        """
+        if self.journal is None:
+            raise ValueError("Aucun journal à restaurer.")
+        with self.verrou:
+            rejoues = self._rejouer(*self.journal.relire())
+        self.sink.emettre("parking", "[ParkingSystem] Restauré : {rejoues} événements rejoués.",
+                          rejoues=rejoues)
+        return rejoues
+
+    def _rejouer(self, instantane: Optional[Dict[str, Any]], queue: List[Dict[str, Any]]) -> int:
+        """Applique l'instantané puis les événements de la queue (verrou tenu)."""
+        occupation = self.occupation
+        if instantane is not None:
+            etat = instantane["etat"]
+            self.places_libres = etat["places_libres"]
+            self.recettes_totales = etat["recettes"]
+            self.total_visiteurs = etat["visiteurs"]
+            self.total_abonnes = etat["abonnes"]
+            for place, type_client, horodatage in etat["occupants"]:
+                occupation.occuper(place, type_client, horodatage)
+
+        for enregistrement in queue:
+            type_evt = enregistrement["type"]
+            if type_evt == "entree":
+                occupation.occuper(enregistrement["place"], enregistrement["client"],
+                                   enregistrement["horodatage"])
+                self.places_libres -= 1
+            elif type_evt == "paiement":
+                self.recettes_totales += enregistrement["montant"]
+            elif type_evt == "sortie":
+                self.places_libres += 1
+                if enregistrement["place"] is not None:
+                    occupation.liberer(enregistrement["place"])
+            if type_evt in ("entree", "refus", "annulation"):
+                if enregistrement["client"] == "ABONNE":
+                    self.total_abonnes += 1
+                else:
+                    self.total_visiteurs += 1
+
+        self.allocateur.restaurer(occupation.places_occupees())
+        if self.places_libres == 0:
+            self._signaler_complet()
+        return len(queue)
+
+    def ouvrir_session(self, id_etat: int) -> int:
+        """
+        Ouvre une session véhicule positionnée sur un état de l'automate.
+        
+        Une session n'est qu'un curseur (index d'état) dans le graphe compilé
+        partagé : plusieurs véhicules peuvent être en cours simultanément.
+        Les sessions et l'état global affiché sont protégés par le verrou,
+        comme les compteurs : un contrôleur ne peut pas modifier l'état
+        affiché au milieu d'une saturation signalée par un autre.
+        
+        Args:
+            id_etat: ID de l'état de départ (0 pour une entrée, 4 pour une sortie)
+            
+        Returns:
+            L'identifiant de la session
+        """
+        with self.verrou:
+            id_session = next(self._ids_sessions)
+            self.sessions[id_session] = self.graphe.index_etats[id_etat]
+            return id_session
+
+    def avancer_session(self, id_session: int, evt: str) -> bool:
+        """
+        Applique un événement à une session sans toucher aux autres.
+        
+        L'état global (label_courant) reflète le dernier état atteint.
+        
+        Args:
+            id_session: Identifiant de la session
+            evt: Événement déclencheur
+            
+        Returns:
+            True si le changement d'état a eu lieu, False sinon
+        """
+        with self.verrou:
+            etat = self.sessions[id_session]
+            dst = self.graphe.suivant(etat, self.graphe.codes_evenements[evt])
+            if dst < 0:
+                self.sink.emettre("bloque", "[Bloqué] Événement '{evt}' impossible depuis l'état '{etat}'",
+                                  evt=evt, etat=self.graphe.labels[etat], session=id_session)
+                return False
+            self.sessions[id_session] = dst
+            self._changer_etat(dst)
+            self.sink.emettre("transition", "[Transition] '{evt}': {src} -> {dst}",
+                              evt=evt, src=self.graphe.labels[etat], dst=self.graphe.labels[dst],
+                              session=id_session)
+            return True
+
+    def fermer_session(self, id_session: int) -> None:
+        """Libère le curseur d'une session terminée."""
+        with self.verrou:
+            self.sessions.pop(id_session, None)
+
+    def reserver_place(self, est_abonne: bool = False, zone: Optional[int] = None) -> Optional[int]:
+        """
+        Compte une tentative d'entrée et réserve une place, de façon atomique.
+        
+        Deux contrôleurs ne peuvent pas obtenir la même place, ni dépasser la
+        capacité quand il ne reste qu'une place. La réservation doit ensuite
+        être confirmée (valider_entree) ou rendue (annuler_reservation).
         
         Args:
             est_abonne: True si le véhicule est un abonné, False pour visiteur
-            pause_callback: Fonction de callback pour animer les transitions
+            zone: Zone de stationnement préférée (voir AllocateurPlaces)
+            
+        Returns:
+            L'index de la place réservée, ou None si le parking est complet
+            (ou, pour un visiteur, si seules des places réservées aux abonnés
+            restent libres : l'état global ne passe alors pas à COMPLET)
         """
-        if est_abonne:
-            self.total_abonnes += 1
-        else:
-            self.total_visiteurs += 1
+        with self.verrou:
+            if est_abonne:
+                self.total_abonnes += 1
+            else:
+                self.total_visiteurs += 1
+            place = self.allocateur.acquerir(est_abonne, zone) if self.places_libres > 0 else None
+            if place is None:
+                self._journaliser("refus", client="ABONNE" if est_abonne else "VISITEUR")
+                if self.allocateur.nb_libres == 0:  # Sinon seules des places d'abonnés restent libres
+                    self._signaler_complet()
+                return None
+            self.places_libres -= 1
+            self._reservations[place] = "ABONNE" if est_abonne else "VISITEUR"
+            return place
 
-        print("\n--- TENTATIVE D'ENTREE ---")
-        if self.places_libres > 0:
-            current_id = self.automate.etat_courant.id_etat
-            if current_id == 99 or current_id == 4:
-                self.automate.etat_courant = self.automate.list_etats[0]
+    def annuler_reservation(self, place: int, refusee: bool = False) -> None:
+        """
+        Rend une place réservée par reserver_place et jamais occupée.
+        
+        Args:
+            place: Place obtenue par reserver_place
+            refusee: True si l'accès a été refusé (journalisé "refus"), False
+                si l'entrée a été abandonnée (journalisé "annulation")
+        """
+        with self.verrou:
+            self.places_libres += 1
+            self.allocateur.liberer(place)
+            client = self._reservations.pop(place, "VISITEUR")
+            self._journaliser("refus" if refusee else "annulation", client=client)
 
-            if self.automate.transition("detecter_entree"):
-                if pause_callback:
-                    pause_callback()
-                
-                self.automate.transition("lire_plaque")
-                if pause_callback:
-                    pause_callback()
-                
-                self.automate.transition("acces_valide")
-                if pause_callback:
-                    pause_callback()
+    def _requalifier_reservation(self, place: int, est_abonne: bool) -> None:
+        """Change le type de client d'une réservation ouverte (plaque lue après la réservation)."""
+        with self.verrou:
+            if est_abonne:
+                self.total_abonnes += 1
+                self.total_visiteurs -= 1
+            else:
+                self.total_visiteurs += 1
+                self.total_abonnes -= 1
+            self._reservations[place] = "ABONNE" if est_abonne else "VISITEUR"
+
+    def valider_entree(self, place: int, est_abonne: bool = False,
+                       horodatage: Optional[float] = None) -> None:
+        """
+        Confirme une réservation : le véhicule est garé sur la place.
+        
+        Args:
+            place: Place obtenue par reserver_place
+            est_abonne: True si le véhicule est un abonné, False pour visiteur
+            horodatage: Instant d'entrée enregistré (time.time() par défaut)
+        """
+        type_client = "ABONNE" if est_abonne else "VISITEUR"
+        horodatage = time.time() if horodatage is None else horodatage
+        with self.verrou:
+            self.occupation.occuper(place, type_client, horodatage)
+            self._reservations.pop(place, None)
+            self._journaliser("entree", place=place, client=type_client, horodatage=horodatage)
+            if self.analytique is not None:
+                self.analytique.enregistrer_arrivee(horodatage, self.places_totales - self.places_libres)
+            if self.places_libres == 0:
+                self._signaler_complet()
+
+    def encaisser(self, montant: float) -> None:
+        """Ajoute un paiement aux recettes (atomique)."""
+        with self.verrou:
+            self.recettes_totales += montant
+            self._journaliser("paiement", montant=montant)
+
+    def place_garee(self, rng: Optional[random.Random] = None,
+                    exclues: Iterable[int] = ()) -> Optional[int]:
+        """
+        Retourne une place libérable : occupée par un véhicule garé, ni
+        réservée par une entrée en cours, ni réclamée par une sortie en cours.
+        
+        Args:
+            rng: Générateur pour un tirage au hasard (place quelconque en O(1) si None)
+            exclues: Autres places à écarter (sorties que l'appelant prépare)
+            
+        Returns:
+            L'index de la place, ou None si aucun véhicule n'est garé
+        """
+        with self.verrou:
+            exclues = self._reservations.keys() | self._sorties | set(exclues)
+            if rng is None:
+                return self.allocateur.place_occupee_quelconque(exclues)
+            return self.allocateur.place_occupee_aleatoire(rng, exclues)
+
+    def _place_sortante(self, place: Optional[int]) -> int:
+        """
+        Vérifie qu'une sortie est possible, avant toute modification (verrou tenu).
+        
+        Seules les places où un véhicule est garé (registre d'occupation)
+        peuvent sortir : une place réservée par une entrée en cours est
+        occupée pour l'allocateur mais pas encore garée.
+        
+        Args:
+            place: Place à libérer (une place garée quelconque si None)
+            
+        Returns:
+            La place à libérer
+            
+        Raises:
+            ValueError: Si la place n'est pas garée, si sa sortie est déjà en
+                cours ou si aucun véhicule n'est garé
+        """
+        if place is None:
+            place = self.place_garee()
+            if place is None:
+                raise ValueError("Aucun véhicule garé.")
+        if not self.occupation.est_occupee(place):
+            raise ValueError(f"Place {place} non occupée.")
+        if place in self._sorties:
+            raise ValueError(f"Place {place} déjà en cours de sortie.")
+        return place
+
+    def liberer_place(self, place: Optional[int] = None, est_abonne: bool = False,
+                      montant: float = 0.0, horodatage: Optional[float] = None) -> Optional[int]:
+        """
+        Enregistre la sortie d'un véhicule et rend sa place, de façon atomique.
+        
+        Args:
+            place: Place libérée (une place garée quelconque si None)
+            est_abonne: True si le véhicule est un abonné, False pour visiteur
+            montant: Montant payé (ignoré pour les abonnés)
+            horodatage: Instant de sortie enregistré (time.time() par défaut)
+            
+        Returns:
+            La place libérée
+            
+        Raises:
+            ValueError: Si la place n'est pas garée, si sa sortie est déjà en
+                cours ou si aucun véhicule n'est garé (rien n'est alors modifié)
+        """
+        with self.verrou:
+            place = self._place_sortante(place)
+            self._liberer(place, est_abonne, montant, horodatage)
+        return place
+
+    def _liberer(self, place: int, est_abonne: bool, montant: float,
+                 horodatage: Optional[float]) -> None:
+        """Rend une place validée par _place_sortante (verrou tenu)."""
+        sortie = time.time() if horodatage is None else horodatage
+        paye = 0.0 if est_abonne else montant
+        self.allocateur.liberer(place)
+        self.places_libres += 1
+        type_client, entree = self.occupation.liberer(place)
+        if self.stockage is not None and entree is not None:
+            self.stockage.enregistrer(place, type_client, entree, sortie, paye)
+        if self.analytique is not None:
+            self.analytique.enregistrer_depart(sortie, self.places_totales - self.places_libres, paye,
+                                               0.0 if entree is None else sortie - entree)
+        self._journaliser("sortie", place=place)
+
+    def etapes_entree(self, est_abonne: bool = False, zone: Optional[int] = None,
+                      horodatage: Optional[float] = None,
+                      plaque: Optional[str] = None) -> Generator[str, Any, Optional[int]]:
+        """
+        Déroule l'entrée d'un véhicule étape par étape.
+        
+        Le générateur rend la main (en produisant le label de l'état atteint)
+        à chaque point où gerer_entree appelle pause_callback ; plusieurs
+        entrées peuvent ainsi être entrelacées. La place est réservée dès la
+        détection et rendue si le générateur est abandonné avant l'entrée.
+        
+        Un pilote asynchrone peut transmettre par send() ce que ses
+        périphériques ont obtenu : la plaque lue en IDENTIFICATION (contrôlée
+        par le registre comme le paramètre plaque ; un changement de type de
+        client requalifie la réservation, la place étant conservée), puis la
+        décision d'un contrôle d'accès externe (bool) en VERIFICATION_ACCES.
+        Un refus passe par acces_refuse et est journalisé.
+        
+        Args:
+            est_abonne: True si le véhicule est un abonné, False pour visiteur
+            zone: Zone de stationnement préférée (voir AllocateurPlaces)
+            horodatage: Instant d'entrée enregistré (time.time() par défaut)
+            plaque: Plaque lue ; avec un registre, elle détermine le type de
+                client (est_abonne est alors ignoré) et peut refuser l'accès
+            
+        Returns:
+            (valeur de retour du générateur) L'index de la place attribuée,
+            ou None si l'entrée est refusée
+        """
+        instant = time.time() if horodatage is None else horodatage
+        decision = None
+        if plaque is not None and self.registre is not None:
+            decision = self.registre.verifier(plaque, instant)
+            est_abonne = decision.est_abonne
+
+        self.sink.emettre("entree", "\n--- TENTATIVE D'ENTREE ---", est_abonne=est_abonne)
+        place = self.reserver_place(est_abonne, zone)
+        if place is None:
+            if self.places_libres > 0:
+                self.sink.emettre("refus", "[Refus] Places restantes réservées aux abonnés.")
+            else:
+                self.sink.emettre("refus", "[Refus] Parking COMPLET.")
+            return None
+
+        garee = refusee = False
+        id_session = self.ouvrir_session(0)
+        try:
+            self.avancer_session(id_session, "detecter_entree")
+            lue = yield self.graphe.labels[self.sessions[id_session]]
+            if lue is not None and plaque is None:
+                plaque = lue
+                if self.registre is not None:
+                    decision = self.registre.verifier(plaque, instant)
+                    if decision.est_abonne != est_abonne:
+                        est_abonne = decision.est_abonne
+                        self._requalifier_reservation(place, est_abonne)
+
+            self.avancer_session(id_session, "lire_plaque")
+            autorise = yield self.graphe.labels[self.sessions[id_session]]
+
+            motif = decision.motif if decision is not None and not decision.autorise else None
+            if motif is None and autorise is False:
+                motif = "controle_externe"
+            if motif is not None:
+                self.avancer_session(id_session, "acces_refuse")
+                self.sink.emettre("refus", "[Refus] Accès refusé ({motif}) : {plaque}.",
+                                  motif=motif, plaque=plaque)
+                refusee = True
+                return None
+
+            self.avancer_session(id_session, "acces_valide")
+            yield self.graphe.labels[self.sessions[id_session]]
+            
+            self.avancer_session(id_session, "vehicule_entre")
+            garee = True
+            self.valider_entree(place, est_abonne, horodatage)
+            self.sink.emettre("entree", "[Succès] Véhicule garé. Places restantes: {places_libres}",
+                              places_libres=self.places_libres, place=place)
+        finally:
+            self.fermer_session(id_session)
+            if not garee:
+                self.annuler_reservation(place, refusee)
+        return place
+
+    def etapes_sortie(self, est_abonne: bool = False, montant: float = 15.0,
+                      place: Optional[int] = None,
+                      horodatage: Optional[float] = None) -> Iterator[str]:
+        """
+        Déroule la sortie d'un véhicule étape par étape (voir etapes_entree).
+        
+        Args:
+            est_abonne: True si le véhicule est un abonné, False pour visiteur
+            montant: Montant à payer (ignoré pour les abonnés)
+            place: Place libérée (une place garée quelconque si None)
+            horodatage: Instant de sortie enregistré (time.time() par défaut)
+            
+        Raises:
+            ValueError: Au premier pas, si la place n'est pas garée, si sa
+                sortie est déjà en cours ou si aucun véhicule n'est garé (rien
+                n'est encaissé ni modifié)
+        """
+        with self.verrou:
+            place = self._place_sortante(place)
+            self._sorties.add(place)  # Réclamée dès le premier pas : une autre sortie ne peut plus la prendre
+        self.sink.emettre("sortie", "\n--- SORTIE (Abonné: {est_abonne}) ---", est_abonne=est_abonne)
+        
+        liberee = False
+        id_session = self.ouvrir_session(4)
+        try:
+            self.avancer_session(id_session, "demande_sortie")
+            yield self.graphe.labels[self.sessions[id_session]]
+            
+            if est_abonne:
+                self.avancer_session(id_session, "abonne_gratuit")
+                self.sink.emettre("paiement", ">> Gratuit (Abonné)", montant=0.0)
+                yield self.graphe.labels[self.sessions[id_session]]
+            else:
+                self.avancer_session(id_session, "paiement_requis")
+                self.sink.emettre("paiement", ">> Paiement requis ({montant:.2f} DH)...", montant=montant)
+                yield self.graphe.labels[self.sessions[id_session]]
                 
-                self.automate.transition("vehicule_entre")
+                self.encaisser(montant)
                 
-                self.places_libres -= 1
-                print(f"[Succès] Véhicule garé. Places restantes: {self.places_libres}")
+                self.avancer_session(id_session, "paiement_valide")
+                self.sink.emettre("paiement", ">> Paiement accepté", montant=montant)
+                yield self.graphe.labels[self.sessions[id_session]]
                 
-                if self.places_libres == 0:
-                    self.automate.etat_courant = self.automate.list_etats[0]
-                    self.automate.transition("parking_plein")
-        else:
-            print("[Refus] Parking COMPLET.")
-            if self.automate.etat_courant.id_etat != 99:
-                self.automate.transition("parking_plein")
+            self.avancer_session(id_session, "vehicule_sorti")
+            with self.verrou:
+                self._sorties.discard(place)
+                self._liberer(place, est_abonne, montant, horodatage)
+                liberee = True
+        finally:
+            self.fermer_session(id_session)
+            if not liberee:
+                with self.verrou:
+                    self._sorties.discard(place)
+
+    def calculer_montant(self, duree: float, est_abonne: bool = False) -> float:
+        """
+        Calcule le montant d'une sortie selon la grille tarifaire.
+        
+        La durée est facturée par tranche entamée de pas_facturation secondes ;
+        les montants sont mémorisés dans cache_tarifs.
+        
+        Args:
+            duree: Durée de stationnement (secondes)
+            est_abonne: True si le client est abonné
+            
+        Returns:
+            Le montant à payer
+        """
+        with self.verrou:
+            return self.cache_tarifs.montant(duree, est_abonne)
+
+    def calculer_montants(self, durees: Sequence[float], types: Sequence[int]) -> array:
+        """
+        Calcule en un appel les montants d'un lot de sorties (clôture, simulations).
+        
+        Args:
+            durees: Durées de stationnement (secondes)
+            types: Codes de type de client (voir occupation.CODES_TYPES)
+            
+        Returns:
+            Les montants, dans l'ordre des entrées
+        """
+        return self.tarification.calculer_lot(durees, types)
+
+    def gerer_entree(self, est_abonne: bool = False, 
+                     pause_callback: Optional[Callable] = None,
+                     zone: Optional[int] = None,
+                     horodatage: Optional[float] = None,
+                     plaque: Optional[str] = None) -> Optional[int]:
+        """
+        Gère l'entrée d'un véhicule dans le parking.
+        
+        Args:
+            est_abonne: True si le véhicule est un abonné, False pour visiteur
+            pause_callback: Fonction de callback pour animer les transitions
+            zone: Zone de stationnement préférée
+            horodatage: Instant d'entrée enregistré (time.time() par défaut)
+            plaque: Plaque lue (contrôlée par le registre s'il y en a un)
+            
+        Returns:
+            L'index de la place attribuée, ou None si l'entrée est refusée
+        """
+        etapes = self.etapes_entree(est_abonne, zone, horodatage, plaque)
+        while True:
+            try:
+                next(etapes)
+            except StopIteration as fin:
+                return fin.value
+            if pause_callback:
+                pause_callback()
 
     def gerer_sortie(self, est_abonne: bool = False, 
                      pause_callback: Optional[Callable] = None, 
-                     montant: float = 15.0) -> None:
+                     montant: float = 15.0,
+                     place: Optional[int] = None,
+                     horodatage: Optional[float] = None) -> None:
         """
         Gère la sortie d'un véhicule du parking.
         
@@ -146,32 +758,14 @@ class ParkingSystem:
             est_abonne: True si le véhicule est un abonné, False pour visiteur
             pause_callback: Fonction de callback pour animer les transitions
             montant: Montant à payer (ignoré pour les abonnés)
-        """
-        print(f"\n--- SORTIE (Abonné: {est_abonne}) ---")
-        
-        self.automate.etat_courant = self.automate.list_etats[4]
-        
-        self.automate.transition("demande_sortie")
-        if pause_callback:
-            pause_callback()
-        
-        if est_abonne:
-            self.automate.transition("abonne_gratuit")
-            print(">> Gratuit (Abonné)")
-            if pause_callback:
-                pause_callback()
-        else:
-            self.automate.transition("paiement_requis")
-            print(f">> Paiement requis ({montant:.2f} DH)...")
-            if pause_callback:
-                pause_callback()
+            place: Place libérée (une place garée quelconque si None)
+            horodatage: Instant de sortie enregistré (time.time() par défaut)
             
-            self.recettes_totales += montant
-            
-            self.automate.transition("paiement_valide")
-            print(">> Paiement accepté")
+        Raises:
+            ValueError: Si la place n'est pas garée, si sa sortie est déjà en
+                cours ou si aucun véhicule n'est garé (rien n'est alors
+                encaissé ni modifié)
+        """
+        for _ in self.etapes_sortie(est_abonne, montant, place, horodatage):
             if pause_callback:
                 pause_callback()
-            
-        self.automate.transition("vehicule_sorti")
-        self.places_libres += 1
@@ -0,0 +1,230 @@
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from evenements import ConsoleSink, EvenementSink
+
+
+TYPES_LIGNES = ("ABONNE", "NOIRE")  # Types reconnus par charger_fichier
+
+
+def normaliser_plaque(plaque: str) -> str:
+    """Forme canonique d'une plaque : majuscules, sans séparateurs ("ab-123 cd" -> "AB123CD")."""
+    if plaque.isalnum():
+        return plaque.upper()
+    # Chaîne de replace : plusieurs fois plus rapide que str.translate sur des chaînes courtes
+    return (plaque.upper().replace(" ", "").replace("-", "").replace(".", "")
+            .replace("_", "").replace("/", "").replace("\t", ""))
+
+
+class FiltreBloom:
+    """
+    Filtre de Bloom : appartenance approchée, sans faux négatif.
+
+    Les k positions sont obtenues par double hachage (h1 + i * h2) à partir du
+    hash() de la chaîne, que Python calcule une fois et garde en cache dans
+    l'objet. Ce hash varie d'un processus à l'autre : le filtre est reconstruit
+    à chaque chargement et n'est jamais sérialisé.
+
+    Attributes:
+        nb_bits: Taille du tableau de bits
+        nb_hachages: Nombre de positions testées par élément
+        bits: Tableau de bits
+    """
+
+    def __init__(self, capacite: int, taux_faux_positifs: float = 0.01) -> None:
+        capacite = max(capacite, 1)
+        self.nb_bits = max(64, int(-capacite * math.log(taux_faux_positifs) / math.log(2) ** 2))
+        self.nb_hachages = max(1, round(-math.log2(taux_faux_positifs)))
+        self.bits = bytearray((self.nb_bits + 7) // 8)
+
+    def _positions(self, cle: str) -> List[int]:
+        h = hash(cle) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        nb_bits = self.nb_bits
+        return [(h1 + i * h2) % nb_bits for i in range(self.nb_hachages)]
+
+    def ajouter(self, cle: str) -> None:
+        """Ajoute une clé au filtre."""
+        for position in self._positions(cle):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, cle: str) -> bool:
+        bits = self.bits
+        h = hash(cle) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        nb_bits = self.nb_bits
+        for i in range(self.nb_hachages):  # Sortie au premier bit nul : ≈ 1 test pour une plaque absente
+            position = (h1 + i * h2) % nb_bits
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class Decision(NamedTuple):
+    """Résultat d'un contrôle d'accès."""
+    autorise: bool
+    est_abonne: bool
+    motif: str
+
+
+class _Index:
+    """Structures de recherche d'une version du registre (jamais modifiées après construction)."""
+
+    def __init__(self, abonnes: Dict[str, float], liste_noire: List[str], version: int,
+                 confirmer: Optional[Callable[[str], bool]] = None) -> None:
+        self.abonnes = abonnes
+        self.filtre = FiltreBloom(len(liste_noire))
+        for plaque in liste_noire:
+            self.filtre.ajouter(plaque)
+        # Sans source externe, la confirmation exacte se fait sur un ensemble en mémoire
+        self.confirmer = confirmer if confirmer is not None else frozenset(liste_noire).__contains__
+        self.version = version
+
+    def est_interdite(self, cle: str) -> bool:
+        return cle in self.filtre and self.confirmer(cle)
+
+
+class RegistrePlaques:
+    """
+    Registre des abonnés et liste noire, indexés par plaque normalisée.
+
+    La recherche d'un abonné est une lecture de dictionnaire (O(1)). La liste
+    noire est précédée d'un filtre de Bloom (≈ 1,2 octet par plaque à 1 % de
+    faux positifs) : les plaques absentes de la liste, soit la quasi-totalité,
+    sont écartées sans consulter la liste exacte. Celle-ci peut donc rester
+    hors mémoire (fonction `confirmer`, par exemple une requête SQLite) ;
+    sinon elle est gardée dans un frozenset.
+
+    Le rechargement construit un nouvel index à part, puis le publie par une
+    seule affectation de référence : les barrières continuent de consulter
+    l'ancien index pendant la construction et ne sont jamais bloquées.
+
+    Attributes:
+        version: Numéro de l'index publié (incrémenté à chaque rechargement)
+        sink: Destination des événements de rechargement (console par défaut)
+    """
+
+    def __init__(self, abonnes: Optional[Dict[str, float]] = None,
+                 liste_noire: Iterable[str] = (),
+                 sink: Optional[EvenementSink] = None) -> None:
+        self.sink = sink if sink is not None else ConsoleSink()
+        self._index = _Index({}, [], 0)
+        self._verrou_chargement = threading.Lock()
+        self.charger(abonnes or {}, liste_noire)
+
+    @property
+    def version(self) -> int:
+        return self._index.version
+
+    def charger(self, abonnes: Dict[str, float], liste_noire: Iterable[str] = (),
+                confirmer: Optional[Callable[[str], bool]] = None) -> None:
+        """
+        Remplace le contenu du registre.
+
+        Args:
+            abonnes: {plaque: fin de validité de l'abonnement (math.inf si illimité)}
+            liste_noire: Plaques interdites d'accès
+            confirmer: Vérification exacte d'une plaque normalisée signalée par
+                le filtre de Bloom (None = ensemble en mémoire)
+        """
+        index = {normaliser_plaque(plaque): fin for plaque, fin in abonnes.items()}
+        noire = [normaliser_plaque(plaque) for plaque in liste_noire]
+        with self._verrou_chargement:
+            self._index = _Index(index, noire, self._index.version + 1, confirmer)
+
+    def charger_fichier(self, chemin: str) -> None:
+        """
+        Recharge le registre depuis un fichier texte, une plaque par ligne :
+            AB-123-CD;ABONNE[;fin_de_validite]
+            XY-999-ZZ;NOIRE
+        Les lignes vides et celles commençant par # sont ignorées. Le fichier
+        est entièrement validé avant publication : en cas d'erreur, l'index
+        en service est conservé.
+
+        Raises:
+            ValueError: Ligne mal formée ou type inconnu (avec le numéro de ligne)
+        """
+        abonnes: Dict[str, float] = {}
+        liste_noire = []
+        with open(chemin, encoding="utf-8") as fichier:
+            for numero, ligne in enumerate(fichier, start=1):
+                ligne = ligne.strip()
+                if not ligne or ligne.startswith("#"):
+                    continue
+                champs = [champ.strip() for champ in ligne.split(";")]
+                type_ligne = champs[1] if len(champs) > 1 else None
+                if type_ligne not in TYPES_LIGNES:
+                    raise ValueError(f"{chemin}, ligne {numero} : type {type_ligne!r} inconnu "
+                                     f"({' ou '.join(TYPES_LIGNES)} attendu)")
+                if not champs[0] or len(champs) > (3 if type_ligne == "ABONNE" else 2):
+                    raise ValueError(f"{chemin}, ligne {numero} : ligne mal formée : {ligne!r}")
+                if type_ligne == "NOIRE":
+                    liste_noire.append(champs[0])
+                    continue
+                try:
+                    abonnes[champs[0]] = float(champs[2]) if len(champs) > 2 else math.inf
+                except ValueError:
+                    raise ValueError(f"{chemin}, ligne {numero} : fin de validité "
+                                     f"{champs[2]!r} invalide") from None
+        self.charger(abonnes, liste_noire)
+
+    def recharger_en_arriere_plan(self, chemin: str) -> threading.Thread:
+        """
+        Lance charger_fichier dans un thread et le retourne (pour join éventuel).
+
+        Le résultat est signalé au sink (catégorie "registre") ; en cas
+        d'échec, l'index en service est conservé.
+        """
+        thread = threading.Thread(target=self._recharger, args=(chemin,), daemon=True)
+        thread.start()
+        return thread
+
+    def _recharger(self, chemin: str) -> None:
+        """Corps du thread de rechargement : charge le fichier et signale l'issue."""
+        try:
+            self.charger_fichier(chemin)
+        except (OSError, ValueError) as erreur:
+            self.sink.emettre("registre", "[Registre] Rechargement impossible, version {version} "
+                              "conservée : {erreur}", version=self.version, erreur=str(erreur), ok=False)
+            return
+        self.sink.emettre("registre", "[Registre] Version {version} chargée : {abonnes} abonnés.",
+                          version=self.version, abonnes=len(self), ok=True)
+
+    def octets_filtre(self) -> int:
+        """Taille (octets) du filtre de Bloom de la liste noire publiée."""
+        return len(self._index.filtre.bits)
+
+    def est_abonne(self, plaque: str, maintenant: float = 0.0) -> bool:
+        """Indique si la plaque a un abonnement valide à l'instant `maintenant`."""
+        return self._index.abonnes.get(normaliser_plaque(plaque), -math.inf) > maintenant
+
+    def est_interdite(self, plaque: str) -> bool:
+        """Indique si la plaque est sur la liste noire."""
+        return self._index.est_interdite(normaliser_plaque(plaque))
+
+    def verifier(self, plaque: str, maintenant: float = 0.0) -> Decision:
+        """
+        Contrôle d'accès d'un véhicule.
+
+        Args:
+            plaque: Plaque lue (forme libre)
+            maintenant: Instant du contrôle (pour la validité des abonnements)
+
+        Returns:
+            Decision(autorise, est_abonne, motif) ; une plaque inconnue entre
+            comme visiteur
+        """
+        index = self._index  # Une seule lecture : cohérent même pendant un rechargement
+        cle = normaliser_plaque(plaque)
+        if index.est_interdite(cle):
+            return Decision(False, False, "liste_noire")
+        fin = index.abonnes.get(cle)
+        if fin is None:
+            return Decision(True, False, "visiteur")
+        if fin <= maintenant:
+            return Decision(True, False, "abonnement_expire")
+        return Decision(True, True, "abonne")
+
+    def __len__(self) -> int:
+        return len(self._index.abonnes)
@@ -0,0 +1,264 @@
+"""
+Service réseau local (TCP, JSON Lines) exposant un ParkingSystem.
+
+Protocole : une requête JSON par ligne, une réponse JSON par ligne, dans
+l'ordre des requêtes de la connexion (pipelining autorisé).
+    {"id": 1, "op": "entree", "abonne": false}        -> {"id": 1, "ok": true, "place": 3}
+    {"id": 2, "op": "sortie", "place": 3}             -> {"id": 2, "ok": true, "montant": 2.5}
+    {"id": 3, "op": "statut"}                         -> {"id": 3, "ok": true, "statut": {...}}
+
+Usage:
+    python serveur.py --port 8765 --places 2000 [--automate automate_recharge.toml]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from evenements import NullSink
+from parking_system import ParkingSystem
+
+
+PORT_DEFAULT = 8765
+TAILLE_FILE_DEFAULT = 1024        # Requêtes en attente du cœur, toutes connexions confondues
+TAILLE_LOT_DEFAULT = 64           # Requêtes traitées par le cœur en une fois
+PROFONDEUR_PIPELINE_DEFAULT = 128  # Réponses en attente par connexion
+LIGNE_TROP_LONGUE = {"ok": False, "erreur": "Requête trop longue"}
+
+
+def _champ(requete: Dict[str, Any], nom: str, types: Tuple[type, ...], defaut: Any = None) -> Any:
+    """
+    Lit un paramètre de requête en vérifiant son type JSON.
+
+    Args:
+        requete: Requête décodée
+        nom: Nom du paramètre
+        types: Types acceptés (bool n'est jamais accepté comme nombre)
+        defaut: Valeur si le paramètre est absent ou null
+
+    Raises:
+        ValueError: Si la valeur n'a pas l'un des types acceptés
+    """
+    valeur = requete.get(nom)
+    if valeur is None:
+        return defaut
+    if not isinstance(valeur, types) or (isinstance(valeur, bool) and bool not in types):
+        raise ValueError(f"Paramètre {nom} invalide : {valeur!r}")
+    return valeur
+
+
+class ServeurParking:
+    """
+    Serveur asyncio : connexions persistantes, pipelining, micro-lots et contre-pression.
+
+    Chaque connexion a une tâche de lecture et une tâche d'écriture. La
+    lecture dépose (requête, future) dans une file bornée commune ; le cœur
+    la vide par lots de taille_lot et traite chaque lot d'un seul tenant,
+    sans rendre la main à la boucle. L'écriture renvoie les réponses dans
+    l'ordre, en attendant le vidage du tampon TCP (drain).
+
+    Contre-pression : quand la file commune ou la file de réponses d'une
+    connexion est pleine, la lecture de cette connexion s'interrompt ; le
+    tampon de réception TCP se remplit et le client est ralenti par le noyau.
+
+    Attributes:
+        parking: Système servi
+        hote: Adresse d'écoute
+        port: Port d'écoute (0 = choisi par le système)
+        taille_lot: Nombre maximal de requêtes traitées par lot
+        file: File bornée des requêtes en attente du cœur
+        profondeur_pipeline: Nombre maximal de réponses en attente par connexion
+        lots_traites: Nombre de lots traités
+        requetes_traitees: Nombre de requêtes traitées
+    """
+
+    def __init__(self, parking: ParkingSystem, hote: str = "127.0.0.1", port: int = PORT_DEFAULT,
+                 taille_file: int = TAILLE_FILE_DEFAULT, taille_lot: int = TAILLE_LOT_DEFAULT,
+                 profondeur_pipeline: int = PROFONDEUR_PIPELINE_DEFAULT) -> None:
+        self.parking = parking
+        self.hote = hote
+        self.port = port
+        self.taille_lot = taille_lot
+        self.taille_file = taille_file
+        self.profondeur_pipeline = profondeur_pipeline
+        self.file: Optional[asyncio.Queue] = None
+        self.lots_traites = 0
+        self.requetes_traitees = 0
+        self._serveur: Optional[asyncio.AbstractServer] = None
+        self._coeur: Optional[asyncio.Task] = None
+
+    async def demarrer(self) -> int:
+        """
+        Ouvre le port d'écoute et lance la tâche de traitement.
+
+        Returns:
+            Le port effectivement ouvert
+        """
+        self.file = asyncio.Queue(self.taille_file)
+        self._coeur = asyncio.ensure_future(self._traiter_lots())
+        self._serveur = await asyncio.start_server(self._connexion, self.hote, self.port)
+        self.port = self._serveur.sockets[0].getsockname()[1]
+        return self.port
+
+    async def arreter(self) -> None:
+        """Ferme le port d'écoute et arrête la tâche de traitement."""
+        self._serveur.close()
+        await self._serveur.wait_closed()
+        self._coeur.cancel()
+        await asyncio.gather(self._coeur, return_exceptions=True)
+
+    def traiter(self, requete: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Exécute une requête sur le cœur (synchrone).
+
+        Args:
+            requete: Requête décodée ({"op": ..., paramètres})
+
+        Returns:
+            La réponse, sans l'identifiant
+
+        Raises:
+            ValueError: Si un paramètre n'a pas le type attendu
+        """
+        op = requete.get("op")
+        parking = self.parking
+        if op == "entree":
+            place = parking.gerer_entree(est_abonne=_champ(requete, "abonne", (bool,), False),
+                                         zone=_champ(requete, "zone", (int,)))
+            return {"ok": place is not None, "place": place}
+        if op == "sortie":
+            place = _champ(requete, "place", (int,))
+            # Une place réservée par une entrée en cours n'est pas garée : seule l'occupation fait foi
+            if place is None or not 0 <= place < parking.places_totales \
+                    or not parking.occupation.est_occupee(place):
+                return {"ok": False, "erreur": f"Place {place} non occupée."}
+            abonne = parking.occupation.type_client(place) == "ABONNE"
+            montant = _champ(requete, "montant", (int, float))
+            if montant is None:
+                entree = parking.occupation.heure_entree(place)
+                montant = parking.calculer_montant(time.time() - entree, abonne) if entree is not None else 0.0
+            parking.gerer_sortie(est_abonne=abonne, montant=montant, place=place)
+            return {"ok": True, "montant": 0.0 if abonne else montant}
+        if op == "statut":
+            return {"ok": True, "statut": parking.get_status()}
+        return {"ok": False, "erreur": f"Opération inconnue : {op}"}
+
+    async def _traiter_lots(self) -> None:
+        """Vide la file par lots et répond à chaque requête."""
+        file = self.file
+        while True:
+            lot: List[Tuple[Dict[str, Any], asyncio.Future]] = [await file.get()]
+            while len(lot) < self.taille_lot and not file.empty():
+                lot.append(file.get_nowait())
+            for requete, future in lot:
+                try:
+                    reponse = self.traiter(requete)
+                except Exception as erreur:  # Une requête invalide ne doit pas arrêter le service
+                    reponse = {"ok": False, "erreur": str(erreur)}
+                if not future.cancelled():
+                    future.set_result(reponse)
+            self.lots_traites += 1
+            self.requetes_traitees += len(lot)
+
+    async def _connexion(self, lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter) -> None:
+        """Sert une connexion persistante jusqu'à sa fermeture par le client."""
+        reponses: asyncio.Queue = asyncio.Queue(self.profondeur_pipeline)
+        envoi = asyncio.ensure_future(self._envoyer(reponses, ecrivain))
+        boucle = asyncio.get_running_loop()
+        try:
+            while True:
+                ligne = await self._lire_ligne(lecteur)
+                if ligne is None:  # Au-delà de la limite du flux : refusée, la connexion reste servie
+                    future = boucle.create_future()
+                    future.set_result(dict(LIGNE_TROP_LONGUE))
+                    await reponses.put((None, future))
+                    continue
+                if not ligne:
+                    break
+                try:
+                    requete = json.loads(ligne)
+                except json.JSONDecodeError:
+                    requete = None
+                if not isinstance(requete, dict):  # JSON invalide, ou valeur qui n'est pas un objet
+                    future = boucle.create_future()
+                    future.set_result({"ok": False, "erreur": "JSON invalide (objet attendu)"})
+                    await reponses.put((None, future))
+                    continue
+                future = boucle.create_future()
+                await reponses.put((requete.get("id"), future))  # Bloque si le client ne lit plus
+                await self.file.put((requete, future))          # Bloque si le cœur est saturé
+        except ConnectionError:
+            pass
+        finally:
+            await reponses.put(None)
+            await asyncio.gather(envoi, return_exceptions=True)
+            ecrivain.close()
+
+    @staticmethod
+    async def _lire_ligne(lecteur: asyncio.StreamReader) -> Optional[bytes]:
+        """
+        Lit la ligne suivante (b"" en fin de flux).
+
+        Contrairement à readline, une ligne plus longue que la limite du flux
+        est lue et jetée jusqu'à sa fin ; la lecture reprend à la ligne suivante.
+
+        Returns:
+            La ligne, b"" en fin de flux, ou None si la ligne était trop longue
+        """
+        trop_longue = False
+        while True:
+            try:
+                ligne = await lecteur.readuntil(b"\n")
+            except asyncio.IncompleteReadError as fin:
+                ligne = fin.partial  # Dernière ligne sans fin de ligne, ou fin du flux
+            except asyncio.LimitOverrunError as depassement:
+                await lecteur.readexactly(depassement.consumed)  # Jette ce qui dépasse, sans le garder
+                trop_longue = True
+                continue
+            return None if trop_longue else ligne
+
+    @staticmethod
+    async def _envoyer(reponses: asyncio.Queue, ecrivain: asyncio.StreamWriter) -> None:
+        """Écrit les réponses d'une connexion dans l'ordre des requêtes."""
+        coupee = False
+        while True:
+            element = await reponses.get()
+            if element is None:
+                return
+            id_requete, future = element
+            reponse = await future
+            if coupee:
+                continue  # Client parti : on consomme la file pour ne pas bloquer la lecture
+            reponse["id"] = id_requete
+            ecrivain.write(json.dumps(reponse).encode() + b"\n")
+            try:
+                await ecrivain.drain()  # Immédiat tant que le tampon d'envoi est sous son seuil haut
+            except ConnectionError:
+                coupee = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Service TCP (JSON Lines) du parking.")
+    parser.add_argument("--hote", default="127.0.0.1", help="Adresse d'écoute")
+    parser.add_argument("--port", type=int, default=PORT_DEFAULT, help="Port d'écoute")
+    parser.add_argument("--places", type=int, default=2000, help="Nombre de places")
+    parser.add_argument("--lot", type=int, default=TAILLE_LOT_DEFAULT, help="Taille maximale des lots")
+    parser.add_argument("--automate", help="Définition d'automate du site (.toml ou .json)")
+    args = parser.parse_args()
+
+    async def servir() -> None:
+        parking = ParkingSystem(places_totales=args.places, sink=NullSink(), definition=args.automate)
+        serveur = ServeurParking(parking, args.hote, args.port, taille_lot=args.lot)
+        port = await serveur.demarrer()
+        print(f"Service du parking sur {args.hote}:{port}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(servir())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
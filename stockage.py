@@ -0,0 +1,117 @@
+import sqlite3
+import threading
+from typing import List, Optional, Tuple
+
+from occupation import CODES_TYPES
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    place INTEGER NOT NULL,
+    client INTEGER NOT NULL,
+    entree REAL NOT NULL,
+    sortie REAL NOT NULL,
+    montant REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_sortie ON sessions (sortie, montant, entree);
+CREATE INDEX IF NOT EXISTS idx_sessions_entree ON sessions (entree);
+CREATE INDEX IF NOT EXISTS idx_sessions_place ON sessions (place, sortie);
+"""
+
+SQL_INSERER = "INSERT INTO sessions (place, client, entree, sortie, montant) VALUES (?, ?, ?, ?, ?)"
+SQL_RECETTES = "SELECT COALESCE(SUM(montant), 0.0), COUNT(*) FROM sessions WHERE sortie >= ? AND sortie < ?"
+SQL_DUREE_MOYENNE = "SELECT AVG(sortie - entree) FROM sessions WHERE sortie >= ? AND sortie < ?"
+SQL_SESSIONS_PLACE = ("SELECT client, entree, sortie, montant FROM sessions "
+                      "WHERE place = ? AND sortie >= ? AND sortie < ? ORDER BY sortie")
+
+
+class StockageSessions:
+    """
+    Historique des sessions de stationnement dans SQLite (mode WAL).
+
+    Le chemin de sortie ne fait qu'ajouter un tuple à un lot en mémoire ; le
+    lot est inséré en une transaction (executemany) dès qu'il atteint
+    taille_lot, ou avant toute requête de rapport. Les requêtes utilisent des
+    textes SQL constants (mis en cache par sqlite3 comme instructions
+    préparées) et s'appuient sur les index par instant de sortie (couvrant
+    pour les rapports de recettes et de durée), d'entrée et par place.
+
+    Attributes:
+        chemin: Fichier de la base (":memory:" pour une base temporaire)
+        taille_lot: Nombre de sessions insérées par transaction
+        connexion: Connexion SQLite réutilisée pour toutes les opérations, partagée
+            entre threads sous la protection d'un verrou interne
+    """
+
+    def __init__(self, chemin: str = ":memory:", taille_lot: int = 500) -> None:
+        self.chemin = chemin
+        self.taille_lot = taille_lot
+        self.connexion = sqlite3.connect(chemin, check_same_thread=False)
+        self.connexion.execute("PRAGMA journal_mode=WAL")
+        self.connexion.execute("PRAGMA synchronous=NORMAL")
+        self.connexion.executescript(SCHEMA)
+        self._lot: List[Tuple[int, int, float, float, float]] = []
+        self._verrou = threading.RLock()
+
+    def enregistrer(self, place: int, type_client: str, entree: float, sortie: float,
+                    montant: float) -> None:
+        """
+        Ajoute une session terminée au lot en cours.
+
+        Args:
+            place: Index de la place occupée
+            type_client: "VISITEUR" ou "ABONNE"
+            entree: Instant d'entrée
+            sortie: Instant de sortie
+            montant: Montant payé
+        """
+        with self._verrou:
+            self._lot.append((place, CODES_TYPES[type_client], entree, sortie, montant))
+            if len(self._lot) >= self.taille_lot:
+                self.valider()
+
+    def valider(self) -> None:
+        """Insère le lot en attente en une seule transaction."""
+        with self._verrou:
+            if not self._lot:
+                return
+            with self.connexion:
+                self.connexion.executemany(SQL_INSERER, self._lot)
+            self._lot.clear()
+
+    def recettes(self, debut: float = float("-inf"), fin: float = float("inf")) -> Tuple[float, int]:
+        """
+        Recettes des sessions terminées dans [debut, fin).
+
+        Returns:
+            (montant total, nombre de sessions)
+        """
+        with self._verrou:
+            self.valider()
+            total, nombre = self.connexion.execute(SQL_RECETTES, (debut, fin)).fetchone()
+        return total, nombre
+
+    def duree_moyenne(self, debut: float = float("-inf"), fin: float = float("inf")) -> Optional[float]:
+        """Durée moyenne de stationnement des sessions terminées dans [debut, fin), ou None."""
+        with self._verrou:
+            self.valider()
+            return self.connexion.execute(SQL_DUREE_MOYENNE, (debut, fin)).fetchone()[0]
+
+    def sessions_place(self, place: int, debut: float = float("-inf"),
+                       fin: float = float("inf")) -> List[Tuple[int, float, float, float]]:
+        """
+        Historique d'une place.
+
+        Returns:
+            Liste de (code client, entrée, sortie, montant), par sortie croissante
+        """
+        with self._verrou:
+            self.valider()
+            return self.connexion.execute(SQL_SESSIONS_PLACE, (place, debut, fin)).fetchall()
+
+    def fermer(self) -> None:
+        """Insère le lot en attente et ferme la connexion."""
+        with self._verrou:
+            self.valider()
+            self.connexion.close()
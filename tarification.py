@@ -0,0 +1,213 @@
+import math
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Optional, Sequence, Tuple
+
+from dependances import numpy_optionnel
+from occupation import CODE_ABONNE
+
+
+SECONDES_PAR_HEURE = 3600.0
+SECONDES_PAR_JOUR = 86400.0
+
+
+class GrilleTarifaire:
+    """
+    Règles de tarification des sorties.
+
+    Pour une durée x (en heures, dans la journée entamée) :
+        montant(x) = forfait + prix du premier palier dont la borne >= x
+                     + tarif_horaire * heures au-delà de la dernière borne
+    Sans paliers, c'est un tarif horaire pur (forfait + tarif_horaire * x).
+    Avec un plafond journalier, chaque journée complète coûte le plafond et
+    la journée entamée est plafonnée. Les abonnés ne paient rien si
+    abonnes_gratuits est vrai.
+
+    Attributes:
+        tarif_horaire: Prix par heure (au-delà du dernier palier)
+        forfait: Montant fixe facturé à chaque sortie visiteur
+        paliers: Liste triée de (borne en heures, prix)
+        plafond_journalier: Montant maximal par tranche de 24 h (None = sans plafond)
+        abonnes_gratuits: True si les abonnés sortent gratuitement
+        version: Numéro de version des règles, incrémenté à chaque modification
+    """
+
+    def __init__(self, tarif_horaire: float = 2.5, forfait: float = 0.0,
+                 paliers: Sequence[Tuple[float, float]] = (),
+                 plafond_journalier: Optional[float] = None,
+                 abonnes_gratuits: bool = True) -> None:
+        self.tarif_horaire = tarif_horaire
+        self.forfait = forfait
+        self.paliers = sorted(paliers)
+        self.plafond_journalier = plafond_journalier
+        self.abonnes_gratuits = abonnes_gratuits
+        self._bornes = [borne for borne, _ in self.paliers]
+        self._prix = [prix for _, prix in self.paliers]
+        self.version = 0
+
+    def modifier(self, **regles: Any) -> None:
+        """
+        Change une ou plusieurs règles et incrémente la version.
+        
+        Args:
+            **regles: Nouveaux attributs (tarif_horaire, forfait, paliers,
+                plafond_journalier, abonnes_gratuits)
+        
+        Raises:
+            AttributeError: Si une règle est inconnue
+        """
+        for nom, valeur in regles.items():
+            if nom not in ("tarif_horaire", "forfait", "paliers", "plafond_journalier", "abonnes_gratuits"):
+                raise AttributeError(f"Règle tarifaire inconnue : {nom}")
+            setattr(self, nom, sorted(valeur) if nom == "paliers" else valeur)
+        self._bornes = [borne for borne, _ in self.paliers]
+        self._prix = [prix for _, prix in self.paliers]
+        self.version += 1
+
+    def _montant_journee(self, heures: float) -> float:
+        """Montant non plafonné pour une durée en heures."""
+        montant = self.forfait
+        if self.paliers:
+            i = bisect_left(self._bornes, heures)
+            if i < len(self._bornes):
+                return montant + self._prix[i]
+            montant += self._prix[-1]
+            heures -= self._bornes[-1]
+        return montant + self.tarif_horaire * heures
+
+    def calculer(self, duree: float, est_abonne: bool = False) -> float:
+        """
+        Calcule le montant d'une sortie.
+
+        Args:
+            duree: Durée de stationnement (secondes)
+            est_abonne: True si le client est abonné
+
+        Returns:
+            Le montant à payer
+        """
+        if est_abonne and self.abonnes_gratuits:
+            return 0.0
+        if self.plafond_journalier is None:
+            return self._montant_journee(duree / SECONDES_PAR_HEURE)
+        jours, reste = divmod(duree, SECONDES_PAR_JOUR)
+        return (jours * self.plafond_journalier
+                + min(self._montant_journee(reste / SECONDES_PAR_HEURE), self.plafond_journalier))
+
+    def calculer_lot(self, durees: Sequence[float], types: Sequence[int]) -> array:
+        """
+        Calcule les montants d'un lot de sorties en un seul appel.
+
+        Utilise NumPy s'il est installé, sinon une boucle sur les tableaux.
+
+        Args:
+            durees: Durées de stationnement (secondes)
+            types: Codes de type de client (voir occupation.CODES_TYPES)
+
+        Returns:
+            Les montants, dans l'ordre des entrées (array de float64)
+        """
+        np = numpy_optionnel()
+        if np is not None:
+            montants = array("d")
+            montants.frombytes(self._calculer_numpy(np, durees, types).tobytes())
+            return montants
+
+        gratuit = CODE_ABONNE if self.abonnes_gratuits else -1
+        calculer = self.calculer
+        return array("d", [0.0 if code == gratuit else calculer(duree)
+                           for duree, code in zip(durees, types)])
+
+    def _calculer_numpy(self, np: Any, durees: Sequence[float], types: Sequence[int]):
+        """Version vectorisée de calculer_lot (tableaux NumPy)."""
+        d = np.asarray(durees, dtype=np.float64)
+        codes = np.frombuffer(types, dtype=np.uint8) if isinstance(types, (bytes, bytearray)) \
+            else np.asarray(types)
+
+        if self.plafond_journalier is None:
+            heures = d / SECONDES_PAR_HEURE
+        else:
+            jours, reste = np.divmod(d, SECONDES_PAR_JOUR)
+            heures = reste / SECONDES_PAR_HEURE
+
+        montants = np.full_like(d, self.forfait)
+        if self.paliers:
+            bornes = np.asarray(self._bornes)
+            prix = np.asarray(self._prix)
+            i = np.searchsorted(bornes, heures, side="left")
+            dans_paliers = i < len(bornes)
+            montants += np.where(dans_paliers, prix[np.minimum(i, len(prix) - 1)], prix[-1])
+            montants += np.where(dans_paliers, 0.0, self.tarif_horaire * (heures - bornes[-1]))
+        else:
+            montants += self.tarif_horaire * heures
+
+        if self.plafond_journalier is not None:
+            montants = jours * self.plafond_journalier + np.minimum(montants, self.plafond_journalier)
+        if self.abonnes_gratuits:
+            montants[codes == CODE_ABONNE] = 0.0
+        return montants
+
+
+class CacheTarifs:
+    """
+    Cache LRU borné des montants, pour le chemin de sortie.
+
+    La durée est arrondie à la tranche facturable supérieure (pas_facturation),
+    si bien que la plupart des sorties retombent sur un petit nombre de clés
+    (version des règles, abonné ou non, tranche). Le cache se vide dès que la
+    version de la grille change.
+
+    Attributes:
+        grille: Grille tarifaire sous-jacente
+        taille_max: Nombre maximal de montants conservés
+        pas_facturation: Durée d'une tranche facturable (secondes)
+        hits: Nombre de montants servis depuis le cache
+        misses: Nombre de montants recalculés
+    """
+
+    def __init__(self, grille: GrilleTarifaire, taille_max: int = 4096,
+                 pas_facturation: float = 60.0) -> None:
+        self.grille = grille
+        self.taille_max = taille_max
+        self.pas_facturation = pas_facturation
+        self.hits = 0
+        self.misses = 0
+        self._montants: OrderedDict = OrderedDict()
+        self._version = grille.version
+
+    def montant(self, duree: float, est_abonne: bool = False) -> float:
+        """
+        Retourne le montant d'une sortie, facturée à la tranche entamée.
+
+        Args:
+            duree: Durée de stationnement (secondes)
+            est_abonne: True si le client est abonné
+
+        Returns:
+            Le montant à payer
+        """
+        if self._version != self.grille.version:
+            self.invalider()
+        tranche = math.ceil(duree / self.pas_facturation)
+        cle = (self._version, est_abonne, tranche)
+        montants = self._montants
+        if cle in montants:
+            montants.move_to_end(cle)
+            self.hits += 1
+            return montants[cle]
+
+        self.misses += 1
+        resultat = self.grille.calculer(tranche * self.pas_facturation, est_abonne)
+        montants[cle] = resultat
+        if len(montants) > self.taille_max:
+            montants.popitem(last=False)
+        return resultat
+
+    def invalider(self) -> None:
+        """Vide le cache (à appeler si les règles changent hors de GrilleTarifaire.modifier)."""
+        self._montants.clear()
+        self._version = self.grille.version
+
+    def __len__(self) -> int:
+        return len(self._montants)
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from allocation import AllocateurPlaces
+from evenements import NullSink, RingBufferSink
+from parking_system import ParkingSystem
+
+
+def test_plus_petit_index_dabord():
+    a = AllocateurPlaces(5)
+    assert [a.acquerir() for _ in range(3)] == [0, 1, 2]
+    a.liberer(1)
+    assert a.acquerir() == 1
+    assert a.acquerir() == 3
+
+def test_places_reservees_abonnes():
+    a = AllocateurPlaces(4, places_reservees=[0, 1])
+    assert a.acquerir(est_abonne=False) == 2
+    assert a.acquerir(est_abonne=True) == 0
+    assert a.acquerir(est_abonne=False) == 3
+    assert a.acquerir(est_abonne=False) is None # Restent des places, mais réservées
+    assert a.acquerir(est_abonne=True) == 1
+
+def test_affinite_zone():
+    a = AllocateurPlaces(6, zones=[0, 0, 1, 1, 2, 2])
+    assert a.acquerir(zone=2) == 4
+    assert a.acquerir(zone=2) == 5
+    assert a.acquerir(zone=2) == 0 # Zone pleine : repli sur la plus petite place
+
+def test_occupee_aleatoire():
+    a = AllocateurPlaces(100)
+    for _ in range(10):
+        a.acquerir()
+    a.liberer(3)
+    rng = random.Random(0)
+    tirages = {a.place_occupee_aleatoire(rng) for _ in range(200)}
+    assert tirages == set(range(10)) - {3}
+    tirages = {a.place_occupee_aleatoire(rng, exclues={0, 9}) for _ in range(200)}
+    assert tirages == set(range(1, 9)) - {3}
+    assert a.place_occupee_quelconque(exclues={9, 8}) == 7
+
+def test_parking_attribue_places():
+    p = ParkingSystem(places_totales=3, sink=NullSink())
+    assert p.gerer_entree() == 0
+    assert p.gerer_entree() == 1
+    p.gerer_sortie(place=0)
+    assert p.gerer_entree() == 0
+    assert p.gerer_entree() == 2
+    assert p.gerer_entree() is None
+
+def test_places_reservees_pas_complet():
+    sink = RingBufferSink()
+    p = ParkingSystem(places_totales=3, sink=sink,
+                      allocateur=AllocateurPlaces(3, places_reservees=[2]))
+    assert p.gerer_entree() == 0 and p.gerer_entree() == 1
+    assert p.gerer_entree() is None                 # Visiteur : reste la place d'abonné
+    assert p.places_libres == 1 and p.etat_affiche() != "COMPLET"
+    assert "parking_plein" not in [e.champs["evt"] for e in sink.evenements("transition")]
+    assert p.gerer_entree(est_abonne=True) == 2
+    assert p.etat_affiche() == "COMPLET" and p.label_courant == "COMPLET"
+
+def test_tailles_incoherentes():
+    with pytest.raises(ValueError, match="2 zones pour 3 places"):
+        AllocateurPlaces(3, zones=[0, 1])
+    with pytest.raises(ValueError, match="gère 4 places"):
+        ParkingSystem(places_totales=3, sink=NullSink(), allocateur=AllocateurPlaces(4))
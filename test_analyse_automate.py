@@ -0,0 +1,62 @@
+import random
+
+from analyse_automate import (analyser, classes_equivalence, etats_morts, minimiser,
+                              non_determinismes)
+from automate_base import Automate, Etat
+from evenements import NullSink
+from parking_system import ParkingSystem
+
+
+def test_automate_du_parking_deja_minimal():
+    automate = ParkingSystem(sink=NullSink()).automate
+    a = analyser(automate)
+    assert a.accessibles == a.coaccessibles == set(automate.list_etats)
+    assert not a.morts and not a.puits and not a.non_deterministes
+    assert a.nb_etats_minimal == len(automate.list_etats)
+
+def test_analyse_et_minimisation():
+    a = Automate(NullSink())
+    for etat in [Etat(0, "REPOS", "initial"), Etat(1, "A"), Etat(2, "A_BIS"), Etat(3, "FIN", "final"),
+                 Etat(4, "ORPHELIN"), Etat(5, "BLOQUE")]:
+        a.ajouter_etat(etat)
+    a.ajouter_transition(0, 1, "x")
+    a.ajouter_transition(0, 2, "y")
+    a.ajouter_transition(1, 3, "ok")   # A et A_BIS se comportent de la même façon
+    a.ajouter_transition(2, 3, "ok")
+    a.ajouter_transition(1, 5, "ko")
+    a.ajouter_transition(2, 5, "ko")
+    a.ajouter_transition(3, 0, "retour")
+    a.ajouter_transition(4, 0, "x")
+    a.ajouter_transition(0, 5, "x")    # Écrase 0 -x-> 1
+
+    assert non_determinismes(a) == [(0, "x", [1, 5])]
+    assert etats_morts(a) == {5}
+    assert classes_equivalence(a) == [[0], [2], [3], [5]]  # 1 n'est plus accessible
+
+    a.ajouter_transition(0, 1, "x")
+    assert classes_equivalence(a) == [[0], [1, 2], [3], [5]]
+    m = minimiser(a)
+    assert sorted(m.list_etats) == [0, 1, 3, 5]
+    assert m.list_etats[0].transitions == {"x": 1, "y": 1}
+    assert m.etat_courant.id_etat == 0
+
+    # Même comportement sur des suites aléatoires
+    rng = random.Random(3)
+    c, cm = a.compiler(), m.compiler()
+    evenements = ["x", "y", "ok", "ko", "retour"]
+    for _ in range(200):
+        evt = rng.choice(evenements)
+        ok = evt in c.codes_evenements and c.transition(c.code_evenement(evt))
+        assert ok == (evt in cm.codes_evenements and cm.transition(cm.code_evenement(evt)))
+
+def test_minimisation_grand_automate():
+    # Compteur modulo 30000 dont seul le reste modulo 3 est observable
+    n = 30_000
+    a = Automate(NullSink())
+    for i in range(n):
+        a.ajouter_etat(Etat(i, f"E{i}", "initial" if i == 0 else ("final" if i % 3 == 1 else "normal")))
+    for i in range(n):
+        a.ajouter_transition(i, (i + 1) % n, "tic")
+    m = minimiser(a)
+    assert len(m.list_etats) == 3
+    assert [m.list_etats[i].transitions["tic"] for i in (0, 1, 2)] == [1, 2, 0]
@@ -0,0 +1,42 @@
+from analytique import Analytique, SerieCirculaire
+from evenements import NullSink
+from parking_system import ParkingSystem
+
+
+def test_cases_recyclees():
+    s = SerieCirculaire(pas=60.0, nb_cases=3)
+    s.arrivee(10.0, 1)
+    s.arrivee(70.0, 2)
+    s.depart(200.0, 1, 4.0, 190.0)  # Intervalle 3 : réutilise la case de l'intervalle 0
+    serie = s.serie(200.0, 5)
+    assert len(serie) == 3
+    assert [i["arrivees"] for i in serie] == [1, 0, 0]
+    assert serie[1]["occupation"] == 2  # Intervalle vide : occupation reportée
+    assert serie[2]["recettes"] == 4.0 and serie[2]["sejour_moyen"] == 190.0
+
+def test_evenements_tardifs():
+    s = SerieCirculaire(pas=60.0, nb_cases=3)
+    s.arrivee(200.0, 2)                  # Intervalle 3
+    s.depart(130.0, 1, 5.0, 60.0)        # Intervalle 2, en retard mais dans la fenêtre
+    s.arrivee(10.0, 9)                   # Intervalle 0 : hors fenêtre, ignoré
+    assert s.ignores == 1
+    serie = s.serie(200.0, 3)
+    assert [i["arrivees"] for i in serie] == [0, 0, 1]
+    assert serie[1]["recettes"] == 5.0 and serie[2]["occupation_max"] == 2
+
+def test_parking_alimente_analytique():
+    p = ParkingSystem(places_totales=5, sink=NullSink(), analytique=Analytique())
+    a = p.gerer_entree(horodatage=0.0)
+    b = p.gerer_entree(est_abonne=True, horodatage=30.0)
+    p.gerer_sortie(montant=6.0, place=a, horodatage=3600.0)
+    heure = p.analytique.resume("heure", 2)
+    assert heure == {"arrivees": 2, "departs": 1, "recettes": 6.0, "sejour_moyen": 3600.0,
+                     "occupation_max": 2}
+    assert p.analytique.resume("minute", 1)["departs"] == 1
+
+    statut = p.get_status()
+    assert statut["visiteurs_presents"] == 0 and statut["abonnes_presents"] == 1
+    assert statut["visiteurs"] == 1  # Cumul inchangé
+    assert statut["recettes_heure"] == 6.0
+    p.gerer_sortie(est_abonne=True, place=b, horodatage=3700.0)
+    assert p.get_status()["abonnes_presents"] == 0
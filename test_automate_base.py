@@ -0,0 +1,90 @@
+import random
+from array import array
+
+import dependances
+from automate_base import Automate, AutomateCompile, BilanExecution, Etat
+
+
+def construire_automate():
+    a = Automate()
+    a.ajouter_etat(Etat(0, "A", "initial"))
+    a.ajouter_etat(Etat(1, "B"))
+    a.ajouter_etat(Etat(7, "C"))
+    a.ajouter_transition(0, 1, "x")
+    a.ajouter_transition(1, 7, "y")
+    a.ajouter_transition(7, 0, "x")
+    return a
+
+def test_compilation_table_dense():
+    c = construire_automate().compiler()
+    assert c.ids_etats == [0, 1, 7]
+    assert c.nb_evenements == 2
+    assert len(c.table) == 3 * 2
+    assert c.etat_initial == 0
+    # Pas de transition "y" depuis A
+    assert c.suivant(0, c.code_evenement("y")) == -1
+    # Codes hors plage : pas de lecture dans la ligne de l'état voisin
+    assert c.suivant(0, 3) == -1 and c.suivant(2, -1) == -1
+    assert not c.transition(3) and c.label_courant == "A"
+
+def test_compile_equivalent_dict_walk():
+    a = construire_automate()
+    c = a.compiler()
+    for evt in ["x", "x", "y", "y", "x", "x"]:
+        assert c.transition(c.code_evenement(evt)) == a.transition(evt)
+        assert c.label_courant == a.etat_courant.label_etat
+
+def test_version_suit_la_structure():
+    a = construire_automate()
+    version = a.version
+    a.transition("x")
+    assert a.version == version  # Une transition exécutée ne change pas la structure
+    a.ajouter_transition(0, 99, "z")  # Refusée : état inexistant
+    assert a.version == version
+    a.ajouter_etat(Etat(2, "D"))
+    a.ajouter_transition(7, 2, "z")
+    assert a.version == version + 2
+
+def test_execution_en_flux():
+    a = construire_automate()
+    evenements = (evt for evt in ["x", "x", "inconnu", "y", "y", "x"])  # A -> B bloque bloque -> C bloque -> A
+    bilan = a.executer(evenements)
+    assert bilan == BilanExecution(etat_final=0, acceptes=3, bloques=3, premier_rejet=1)
+    assert a.etat_courant.label_etat == "A"
+    c = a.compiler()
+    assert c.executer_codes(array("i", [c.code_evenement("x"), 5])) == BilanExecution(1, 1, 1, 1)
+    assert c.label_courant == "B"
+
+def test_execution_par_lot(monkeypatch):
+    c = construire_automate().compiler()
+    rng = random.Random(4)
+    sequences = [[rng.choice(["x", "y", "z"]) for _ in range(rng.randrange(12))] for _ in range(200)]
+    attendu = []
+    for suite in sequences:
+        c.etat_courant = c.etat_initial
+        attendu.append(c.executer(suite))
+    c.etat_courant = 2
+    assert list(c.executer_sequences(sequences, taille_lot=64)) == attendu
+    liste = AutomateCompile.depuis_table(c.ids_etats, c.labels, c.types, c.evenements,
+                                         list(c.table), c.etat_initial)  # Table en simple liste
+    codes = [[liste.codes_evenements.get(evt, -1) for evt in suite] for suite in sequences]
+    assert liste.executer_lot(codes) == attendu
+    monkeypatch.setattr(dependances, "_numpy", None)
+    assert list(c.executer_sequences(sequences, taille_lot=64)) == attendu
+    assert c.etat_courant == 2  # Les lots partent de l'état initial sans toucher l'état courant
+
+def test_execution_sans_etat_initial(monkeypatch):
+    a = Automate()
+    a.ajouter_etat(Etat(0, "A"))
+    a.ajouter_etat(Etat(1, "B"))
+    a.ajouter_transition(0, 1, "x")
+    a.ajouter_transition(1, 0, "y")
+    c = a.compiler()
+    assert c.etat_initial == c.etat_courant == -1
+    assert not c.transition(c.code_evenement("y"))
+    bloque = BilanExecution(etat_final=-1, acceptes=0, bloques=2, premier_rejet=0)
+    assert c.executer(["y", "x"]) == bloque
+    assert c.executer_lot([[1, 0], []]) == [bloque, BilanExecution(-1, 0, 0, -1)]
+    monkeypatch.setattr(dependances, "_numpy", None)
+    assert c.executer_lot([[1, 0]]) == [bloque]
+    assert a.executer(["y", "x"]) == bloque and a.etat_courant is None
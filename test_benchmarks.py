@@ -0,0 +1,28 @@
+import sys
+
+import pytest
+
+import benchmarks
+from benchmarks import _ecrire_mesures, _lire_mesures, comparer
+
+
+def test_comparer_sens_des_unites():
+    reference = {"debit": (1000.0, "evt/s"), "cout": (10.0, "ms"), "ancien": (1.0, "ms")}
+    assert comparer({"debit": (900.0, "evt/s"), "cout": (11.0, "ms")}, reference, 0.2) == []
+    regressions = comparer({"debit": (700.0, "evt/s"), "cout": (13.0, "ms"), "nouveau": (5.0, "ms")},
+                           reference, 0.2)
+    assert regressions == [("debit", 1000.0, 700.0), ("cout", 10.0, 13.0)]
+
+def test_aller_retour_json(tmp_path):
+    chemin = str(tmp_path / "mesures.json")
+    mesures = {"transition.compile": (5e6, "evt/s"), "stockage.rapport_mois": (4.5, "ms")}
+    _ecrire_mesures(chemin, mesures, rapide=True)
+    assert _lire_mesures(chemin) == (mesures, True)
+
+def test_reference_d_un_autre_mode_refusee(tmp_path, monkeypatch, capsys):
+    chemin = str(tmp_path / "reference.json")
+    _ecrire_mesures(chemin, {"transition.compile": (5e6, "evt/s")}, rapide=True)
+    monkeypatch.setattr(benchmarks, "executer_suite", lambda rapide, filtre: pytest.fail("suite lancée"))
+    monkeypatch.setattr(sys, "argv", ["benchmarks.py", "--reference", chemin])
+    assert benchmarks.main() == 2
+    assert "mode rapide" in capsys.readouterr().err
@@ -0,0 +1,107 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from evenements import NullSink, RingBufferSink
+from parking_system import ParkingSystem
+
+
+def _avec_commutation_rapide(fonction):
+    """Force des changements de thread fréquents pour faire apparaître les courses."""
+    intervalle = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        return fonction()
+    finally:
+        sys.setswitchinterval(intervalle)
+
+def test_derniere_place_attribuee_une_fois():
+    p = ParkingSystem(places_totales=100, sink=NullSink())
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        resultats = _avec_commutation_rapide(
+            lambda: list(pool.map(lambda i: p.gerer_entree(est_abonne=i % 4 == 0), range(800))))
+    places = [place for place in resultats if place is not None]
+    assert sorted(places) == list(range(100))
+    assert p.places_libres == 0
+    assert p.total_visiteurs + p.total_abonnes == 800
+    assert p.occupation.compter() == 100
+
+def test_entrees_sorties_concurrentes():
+    p = ParkingSystem(places_totales=20, sink=NullSink())
+    minimum = [p.places_libres]
+
+    def controleur(numero: int) -> float:
+        encaisse = 0.0
+        for i in range(300):
+            abonne = (numero + i) % 3 == 0
+            place = p.gerer_entree(est_abonne=abonne)
+            minimum[0] = min(minimum[0], p.places_libres)
+            if place is not None:
+                montant = float(i % 5)
+                p.gerer_sortie(est_abonne=abonne, montant=montant, place=place)
+                encaisse += 0.0 if abonne else montant
+        return encaisse
+
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        encaisse = _avec_commutation_rapide(lambda: sum(pool.map(controleur, range(12))))
+    assert minimum[0] >= 0
+    assert p.recettes_totales == encaisse  # Montants entiers : somme exacte
+    assert p.places_libres == 20 and p.allocateur.nb_occupees == 0
+    assert p.occupation.compter() == 0 and not p.sessions
+
+def test_sortie_invalide_sans_effet():
+    p = ParkingSystem(places_totales=3, sink=NullSink())
+    with pytest.raises(ValueError, match="Aucun véhicule"):
+        p.gerer_sortie(montant=5.0)
+    place = p.gerer_entree()
+    avant = (p.places_libres, p.recettes_totales, p.allocateur.nb_occupees, p.etat_persistant())
+    with pytest.raises(ValueError, match="non occupée"):
+        p.gerer_sortie(montant=5.0, place=place + 1)
+    with pytest.raises(ValueError, match="non occupée"):
+        p.liberer_place(place + 1)
+    assert (p.places_libres, p.recettes_totales, p.allocateur.nb_occupees, p.etat_persistant()) == avant
+    assert not p.sessions
+
+def test_sortie_ignore_les_entrees_en_cours():
+    p = ParkingSystem(places_totales=3, sink=NullSink())
+    garee = p.gerer_entree()
+    entree = p.etapes_entree()
+    next(entree)                                # Place 1 réservée, pas encore garée
+    p.gerer_sortie(montant=10.0)
+    assert not p.occupation.est_occupee(garee) and p.recettes_totales == 10.0
+    with pytest.raises(ValueError, match="Aucun véhicule"):
+        p.gerer_sortie(montant=10.0)
+    list(entree)
+    assert p.gerer_entree() == garee            # Pas de double attribution de la place 1
+    assert p.allocateur.nb_occupees == p.occupation.compter() == 2
+    assert p.recettes_totales == 10.0
+
+def test_sorties_entrelacees_sans_double_encaissement():
+    p = ParkingSystem(places_totales=3, sink=NullSink())
+    p.gerer_entree()
+    p.gerer_entree()
+    a, b, c = (p.etapes_sortie(montant=10.0) for _ in range(3))
+    next(a)
+    next(b)                                     # Prend l'autre place
+    with pytest.raises(ValueError, match="Aucun véhicule"):
+        next(c)                                 # Les deux places sont réclamées
+    list(a)
+    list(b)
+    assert p.recettes_totales == 20.0
+    assert p.places_libres == 3 and p.occupation.compter() == 0 and not p._sorties
+
+def test_etat_affiche_coherent_entre_controleurs():
+    sink = RingBufferSink(capacite=100_000)
+    p = ParkingSystem(places_totales=2, sink=sink)
+
+    def controleur(numero: int) -> None:
+        for _ in range(300):
+            place = p.gerer_entree()
+            if place is not None:
+                p.gerer_sortie(montant=1.0, place=place)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        _avec_commutation_rapide(lambda: list(pool.map(controleur, range(8))))
+    assert sink.evenements("bloque") == []  # Ni transition de session ni saturation refusée
+    assert p.label_courant == "DISPONIBLE" and not p.sessions
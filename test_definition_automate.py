@@ -0,0 +1,98 @@
+import json
+import os
+
+import pytest
+
+from definition_automate import (DefinitionInvalide, charger_automate, compiler_definition,
+                                 construire_automate, definition_depuis_automate, ouvrir_artefact,
+                                 valider_definition)
+from evenements import NullSink, RingBufferSink
+from parking_system import DEFINITION_PARKING, ParkingSystem
+
+def test_validation_releve_toutes_les_erreurs():
+    with pytest.raises(DefinitionInvalide) as exc:
+        valider_definition({
+            "etats": [{"id": 0, "label": "A", "type": "initial"}, {"id": 0, "label": "B"},
+                      {"id": 2, "label": "A", "type": "bizarre"}, {"id": 3, "label": "P", "type": "puits"}],
+            "transitions": [[0, 2, "x"], [0, 3, "x"], ["A", 7, "y"], [3, 0, "z"], [0, 2]],
+        })
+    erreurs = exc.value.erreurs
+    assert len(erreurs) == 7
+    assert "état 0 : ID en double" in erreurs
+    assert any("'x'" in e and "déjà défini" in e for e in erreurs)
+    assert any("7 inconnu" in e for e in erreurs)
+    with pytest.raises(DefinitionInvalide, match="un et un seul état initial"):
+        valider_definition({"etats": [{"id": 0, "label": "A"}], "transitions": []})
+
+def test_compilation_equivalente_a_l_automate():
+    automate = construire_automate(DEFINITION_PARKING, NullSink())
+    attendu = automate.compiler()
+    graphe = compiler_definition(DEFINITION_PARKING)
+    for id_etat, i in attendu.index_etats.items():
+        for evt, code in attendu.codes_evenements.items():
+            dst = attendu.suivant(i, code)
+            obtenu = graphe.suivant(graphe.index_etats[id_etat], graphe.codes_evenements[evt])
+            assert (dst < 0 and obtenu < 0) or graphe.ids_etats[obtenu] == attendu.ids_etats[dst]
+    assert compiler_definition(definition_depuis_automate(automate)).labels == graphe.labels
+
+def test_artefact_en_cache(tmp_path):
+    chemin = str(tmp_path / "parking.json")
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        json.dump(DEFINITION_PARKING, fichier)
+    cache = str(tmp_path / "cache")
+    graphe = charger_automate(chemin, cache)
+    assert isinstance(graphe.table, memoryview) and graphe.label_courant == "DISPONIBLE"
+    assert graphe.transition(graphe.code_evenement("detecter_entree"))
+    assert graphe.label_courant == "IDENTIFICATION"
+    artefacts = os.listdir(cache)
+    assert len(artefacts) == 1
+
+    charger_automate(chemin, cache)  # Même contenu : artefact réutilisé
+    assert os.listdir(cache) == artefacts
+    DEFINITION_PARKING_MODIFIEE = {**DEFINITION_PARKING,
+                                   "transitions": DEFINITION_PARKING["transitions"] + [[1, 0, "abandon"]]}
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        json.dump(DEFINITION_PARKING_MODIFIEE, fichier)
+    assert "abandon" in charger_automate(chemin, cache).codes_evenements
+    assert len(os.listdir(cache)) == 2
+
+def test_artefact_tronque_recompile(tmp_path):
+    chemin = str(tmp_path / "parking.json")
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        json.dump(DEFINITION_PARKING, fichier)
+    cache = str(tmp_path / "cache")
+    attendu = list(charger_automate(chemin, cache).table)
+    artefact = os.path.join(cache, os.listdir(cache)[0])
+    taille = os.path.getsize(artefact)
+    for longueur in (taille - 4, 10, 0):
+        with open(artefact, "r+b") as fichier:
+            fichier.truncate(longueur)
+        with pytest.raises(ValueError):
+            ouvrir_artefact(artefact)
+        assert list(charger_automate(chemin, cache).table) == attendu  # Recompilé et réécrit
+        assert os.path.getsize(artefact) == taille
+
+def test_parking_avec_definition_de_site(tmp_path):
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), "automate_recharge.toml")
+    chemin = str(tmp_path / "site.toml")
+    with open(source, "rb") as entree, open(chemin, "wb") as sortie:
+        sortie.write(entree.read())
+    sink = RingBufferSink()
+    parking = ParkingSystem(places_totales=2, sink=sink, definition=chemin)
+    assert "RECHARGE" in parking.graphe.labels
+
+    place = parking.gerer_entree()
+    session = parking.ouvrir_session(4)
+    assert parking.avancer_session(session, "branchement")
+    assert not sink.evenements("automate")  # Automate d'affichage pas encore construit
+    assert parking.automate.list_etats[8].transitions == {"fin_recharge": 4}
+    assert parking.automate.etat_courant.label_etat == parking.label_courant == "RECHARGE"
+    assert parking.avancer_session(session, "fin_recharge")
+    assert parking.automate.etat_courant.label_etat == "STATIONNEMENT"
+    parking.gerer_sortie(montant=2.5, place=place)
+    assert parking.recettes_totales == 2.5
+
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        fichier.write('etats = [{id = 0, label = "DISPONIBLE", type = "initial"}]\n')
+    with pytest.raises(DefinitionInvalide, match="état 4 requis"):
+        ParkingSystem(sink=NullSink(), definition=chemin)
@@ -0,0 +1,47 @@
+import json
+
+from evenements import Evenement, JsonlSink, NullSink, RingBufferSink
+from parking_system import ParkingSystem
+
+
+def test_formatage_paresseux():
+    class Compteur:
+        rendus = 0
+        def __format__(self, spec):
+            Compteur.rendus += 1
+            return "x"
+
+    sink = RingBufferSink(capacite=2)
+    sink.emettre("test", "{v}", v=Compteur())
+    assert Compteur.rendus == 0
+    assert sink.evenements()[0].texte() == "x"
+    assert Compteur.rendus == 1
+
+def test_ring_buffer_borne():
+    sink = RingBufferSink(capacite=3)
+    for i in range(10):
+        sink.emettre("test", "{i}", i=i)
+    assert [e.champs["i"] for e in sink.evenements()] == [7, 8, 9]
+
+def test_parking_sink_structure():
+    sink = RingBufferSink()
+    p = ParkingSystem(places_totales=2, sink=sink)
+    p.gerer_entree()
+    transitions = sink.evenements("transition")
+    assert [e.champs["evt"] for e in transitions][:2] == ["detecter_entree", "lire_plaque"]
+
+def test_null_sink_silencieux(capsys):
+    p = ParkingSystem(places_totales=2, sink=NullSink())
+    p.gerer_entree()
+    p.gerer_sortie()
+    assert capsys.readouterr().out == ""
+
+def test_jsonl_sink(tmp_path):
+    chemin = tmp_path / "evenements.jsonl"
+    sink = JsonlSink(str(chemin))
+    for i in range(1000):
+        sink.emettre("test", "n={i}", i=i)
+    sink.fermer()
+    lignes = chemin.read_text(encoding="utf-8").splitlines()
+    assert len(lignes) == 1000
+    assert json.loads(lignes[-1])["message"] == "n=999"
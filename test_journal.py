@@ -0,0 +1,106 @@
+import os
+import threading
+
+import pytest
+
+import journal as journal_module
+from evenements import NullSink
+from journal import NOM_JOURNAL, JournalEvenements
+from parking_system import ParkingSystem
+
+
+def _remplir(parking):
+    places = [parking.gerer_entree(est_abonne=i % 3 == 0, horodatage=float(i)) for i in range(5)]
+    parking.gerer_sortie(montant=4.0, place=places[1])
+    parking.gerer_sortie(est_abonne=True, place=places[0])
+    return places
+
+def test_validation_groupee(tmp_path):
+    journal = JournalEvenements(str(tmp_path), taille_groupe=3, delai_groupe=60)
+    journal.ajouter("paiement", montant=1.0)
+    journal.ajouter("paiement", montant=2.0)
+    assert not journal.attendre(2, delai=0.1)  # Groupe incomplet : rien sur disque
+    assert journal.relire()[1] == []
+    assert journal.attendre(journal.ajouter("paiement", montant=3.0), delai=5.0)
+    assert [e["seq"] for e in journal.relire()[1]] == [1, 2, 3]
+    journal.fermer()
+    with pytest.raises(ValueError, match="fermé"):
+        journal.ajouter("paiement", montant=4.0)
+
+def test_ajout_sans_attendre_le_disque(tmp_path, monkeypatch):
+    disque_libre = threading.Event()
+    fsync = os.fsync
+    monkeypatch.setattr(journal_module.os, "fsync", lambda fd: (disque_libre.wait(), fsync(fd)))
+    journal = JournalEvenements(str(tmp_path), taille_groupe=1)
+    parking = ParkingSystem(places_totales=5, sink=NullSink(), journal=journal)
+    _remplir(parking)                              # fsync bloqué : le parking n'attend pas
+    assert journal.seq == 8 and journal.seq_valide == 0
+    disque_libre.set()
+    journal.valider()
+    assert journal.seq_valide == 8 and len(journal.relire()[1]) == 8
+    journal.fermer()
+
+def test_reprise_apres_arret(tmp_path):
+    parking = ParkingSystem(places_totales=5, sink=NullSink(),
+                            journal=JournalEvenements(str(tmp_path), taille_groupe=1))
+    _remplir(parking)
+    parking.gerer_entree()  # Après deux sorties : une place se libère puis est reprise
+    parking.journal.valider()
+    attendu = parking.etat_persistant()
+
+    # Nouveau processus : seul le répertoire du journal subsiste
+    reprise = ParkingSystem(places_totales=5, sink=NullSink(),
+                            journal=JournalEvenements(str(tmp_path)))
+    assert reprise.restaurer() == 9
+    assert reprise.etat_persistant() == attendu
+    assert reprise.allocateur.nb_occupees == 4
+    assert reprise.gerer_entree() is not None
+    assert reprise.gerer_entree() is None
+
+def test_instantane_et_queue(tmp_path):
+    journal = JournalEvenements(str(tmp_path), taille_groupe=1, intervalle_instantane=5)
+    parking = ParkingSystem(places_totales=5, sink=NullSink(), journal=journal)
+    _remplir(parking)
+    attendu = parking.etat_persistant()
+    journal.fermer()
+
+    instantane, queue = JournalEvenements(str(tmp_path)).relire()
+    assert instantane["seq"] == 5 and len(queue) == 3
+    reprise = ParkingSystem(places_totales=5, sink=NullSink(),
+                            journal=JournalEvenements(str(tmp_path)))
+    reprise.restaurer()
+    assert reprise.etat_persistant() == attendu
+
+def test_ligne_tronquee_ignoree(tmp_path):
+    journal = JournalEvenements(str(tmp_path), taille_groupe=1)
+    journal.ajouter("paiement", montant=1.0)
+    journal.fermer()
+    with open(tmp_path / NOM_JOURNAL, "a", encoding="utf-8") as fichier:
+        fichier.write('{"seq": 2, "type": "paie')
+    reouvert = JournalEvenements(str(tmp_path), taille_groupe=1)
+    reouvert.ajouter("paiement", montant=2.0)
+    reouvert.valider()
+    assert [e["montant"] for e in reouvert.relire()[1]] == [1.0, 2.0]
+
+def test_instantane_pendant_une_reservation(tmp_path):
+    journal = JournalEvenements(str(tmp_path), taille_groupe=1, intervalle_instantane=3)
+    parking = ParkingSystem(places_totales=5, sink=NullSink(), journal=journal)
+    reservee = parking.reserver_place()                            # Réservation ouverte...
+    place = parking.gerer_entree(horodatage=1.0)
+    parking.gerer_sortie(montant=2.0, place=place)                 # ... pendant l'instantané
+    assert JournalEvenements(str(tmp_path)).relire()[0]["seq"] == 3
+    parking.valider_entree(reservee, horodatage=2.0)
+    abandonnee = parking.reserver_place(est_abonne=True)
+    parking.annuler_reservation(abandonnee)
+    journal.valider()
+    attendu = (parking.places_libres, parking.total_visiteurs, parking.total_abonnes, parking.etat_persistant())
+    assert attendu[:3] == (4, 2, 1)
+
+    reprise = ParkingSystem(places_totales=5, sink=NullSink(), journal=JournalEvenements(str(tmp_path)))
+    reprise.restaurer()
+    assert (reprise.places_libres, reprise.total_visiteurs, reprise.total_abonnes,
+            reprise.etat_persistant()) == attendu
+
+def test_restaurer_sans_journal():
+    with pytest.raises(ValueError, match="Aucun journal"):
+        ParkingSystem(places_totales=5, sink=NullSink()).restaurer()
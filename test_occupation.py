@@ -0,0 +1,40 @@
+import dependances
+from evenements import NullSink
+from occupation import OCTETS_PAR_PLACE, RegistreOccupation
+from parking_system import ParkingSystem
+
+
+def test_occuper_liberer():
+    r = RegistreOccupation(20)
+    r.occuper(3, "ABONNE", 100.0)
+    r.occuper(9, "VISITEUR", 50.0)
+    assert r.est_occupee(9) and not r.est_occupee(8)
+    assert r.type_client(3) == "ABONNE"
+    assert r.heure_entree(9) == 50.0
+    assert r.liberer(3) == ("ABONNE", 100.0)
+    assert r.heure_entree(3) is None
+    assert r.places_occupees() == [9]
+
+def test_requetes_ensemble(monkeypatch):
+    r = RegistreOccupation(1000)
+    for place in range(0, 1000, 10):
+        r.occuper(place, "ABONNE" if place % 20 == 0 else "VISITEUR", float(place))
+    assert r.compter() == 100
+    assert r.compter("ABONNE") == 50
+    assert r.compter("VISITEUR") == 50
+    # Garés depuis plus de 900 s à t=1000 : entrés avant t=100
+    assert r.stationnes_depuis(900, 1000.0) == [0, 10, 20, 30, 40, 50, 60, 70, 80, 90]
+    monkeypatch.setattr(dependances, "_numpy", None)  # Même résultat sans NumPy
+    assert r.stationnes_depuis(900, 1000.0) == [0, 10, 20, 30, 40, 50, 60, 70, 80, 90]
+
+def test_empreinte_memoire():
+    r = RegistreOccupation(100_000)
+    assert r.octets() <= 100_000 * OCTETS_PAR_PLACE + 1
+
+def test_parking_enregistre_occupant():
+    p = ParkingSystem(places_totales=3, sink=NullSink())
+    place = p.gerer_entree(est_abonne=True, horodatage=42.0)
+    assert p.occupation.type_client(place) == "ABONNE"
+    assert p.occupation.heure_entree(place) == 42.0
+    p.gerer_sortie(est_abonne=True, place=place)
+    assert p.occupation.compter() == 0
@@ -42,4 +42,27 @@ def test_paiement_visiteur():
     prix_test = 20.0
     p.gerer_sortie(est_abonne=False, montant=prix_test)
     
-    assert p.recettes_totales == solde_avant + prix_test
\ No newline at end of file
+    assert p.recettes_totales == solde_avant + prix_test
+
+def test_entrees_entrelacees():
+    # Deux véhicules en cours en même temps sur deux voies
+    p = ParkingSystem(places_totales=5)
+    e1 = p.etapes_entree()
+    e2 = p.etapes_entree(est_abonne=True)
+    assert next(e1) == "IDENTIFICATION"
+    assert next(e2) == "IDENTIFICATION"
+    assert next(e1) == "VERIFICATION_ACCES"
+    assert len(p.sessions) == 2
+    list(e1)
+    list(e2)
+    assert p.places_libres == 3
+    assert p.sessions == {}
+
+def test_pas_de_surreservation_entrelacee():
+    p = ParkingSystem(places_totales=1)
+    e1 = p.etapes_entree()
+    next(e1)
+    p.gerer_entree() # Place déjà réservée par e1
+    assert p.places_libres == 0
+    e1.close() # Entrée abandonnée : la place est rendue
+    assert p.places_libres == 1
@@ -0,0 +1,125 @@
+import asyncio
+import random
+
+from evenements import NullSink, RingBufferSink
+from journal import JournalEvenements
+from parking_async import ParkingAsync
+from parking_system import ParkingSystem
+from registre_plaques import RegistrePlaques
+from tarification import GrilleTarifaire
+
+
+def test_centaines_de_voies():
+    p = ParkingSystem(places_totales=150, sink=NullSink())
+    rng = random.Random(0)
+
+    async def lire_plaque():
+        await asyncio.sleep(rng.uniform(0, 0.01))
+        return "AB-123-CD"
+
+    async def payer(montant, place):
+        await asyncio.sleep(rng.uniform(0, 0.01))
+        return True
+
+    async def voie(facade, i):
+        place = await facade.entree(est_abonne=i % 4 == 0, horodatage=0.0)
+        if place is not None:
+            await facade.sortie(est_abonne=i % 4 == 0, place=place, montant=2.0, horodatage=60.0)
+        return place
+
+    async def scenario():
+        facade = ParkingAsync(p, lire_plaque=lire_plaque, payer=payer)
+        return await asyncio.gather(*(voie(facade, i) for i in range(300)))
+
+    places = asyncio.run(scenario())
+    acceptes = [place for place in places if place is not None]
+    assert len(acceptes) == 150  # Les 300 voies sont en cours en même temps : 150 places
+    assert p.places_libres == 150 and not p.sessions
+    assert p.recettes_totales == 2.0 * sum(1 for i, place in enumerate(places)
+                                           if place is not None and i % 4 != 0)
+
+def test_acces_et_paiement_refuses():
+    p = ParkingSystem(places_totales=2, sink=NullSink())
+
+    async def lire_plaque():
+        return "VOLEE-1"
+
+    async def verifier_acces(plaque, est_abonne):
+        return plaque != "VOLEE-1"
+
+    async def refuser_paiement(montant, place):
+        return False
+
+    async def scenario():
+        refuse = await ParkingAsync(p, lire_plaque, verifier_acces).entree()
+        place = await ParkingAsync(p).entree(horodatage=0.0)
+        sortie = await ParkingAsync(p, payer=refuser_paiement).sortie(place=place, horodatage=3600.0)
+        return refuse, place, sortie
+
+    refuse, place, sortie = asyncio.run(scenario())
+    assert refuse is None
+    assert place is not None and not sortie
+    assert p.occupation.est_occupee(place) and p.places_libres == 1
+    assert p.recettes_totales == 0.0
+
+def test_annulation_rend_la_place():
+    p = ParkingSystem(places_totales=1, sink=NullSink())
+
+    async def lecteur_bloque():
+        await asyncio.sleep(10)
+
+    async def scenario():
+        tache = asyncio.ensure_future(ParkingAsync(p, lire_plaque=lecteur_bloque).entree())
+        await asyncio.sleep(0)
+        assert p.places_libres == 0
+        tache.cancel()
+        await asyncio.gather(tache, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert p.places_libres == 1 and p.allocateur.nb_occupees == 0
+
+def test_plaque_et_refus_comme_en_synchrone(tmp_path):
+    sink = RingBufferSink()
+    journal = JournalEvenements(str(tmp_path), taille_groupe=1)
+    p = ParkingSystem(places_totales=3, sink=sink, journal=journal,
+                      registre=RegistrePlaques({"AB-123-CD": 1e12}, ["VOLEE-1"]))
+    plaques = iter(["VOLEE-1", "ab 123 cd", "XY-000-ZZ"])
+
+    async def lire_plaque():
+        return next(plaques)
+
+    controles = []
+
+    async def verifier_acces(plaque, est_abonne):
+        controles.append((plaque, est_abonne))
+        return plaque != "XY-000-ZZ"
+
+    async def scenario():
+        facade = ParkingAsync(p, lire_plaque, verifier_acces)
+        return [await facade.entree(horodatage=0.0) for _ in range(3)]
+
+    volee, abonne, externe = asyncio.run(scenario())
+    assert volee is None and externe is None and abonne is not None
+    assert p.occupation.type_client(abonne) == "ABONNE"  # Type donné par le registre
+    assert controles == [("VOLEE-1", False), ("ab 123 cd", True), ("XY-000-ZZ", False)]
+    assert (p.places_libres, p.total_abonnes, p.total_visiteurs) == (2, 1, 2)
+    assert [e.champs["evt"] for e in sink.evenements("transition")].count("acces_refuse") == 2
+    journal.valider()
+    assert [e["type"] for e in journal.relire()[1]] == ["refus", "entree", "refus"]
+
+def test_sortie_sans_place_facturee():
+    p = ParkingSystem(places_totales=2, sink=NullSink(), tarification=GrilleTarifaire(tarif_horaire=2.0))
+    paiements = []
+
+    async def payer(montant, place):
+        paiements.append((montant, place))
+        return True
+
+    async def scenario():
+        facade = ParkingAsync(p, payer=payer)
+        place = await facade.entree(horodatage=0.0)
+        return place, await facade.sortie(horodatage=7200.0)
+
+    place, sortie = asyncio.run(scenario())
+    assert sortie and paiements == [(4.0, place)]
+    assert p.recettes_totales == 4.0 and p.places_libres == 2
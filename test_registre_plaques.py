@@ -0,0 +1,71 @@
+import math
+
+import pytest
+
+from evenements import NullSink, RingBufferSink
+from parking_system import ParkingSystem
+from registre_plaques import FiltreBloom, RegistrePlaques, normaliser_plaque
+
+
+def test_normalisation_et_decisions():
+    r = RegistrePlaques({"ab-123-cd": math.inf, "EF 456 GH": 100.0}, liste_noire=["XY.999.ZZ"])
+    assert normaliser_plaque(" ab-123 cd") == "AB123CD"
+    assert r.verifier("AB123CD") == (True, True, "abonne")
+    assert r.verifier("ef-456-gh", maintenant=50.0).est_abonne
+    assert r.verifier("ef-456-gh", maintenant=150.0) == (True, False, "abonnement_expire")
+    assert r.verifier("xy 999 zz") == (False, False, "liste_noire")
+    assert r.verifier("ZZ-000-AA") == (True, False, "visiteur")
+
+def test_filtre_bloom_sans_faux_negatif():
+    f = FiltreBloom(10_000, taux_faux_positifs=0.01)
+    for i in range(10_000):
+        f.ajouter(f"P{i}")
+    assert all(f"P{i}" in f for i in range(10_000))
+    faux_positifs = sum(f"Q{i}" in f for i in range(10_000))
+    assert faux_positifs < 300
+
+def test_confirmation_externe_et_rechargement(tmp_path):
+    consultations = []
+    r = RegistrePlaques()
+    r.charger({}, ["AA-111-AA"], confirmer=lambda cle: consultations.append(cle) or cle == "AA111AA")
+    assert r.est_interdite("aa111aa")
+    assert not any(r.est_interdite(f"B{i}") for i in range(1000))
+    assert len(consultations) < 50  # Le filtre écarte presque toutes les plaques absentes
+
+    fichier = tmp_path / "registre.txt"
+    fichier.write_text("# plaque;type\nAB-123-CD;ABONNE\nXY-999-ZZ;NOIRE\n", encoding="utf-8")
+    version = r.version
+    r.recharger_en_arriere_plan(str(fichier)).join()
+    assert r.version == version + 1 and len(r) == 1
+    assert r.est_abonne("AB123CD") and r.est_interdite("XY999ZZ") and not r.est_interdite("AA111AA")
+
+def test_entree_par_plaque():
+    sink = RingBufferSink()
+    p = ParkingSystem(places_totales=3, sink=sink,
+                      registre=RegistrePlaques({"AB-123-CD": math.inf}, ["XY-999-ZZ"]))
+    assert p.gerer_entree(plaque="xy999zz", horodatage=0.0) is None
+    assert [e.champs["evt"] for e in sink.evenements("transition")][-1] == "acces_refuse"
+    assert p.places_libres == 3 and p.total_visiteurs == 1
+
+    place = p.gerer_entree(plaque="ab 123 cd", horodatage=0.0)
+    assert p.occupation.type_client(place) == "ABONNE"
+    place = p.gerer_entree(est_abonne=True, plaque="NOUVELLE", horodatage=0.0)
+    assert p.occupation.type_client(place) == "VISITEUR"  # Le registre fait foi
+
+def test_fichier_invalide_garde_l_index(tmp_path):
+    sink = RingBufferSink()
+    r = RegistrePlaques({"AB-123-CD": math.inf}, sink=sink)
+    fichier = tmp_path / "registre.txt"
+    for contenu, erreur in [("AB-123-CD;ABONNE\nXY-999-ZZ\n", "ligne 2 : type None"),
+                            ("\n# typo\nXY-999-ZZ;NOIR\n", "ligne 3 : type 'NOIR'"),
+                            ("EF-456-GH;ABONNE;demain\n", "ligne 1 : fin de validité 'demain'")]:
+        fichier.write_text(contenu, encoding="utf-8")
+        with pytest.raises(ValueError, match=erreur):
+            r.charger_fichier(str(fichier))
+    version = r.version
+    r.recharger_en_arriere_plan(str(fichier)).join()
+    echec = sink.evenements("registre")[-1]
+    assert not echec.champs["ok"] and "demain" in echec.champs["erreur"]
+    assert r.version == version and r.est_abonne("AB123CD") and not r.est_interdite("XY999ZZ")
+    r.recharger_en_arriere_plan(str(tmp_path / "absent.txt")).join()
+    assert not sink.evenements("registre")[-1].champs["ok"]
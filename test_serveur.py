@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+from client_charge import executer_charge
+from evenements import NullSink
+from parking_system import ParkingSystem
+from serveur import ServeurParking
+
+
+def _servir(scenario, **options):
+    async def principal():
+        serveur = ServeurParking(ParkingSystem(places_totales=50, sink=NullSink()), port=0, **options)
+        port = await serveur.demarrer()
+        try:
+            return serveur, await scenario(port)
+        finally:
+            await serveur.arreter()
+    return asyncio.run(principal())
+
+def test_pipelining_et_contre_pression():
+    async def scenario(port):
+        lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+        # 60 entrées envoyées d'un bloc, sans attendre de réponse
+        ecrivain.write(b"".join(json.dumps({"id": i, "op": "entree"}).encode() + b"\n" for i in range(60)))
+        ecrivain.write(b'pas du json\n{"id": "s", "op": "statut"}\n')
+        await ecrivain.drain()
+        reponses = [json.loads(await lecteur.readline()) for _ in range(62)]
+        ecrivain.close()
+        return reponses
+
+    serveur, reponses = _servir(scenario, taille_file=4, taille_lot=8, profondeur_pipeline=4)
+    assert [r["id"] for r in reponses[:60]] == list(range(60))  # Ordre conservé
+    assert sum(r["ok"] for r in reponses[:60]) == 50            # 50 places
+    assert reponses[60]["ok"] is False
+    assert reponses[61]["statut"]["places_libres"] == 0
+    assert serveur.lots_traites < serveur.requetes_traitees       # Requêtes regroupées par lots
+
+def test_client_de_charge():
+    async def scenario(port):
+        return await executer_charge(port=port, debit=400, duree=0.5, connexions=4)
+
+    _, resultats = _servir(scenario)
+    assert resultats["requetes"] == resultats["reponses"] == 200
+    assert resultats["p50_ms"] <= resultats["p99_ms"]
+
+def test_requete_qui_n_est_pas_un_objet():
+    async def scenario(port):
+        lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+        ecrivain.write(b'[1]\n"x"\n3\nnull\n{"id": 7, "op": "entree"}\n')
+        await ecrivain.drain()
+        reponses = [json.loads(await lecteur.readline()) for _ in range(5)]
+        ecrivain.close()
+        return reponses
+
+    _, reponses = _servir(scenario)
+    assert [r["ok"] for r in reponses] == [False, False, False, False, True]
+    assert reponses[0] == {"ok": False, "erreur": "JSON invalide (objet attendu)", "id": None}
+    assert reponses[4]["id"] == 7  # La connexion reste servie
+
+def test_ligne_trop_longue_et_types_verifies():
+    async def scenario(port):
+        lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+        ecrivain.write(b'{"id": 1, "op": "entree", "zone": "' + b"x" * 200000 + b'"}\n')
+        ecrivain.write(b'{"id": 2, "op": "entree", "abonne": "non"}\n{"id": 3, "op": "sortie", "place": true}\n')
+        ecrivain.write(b'{"id": 4, "op": "entree", "abonne": true}\n')
+        await ecrivain.drain()
+        reponses = [json.loads(await lecteur.readline()) for _ in range(4)]
+        ecrivain.close()
+        return reponses
+
+    serveur, reponses = _servir(scenario)
+    assert reponses[0] == {"ok": False, "erreur": "Requête trop longue", "id": None}
+    assert [r["ok"] for r in reponses[1:]] == [False, False, True]  # La connexion reste servie
+    assert "abonne" in reponses[1]["erreur"] and "place" in reponses[2]["erreur"]
+    assert serveur.parking.occupation.type_client(reponses[3]["place"]) == "ABONNE"
+
+def test_sortie_d_une_place_seulement_reservee():
+    serveur = ServeurParking(ParkingSystem(places_totales=5, sink=NullSink()))
+    etapes = serveur.parking.etapes_entree()
+    next(etapes)
+    assert serveur.parking.allocateur.est_occupee(0)  # Place 0 réservée, véhicule pas encore garé
+    assert serveur.traiter({"op": "sortie", "place": 0}) == {"ok": False, "erreur": "Place 0 non occupée."}
+    assert serveur.traiter({"op": "sortie", "place": -1})["ok"] is False
+    etapes.close()
@@ -0,0 +1,22 @@
+from evenements import NullSink
+from parking_system import ParkingSystem
+from simulation import Simulateur
+
+
+def test_simulation_coherente():
+    p = ParkingSystem(places_totales=50, sink=NullSink())
+    sim = Simulateur(p, taux_arrivee=100, ratio_abonnes=0.3, graine=42)
+    stats = sim.executer(3 * 86400)
+    assert stats["horloge"] == 3 * 86400
+    assert stats["arrivees"] == stats["visiteurs"] + stats["abonnes"]
+    # Chaque véhicule accepté est soit sorti, soit encore garé
+    garees = p.places_totales - p.places_libres
+    assert stats["arrivees"] - stats["refus"] == stats["sorties"] + garees
+    assert stats["occupation_max"] <= 50
+
+def test_simulation_saturee_refuse():
+    p = ParkingSystem(places_totales=5, sink=NullSink())
+    sim = Simulateur(p, taux_arrivee=1000, histogramme_sejour=[(3600, 7200, 1.0)], graine=1)
+    stats = sim.executer(3600)
+    assert stats["refus"] > 0
+    assert stats["occupation_max"] == 5
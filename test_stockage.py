@@ -0,0 +1,31 @@
+from evenements import NullSink
+from occupation import CODE_ABONNE, CODE_VISITEUR
+from parking_system import ParkingSystem
+from stockage import StockageSessions
+
+
+def test_lot_et_requetes():
+    s = StockageSessions(taille_lot=100)
+    for i in range(250):
+        s.enregistrer(i % 10, "VISITEUR", float(i), float(i + 60), 2.0)
+    assert s.connexion.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 200  # 2 lots insérés
+    assert s.recettes() == (500.0, 250)  # La requête insère le reste
+    assert s.recettes(100.0, 200.0) == (200.0, 100)
+    assert s.duree_moyenne() == 60.0
+    assert len(s.sessions_place(3)) == 25
+    s.fermer()
+
+def test_parking_conserve_sessions(tmp_path):
+    stockage = StockageSessions(str(tmp_path / "sessions.db"))
+    p = ParkingSystem(places_totales=3, sink=NullSink(), stockage=stockage)
+    visiteur = p.gerer_entree(horodatage=10.0)
+    abonne = p.gerer_entree(est_abonne=True, horodatage=20.0)
+    p.gerer_sortie(montant=7.5, place=visiteur, horodatage=3610.0)
+    p.gerer_sortie(est_abonne=True, montant=7.5, place=abonne, horodatage=100.0)
+    stockage.fermer()
+
+    relu = StockageSessions(str(tmp_path / "sessions.db"))
+    assert relu.connexion.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert relu.recettes() == (7.5, 2)
+    assert relu.sessions_place(visiteur) == [(CODE_VISITEUR, 10.0, 3610.0, 7.5)]
+    assert relu.sessions_place(abonne) == [(CODE_ABONNE, 20.0, 100.0, 0.0)]
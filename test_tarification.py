@@ -0,0 +1,58 @@
+import random
+
+import dependances
+import tarification
+from occupation import CODE_ABONNE, CODE_VISITEUR
+from tarification import GrilleTarifaire
+
+
+def grille_complete():
+    # 1h: 2 DH, 3h: 5 DH, puis 2 DH/h, plafond 20 DH/jour
+    return GrilleTarifaire(tarif_horaire=2.0, paliers=[(1, 2.0), (3, 5.0)], plafond_journalier=20.0)
+
+def test_tarif_horaire_simple():
+    g = GrilleTarifaire(tarif_horaire=2.5, forfait=1.0)
+    assert g.calculer(2 * 3600) == 1.0 + 5.0
+    assert g.calculer(2 * 3600, est_abonne=True) == 0.0
+
+def test_paliers_et_plafond():
+    g = grille_complete()
+    assert g.calculer(30 * 60) == 2.0
+    assert g.calculer(2 * 3600) == 5.0
+    assert g.calculer(5 * 3600) == 5.0 + 2 * 2.0
+    assert g.calculer(20 * 3600) == 20.0 # Plafonné
+    assert g.calculer(24 * 3600 + 30 * 60) == 20.0 + 2.0 # Un jour complet + 30 min
+
+def test_lot_identique_au_calcul_unitaire(monkeypatch):
+    g = grille_complete()
+    rng = random.Random(3)
+    durees = [rng.uniform(0, 4 * 86400) for _ in range(500)]
+    types = bytearray(rng.choice([CODE_VISITEUR, CODE_ABONNE]) for _ in range(500))
+    attendu = [g.calculer(d, t == CODE_ABONNE) for d, t in zip(durees, types)]
+
+    assert all(abs(a - b) < 1e-9 for a, b in zip(g.calculer_lot(durees, types), attendu))
+    monkeypatch.setattr(dependances, "_numpy", None) # Repli sans NumPy
+    assert all(abs(a - b) < 1e-9 for a, b in zip(g.calculer_lot(durees, types), attendu))
+
+def test_cache_tarifs_lru():
+    g = GrilleTarifaire(tarif_horaire=60.0) # 1 DH/min
+    c = tarification.CacheTarifs(g, taille_max=2, pas_facturation=60)
+    assert c.montant(30) == 1.0 # Minute entamée
+    assert c.montant(59) == 1.0
+    assert (c.hits, c.misses) == (1, 1)
+    c.montant(90)
+    c.montant(150) # Évince la tranche 1
+    assert len(c) == 2
+    c.montant(10)
+    assert c.misses == 4
+
+def test_cache_invalide_si_tarif_change():
+    from parking_system import ParkingSystem
+    from evenements import NullSink
+    p = ParkingSystem(places_totales=2, sink=NullSink())
+    assert p.calculer_montant(3600) == 2.5
+    assert p.calculer_montant(3600) == 2.5
+    p.tarification.modifier(tarif_horaire=4.0)
+    assert p.calculer_montant(3600) == 4.0
+    statut = p.get_status()
+    assert (statut["cache_tarifs_hits"], statut["cache_tarifs_misses"]) == (1, 2)